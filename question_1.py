@@ -14,22 +14,52 @@
 #   2) Encrypt to 'encrypted_text.txt' and emit metadata 'encrypted_text.meta'
 #   3) Decrypt using ciphertext + metadata → 'decrypted_text.txt'
 #   4) Verify decrypted equals original (byte-for-byte)
+#   Steps 2–3 stream fixed-size chunks, so memory stays bounded on large
+#   inputs; `python question_1.py run --shift1 A --shift2 B` runs the same
+#   pipeline without prompts (see --help for encrypt/decrypt sub-commands).
 #
 # Design goals:
 #   - Full reversibility via metadata (lossless round-trip).
 #   - Explicit, partition-based rules to demonstrate conditional ciphers.
 #   - Separation of concerns (I/O, transform, verification).
+#   - Per-(shift1, shift2) translation tables so the hot path runs in C
+#     (str.translate / map) rather than one Python call per character.
 #
 # Dependencies: Python 3.8+, standard library only.
 # ---------------------------------------------------------------------
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import codecs
+import contextlib
+import functools
+import hashlib
+import hmac
+import io
+import json
+import mmap
+import operator
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Set, Tuple
+from typing import (
+    BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO,
+    Tuple, TypeVar, Union,
+)
 
 # ------------------------- Global Constants ----------------------------------
 
+T = TypeVar("T")
+
 # Define alphabets and partitions for classification
 ALPHA_LOWER: str = "abcdefghijklmnopqrstuvwxyz"
 ALPHA_UPPER: str = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
@@ -67,10 +97,306 @@ def _shift_char(ch: str, k: int, alphabet: str) -> str:
     return alphabet[(idx + k) % 26]
 
 
+# --------------------------- Translation Tables ------------------------------
+
+class _TranslationTable(dict):
+    """
+    Lookup table whose missing keys resolve to a fixed default (or to themselves).
+
+    `str.translate` and `dict.__getitem__` both honour `__missing__`, so this
+    lets a table describe "every other character" without enumerating all of
+    Unicode. ASCII entries are stored explicitly; only non-ASCII input reaches
+    `__missing__`.
+    """
+
+    def __init__(self, mapping: Dict, default: object = None) -> None:
+        super().__init__(mapping)
+        self.default = default
+
+    def __missing__(self, key: object) -> object:
+        return key if self.default is None else self.default
+
+
+class CipherTables(NamedTuple):
+    """
+    Precomputed lookup tables for one (shift1, shift2) pair.
+
+    Attributes:
+        encrypt: `str.translate` table mapping plaintext letters to ciphertext.
+        meta:    `str.translate` table mapping every character to its metadata
+                 symbol ('0' for anything outside the four partitions).
+        decrypt: Mapping metadata symbol -> inverse table (char -> char) for
+                 that class; unknown symbols map to the identity table.
+        inverse: Mapping metadata symbol -> `str.translate` form of the same
+                 inverse table, for decrypting whole runs of one class.
+        inverse_bytes: 256-byte `bytes.translate` table applying all four
+                 inverses to ASCII ciphertext bytes, with the high bit set
+                 for classes '2' and '4' (see `_decrypt_ascii`).
+    """
+    encrypt: Dict[int, int]
+    meta: Dict[int, int]
+    decrypt: Dict[str, Dict[str, str]]
+    inverse: Dict[str, Dict[int, int]]
+    inverse_bytes: bytes
+
+
+def _partition_shifts(shift1: int, shift2: int) -> Tuple[Tuple[str, str, int], ...]:
+    """
+    Return (metadata symbol, partition letters, forward shift) for each class.
+
+    Args:
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
+
+    Returns:
+        A tuple of four (symbol, letters, shift) triples, classes '1'–'4'.
+    """
+    return (
+        ("1", ALPHA_LOWER[:13], shift1 * shift2),     # a–m → +(shift1 * shift2)
+        ("2", ALPHA_LOWER[13:], -(shift1 + shift2)),  # n–z → -(shift1 + shift2)
+        ("3", ALPHA_UPPER[:13], -shift1),             # A–M → -shift1
+        ("4", ALPHA_UPPER[13:], shift2 ** 2),         # N–Z → +(shift2 ** 2)
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def build_cipher_tables(shift1: int, shift2: int) -> CipherTables:
+    """
+    Build (and memoise) the encryption, metadata and inverse tables for a shift pair.
+
+    Each partition's rule is evaluated once per letter here instead of once per
+    input character, so encryption and decryption reduce to bulk lookups.
+
+    Args:
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
+
+    Returns:
+        A `CipherTables` instance; repeated calls with the same shifts return
+        the cached object.
+    """
+    ascii_identity = {chr(i): chr(i) for i in range(128)}
+    encrypt: Dict[int, int] = {}
+    meta = _TranslationTable({i: ord("0") for i in range(128)}, default=ord("0"))
+    decrypt = _TranslationTable({}, default=_TranslationTable(ascii_identity))
+    decrypt["0"] = _TranslationTable(ascii_identity)
+    inverse_runs: Dict[str, Dict[int, int]] = {"0": {}}
+
+    for symbol, letters, k in _partition_shifts(shift1, shift2):
+        alphabet = ALPHA_LOWER if letters[0].islower() else ALPHA_UPPER
+        inverse = _TranslationTable(ascii_identity)
+        inverse_runs[symbol] = {}
+        for ch in letters:
+            enc = _shift_char(ch, k, alphabet)
+            encrypt[ord(ch)] = ord(enc)
+            meta[ord(ch)] = ord(symbol)
+        # The inverse covers the whole alphabet (not only this partition's
+        # images), mirroring the reference loop on arbitrary ciphertext.
+        for ch in alphabet:
+            inverse[ch] = _shift_char(ch, -k, alphabet)
+            inverse_runs[symbol][ord(ch)] = ord(inverse[ch])
+        decrypt[symbol] = inverse
+
+    inverse_bytes = bytearray(range(128)) * 2
+    for symbol, table in inverse_runs.items():
+        flag = 0x80 if symbol in "24" else 0
+        for src, dst in table.items():
+            inverse_bytes[src | flag] = dst
+    return CipherTables(encrypt=encrypt, meta=meta, decrypt=decrypt, inverse=inverse_runs,
+                        inverse_bytes=bytes(inverse_bytes))
+
+
+# ----------------------------- Cipher Engine ---------------------------------
+
+# ASCII byte -> 1 for lowercase, 2 for uppercase letters, else 0; metadata
+# byte -> the case its class applies to; metadata byte -> 0x80 for the second
+# class of each case ('2', '4'), the flag `CipherTables.inverse_bytes` expects.
+_LETTER_CASE: bytes = bytes(1 if chr(b) in ALPHA_LOWER else 2 if chr(b) in ALPHA_UPPER else 0
+                            for b in range(256))
+_META_CASE: bytes = bytes(1 if chr(b) in "12" else 2 if chr(b) in "34" else 0 for b in range(256))
+_META_FLAG: bytes = bytes(0x80 if chr(b) in "24" else 0 for b in range(256))
+
+
 def encrypt_with_meta(text: str, shift1: int, shift2: int) -> Tuple[str, str]:
     """
     Encrypt 'text' according to the assignment’s partitioned rules and emit metadata.
 
+    Partition-based rules (metadata in quotes):
+        '0' = non-letter (unchanged)
+        '1' = lowercase a–m  → shifted by +(shift1 * shift2)
+        '2' = lowercase n–z  → shifted by -(shift1 + shift2)
+        '3' = uppercase A–M  → shifted by -shift1
+        '4' = uppercase N–Z  → shifted by +(shift2 ** 2)
+
+    The returned metadata string records, per character, which rule was applied.
+    This enables exact inversion during decryption irrespective of shift values.
+    Both outputs are produced with two `str.translate` passes over precomputed
+    tables (see `build_cipher_tables`); text containing non-ASCII characters is
+    handled on its UTF-8 bytes instead (see `_encrypt_utf8`), where
+    `str.translate` would lose its ASCII fast path.
+
+    Args:
+        text:   The plaintext to encrypt.
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
+
+    Returns:
+        A tuple (cipher_text, metadata_string).
+    """
+    if not text.isascii():
+        cipher, meta = _encrypt_utf8(text.encode("utf-8", "surrogatepass"), shift1, shift2)
+        return cipher.decode("utf-8", "surrogatepass"), meta.decode("ascii")
+    tables = build_cipher_tables(shift1, shift2)
+    return text.translate(tables.encrypt), text.translate(tables.meta)
+
+
+def decrypt_with_meta(
+    cipher: str, meta: Union[str, bytes], shift1: int, shift2: int
+) -> str:
+    """
+    Decrypt 'cipher' using per-character 'meta' to apply exact inverse operations.
+
+    The function requires metadata length to equal the ciphertext length. Each
+    metadata symbol ('0'–'4') selects the inverse table for the corresponding
+    character position; unexpected symbols leave the character unchanged.
+
+    'meta' may also be a binary metadata blob (see `pack_meta`); it is then
+    consumed in its packed or run-length form without being expanded into a
+    full-length digit string.
+
+    Args:
+        cipher: The encrypted text (ciphertext).
+        meta:   The metadata string (or binary blob) produced during encryption.
+        shift1: First integer parameter used during encryption.
+        shift2: Second integer parameter used during encryption.
+
+    Returns:
+        The decrypted plaintext string.
+
+    Raises:
+        ValueError: If lengths of 'cipher' and 'meta' differ, or a binary blob
+                    is malformed.
+    """
+    tables = build_cipher_tables(shift1, shift2)
+    if isinstance(meta, (bytes, bytearray, memoryview)):
+        return _decrypt_with_binary_meta(cipher, MetaReader(io.BytesIO(meta)), tables)
+
+    if len(cipher) != len(meta):
+        raise ValueError("Metadata length does not match ciphertext length.")
+    return _decrypt_runs(cipher, meta, tables)
+
+
+def _decrypt_ascii(cipher: bytes, meta: bytes, tables: CipherTables) -> Optional[bytes]:
+    """
+    Decrypt ASCII bytes with a single `bytes.translate` over class-flagged bytes.
+
+    Within one letter case the metadata only has to tell the two classes
+    apart, which fits in the spare high bit of an ASCII byte: the flags are
+    OR-ed into the ciphertext as big integers and one 256-entry table then
+    applies every class's inverse at once.
+
+    Args:
+        cipher: ASCII ciphertext.
+        meta:   One metadata byte per ciphertext byte.
+        tables: Cipher tables for the shift pair.
+
+    Returns:
+        The decrypted bytes, or None if some letter's metadata names a class
+        of the other case (or no class), which only hand-edited metadata does.
+    """
+    if cipher.translate(_LETTER_CASE) != meta.translate(_META_CASE):
+        return None
+    flags = int.from_bytes(meta.translate(_META_FLAG), "little")
+    keys = int.from_bytes(cipher, "little") | flags
+    return keys.to_bytes(len(cipher), "little").translate(tables.inverse_bytes)
+
+
+def _splice_non_ascii(cipher: str, ascii_cipher: bytes, ascii_plain: bytes) -> str:
+    """
+    Put the non-ASCII characters of 'cipher' back into its decrypted ASCII projection.
+
+    Non-ASCII characters are outside every alphabet and decrypt to themselves,
+    so the plaintext differs from the ciphertext only where the ASCII
+    projection changed. That difference is widened to one code unit per
+    character and XOR-ed into the ciphertext's UTF-16 (or, with astral
+    characters, UTF-32) encoding.
+
+    Args:
+        cipher:       The encrypted text.
+        ascii_cipher: 'cipher' encoded as ASCII with '?' for other characters.
+        ascii_plain:  `_decrypt_ascii` applied to 'ascii_cipher'.
+
+    Returns:
+        The decrypted plaintext.
+    """
+    delta = int.from_bytes(ascii_cipher, "little") ^ int.from_bytes(ascii_plain, "little")
+    delta_bytes = delta.to_bytes(len(cipher), "little")
+    plain = _xor_code_units(cipher, delta_bytes, "utf-16-le", 2)
+    if plain is None:
+        plain = _xor_code_units(cipher, delta_bytes, "utf-32-le", 4)
+    return plain
+
+
+def _xor_code_units(text: str, delta: bytes, codec: str, width: int) -> Optional[str]:
+    """
+    XOR one byte per character of 'delta' into the low byte of each code unit of 'text'.
+
+    Returns:
+        The result, or None if 'codec' does not give every character exactly
+        one 'width'-byte code unit.
+    """
+    n = len(text)
+    wide = text.encode(codec, "surrogatepass")
+    if len(wide) != width * n:
+        return None
+    lanes = bytearray(width * n)
+    lanes[::width] = delta
+    out = int.from_bytes(wide, "little") ^ int.from_bytes(lanes, "little")
+    result = out.to_bytes(width * n, "little").decode(codec, "surrogatepass")
+    # Two lone surrogates in a row come back as one UTF-16 pair.
+    return result if len(result) == n else None
+
+
+def _decrypt_runs(cipher: str, meta: str, tables: CipherTables) -> str:
+    """
+    Decrypt equal-length 'cipher' and 'meta' strings in bulk.
+
+    The ASCII projection of the ciphertext (non-ASCII characters replaced by
+    '?', which keeps positions aligned with the metadata) goes through
+    `_decrypt_ascii`, and non-ASCII characters are spliced back unchanged.
+    Metadata that `_decrypt_ascii` rejects falls back to a per-character lookup.
+
+    Args:
+        cipher: The encrypted text.
+        meta:   One metadata symbol per character.
+        tables: Cipher tables for the shift pair.
+
+    Returns:
+        The decrypted plaintext.
+    """
+    ascii_cipher = cipher.encode("ascii", "replace")
+    ascii_plain = _decrypt_ascii(ascii_cipher, meta.encode("ascii", "replace"), tables)
+    if ascii_plain is None:
+        # Select the inverse table per position, then look the character up
+        # in it; both steps run inside map() without a Python frame per character.
+        return "".join(map(operator.getitem, map(tables.decrypt.__getitem__, meta), cipher))
+    if cipher.isascii():
+        return ascii_plain.decode("ascii")
+    return _splice_non_ascii(cipher, ascii_cipher, ascii_plain)
+
+
+# ------------------------ Reference Implementation ---------------------------
+
+def _encrypt_with_meta_loop(text: str, shift1: int, shift2: int) -> Tuple[str, str]:
+    """
+    Reference per-character implementation of `encrypt_with_meta`.
+
+    Kept as the executable specification of the partition rules: the
+    table-driven engine must reproduce its output exactly, and the benchmark
+    script measures throughput against it.
+
+    Encrypt 'text' according to the assignment’s partitioned rules and emit metadata.
+
     Partition-based rules (metadata in quotes):
         '0' = non-letter (unchanged)
         '1' = lowercase a–m  → shifted by +(shift1 * shift2)
@@ -125,8 +451,10 @@ def encrypt_with_meta(text: str, shift1: int, shift2: int) -> Tuple[str, str]:
     return "".join(out_chars), "".join(meta_chars)
 
 
-def decrypt_with_meta(cipher: str, meta: str, shift1: int, shift2: int) -> str:
+def _decrypt_with_meta_loop(cipher: str, meta: str, shift1: int, shift2: int) -> str:
     """
+    Reference per-character implementation of `decrypt_with_meta`.
+
     Decrypt 'cipher' using per-character 'meta' to apply exact inverse operations.
 
     The function requires metadata length to equal the ciphertext length. Each
@@ -171,99 +499,1872 @@ def decrypt_with_meta(cipher: str, meta: str, shift1: int, shift2: int) -> str:
     return "".join(out_chars)
 
 
-def verify_files(a: Path, b: Path) -> Tuple[bool, int | None]:
+# --------------------------- ASCII Byte Fast Path ----------------------------
+
+# UTF-8 continuation bytes (0b10xxxxxx); every other byte starts a character.
+_UTF8_CONTINUATION: bytes = bytes(range(0x80, 0xC0))
+
+
+@functools.lru_cache(maxsize=128)
+def _ascii_byte_tables(shift1: int, shift2: int) -> Tuple[bytes, bytes]:
     """
-    Compare two text files byte-by-byte for equality.
+    Build 256-byte `bytes.translate` tables for encryption and metadata.
+
+    Each partition is a contiguous byte range, so the rule is applied once per
+    byte value; bytes outside the four ranges map to themselves (ciphertext)
+    and to b'0' (metadata).
 
     Args:
-        a: Path to the first file.
-        b: Path to the second file.
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
 
     Returns:
-        (True, None) if files are identical; otherwise
-        (False, index_of_first_difference).
+        (cipher_table, meta_table), each 256 bytes long.
+    """
+    enc = bytearray(range(256))
+    meta = bytearray(b"0" * 256)
+    for symbol, letters, k in _partition_shifts(shift1, shift2):
+        alphabet = ALPHA_LOWER if letters.islower() else ALPHA_UPPER
+        for ch in letters:
+            enc[ord(ch)] = ord(_shift_char(ch, k, alphabet))
+            meta[ord(ch)] = ord(symbol)
+    return bytes(enc), bytes(meta)
+
 
-    Notes:
-        Files are read as UTF-8 text; this is acceptable for the assignment’s scope.
+def _encrypt_utf8(data: bytes, shift1: int, shift2: int) -> Tuple[bytes, bytes]:
     """
-    A = a.read_text(encoding="utf-8")
-    B = b.read_text(encoding="utf-8")
-    if A == B:
-        return True, None
-    for i, (ca, cb) in enumerate(zip(A, B)):
-        if ca != cb:
-            return False, i
-    # Divergence occurs at the end if all paired chars matched but lengths differ.
-    return False, min(len(A), len(B))
+    Encrypt UTF-8 bytes with two `bytes.translate` passes.
 
+    All partition letters are single ASCII bytes, so bytes of multi-byte
+    sequences pass through unchanged. For the metadata, lead bytes map to
+    b'0' and continuation bytes are deleted, leaving one symbol per character.
 
-def _prompt_int(msg: str) -> int:
+    Args:
+        data:   UTF-8 encoded plaintext (not validated here).
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
+
+    Returns:
+        A tuple (cipher_bytes, metadata_bytes).
     """
-    Prompt the user until a valid integer is entered.
+    enc_table, meta_table = _ascii_byte_tables(shift1, shift2)
+    return data.translate(enc_table), data.translate(meta_table, _UTF8_CONTINUATION)
+
+
+def encrypt_bytes_with_meta(data: bytes, shift1: int, shift2: int) -> Tuple[bytes, bytes]:
+    """
+    Encrypt UTF-8 encoded 'data', returning ciphertext and metadata as bytes.
+
+    The input is transformed with two `bytes.translate` passes over 256-entry
+    tables, which never decodes to `str` and runs at memory speed. Non-ASCII
+    input is validated as UTF-8 first (raising UnicodeDecodeError like a
+    decode would). The result equals
+    `encrypt_with_meta(data.decode("utf-8"), ...)` encoded as UTF-8.
 
     Args:
-        msg: The message displayed to the user.
+        data:   UTF-8 encoded plaintext (bytes or bytearray).
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
 
     Returns:
-        A validated integer provided by the user.
+        A tuple (cipher_bytes, metadata_bytes).
+    """
+    if not data.isascii():
+        codecs.decode(data, "utf-8")  # validate only
+    return _encrypt_utf8(data, shift1, shift2)
+
+
+def _encrypt_stream_ascii(
+    fin: BinaryIO,
+    fenc: BinaryIO,
+    fmeta: BinaryIO,
+    shift1: int,
+    shift2: int,
+    chunk_bytes: int,
+) -> int:
     """
+    Encrypt a binary stream, taking the byte-level path for every pure-ASCII chunk.
+
+    Bytes pass through the same incremental UTF-8 + universal-newline decoder
+    a text-mode file uses, so output matches `encrypt_file` exactly. A chunk
+    goes to the byte-level path only when it is ASCII, has no carriage return
+    and the decoder holds no partial state; otherwise it is decoded and
+    encrypted by the general path.
+
+    Args:
+        fin:         Binary plaintext input.
+        fenc:        Binary ciphertext output.
+        fmeta:       Binary metadata output (text format).
+        shift1:      First integer parameter.
+        shift2:      Second integer parameter.
+        chunk_bytes: Bytes read per iteration.
+
+    Returns:
+        The number of characters encrypted.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    total = 0
     while True:
-        try:
-            return int(input(msg).strip())
-        except ValueError:
-            print("Please enter an integer.")
+        block = fin.read(chunk_bytes)
+        if block and block.isascii() and b"\r" not in block and decoder.getstate() == (b"", 0):
+            cipher, meta = encrypt_bytes_with_meta(block, shift1, shift2)
+            total += len(block)
+        else:
+            text = decoder.decode(block, final=not block)
+            cipher, meta = encrypt_with_meta(text, shift1, shift2)
+            cipher, meta = cipher.encode("utf-8"), meta.encode("ascii")
+            total += len(text)
+        fenc.write(cipher)
+        fmeta.write(meta)
+        if not block:
+            return total
 
 
-# ----------------------------- Main Program ----------------------------------
+def _utf8_byte_ranges(path: Path, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges of about 'chunk_bytes' that can be encrypted independently.
+
+    Each cut is moved forward past UTF-8 continuation bytes (so it lands on a
+    character's lead byte) and past the '\n' of a '\r\n' pair (so universal
+    newline translation never sees half a pair).
+
+    Args:
+        path:        Input file.
+        chunk_bytes: Target range length (≥ 1).
 
-def main() -> None:
+    Returns:
+        Consecutive (start, end) offsets covering the whole file.
     """
-    Orchestrate the end-to-end workflow:
-        - Validate source availability
-        - Collect shift parameters
-        - Encrypt with metadata and persist outputs
-        - Decrypt using metadata and persist output
-        - Verify original vs decrypted, reporting byte-level parity
+    if chunk_bytes < 1:
+        raise ValueError("chunk_chars must be ≥ 1.")
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as fh:
+        pos = chunk_bytes
+        while pos < size:
+            fh.seek(pos - 1)
+            window = fh.read(5)  # the byte before the cut, then up to four after it
+            i = 1
+            while i < min(len(window), 4) and window[i] & 0xC0 == 0x80:
+                i += 1
+            if window[i - 1:i] == b"\r" and window[i:i + 1] == b"\n":
+                i += 1
+            pos += i - 1
+            if pos >= size:
+                break
+            bounds.append(pos)
+            pos += chunk_bytes
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_range(path: Path, start: int, end: int) -> bytes:
     """
-    print("=== HIT137 Q1: Encrypt → Decrypt → Verify (lossless with metadata) ===")
+    Read bytes [start, end) of 'path' with newlines translated as a text-mode read would.
 
-    # Define file paths relative to current script
-    base = Path(__file__).parent
-    raw_path = base / "raw_text.txt"         # original input text
-    enc_path = base / "encrypted_text.txt"   # encrypted text output
-    meta_path = base / "encrypted_text.meta" # metadata output
-    dec_path = base / "decrypted_text.txt"   # decrypted text output
+    '\r\n' and lone '\r' become '\n'; neither byte occurs inside a multi-byte
+    UTF-8 sequence, so this is safe before decoding.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
 
-    # Ensure raw input file exists before proceeding
-    if not raw_path.exists():
-        raise FileNotFoundError(
-            f"Input file not found: {raw_path.resolve()}.\n"
-            "Please create 'raw_text.txt' in the same folder."
-        )
 
-    # User input: shift parameters
-    shift1 = _prompt_int("Enter shift1 (integer): ")
-    shift2 = _prompt_int("Enter shift2 (integer): ")
+def _byte_range_sizes(path: Path, start: int, end: int) -> Tuple[int, int]:
+    """
+    Output sizes of one range (first pool pass): translated bytes and characters.
 
-    # 1) Encrypt raw → encrypted + metadata
-    raw = raw_path.read_text(encoding="utf-8")
-    cipher, meta = encrypt_with_meta(raw, shift1, shift2)
-    enc_path.write_text(cipher, encoding="utf-8")
-    meta_path.write_text(meta, encoding="utf-8")
-    print(f"[OK] Encrypted  → {enc_path.name}")
-    print(f"[OK] Metadata   → {meta_path.name}")
+    Only counts are taken: '\r\n' shrinks to one byte, a lone '\r' keeps its
+    length, and every non-continuation byte starts one character. The cipher
+    maps bytes one-to-one and the metadata has one symbol per character, so
+    these are the range's ciphertext (or decrypted plaintext) and metadata lengths.
 
-    # 2) Decrypt encrypted using metadata → decrypted
-    plain = decrypt_with_meta(cipher, meta, shift1, shift2)
-    dec_path.write_text(plain, encoding="utf-8")
-    print(f"[OK] Decrypted  → {dec_path.name}")
+    Returns:
+        (translated_bytes, chars) for bytes [start, end) of 'path'.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    pairs = data.count(b"\r\n")
+    if data.isascii():
+        return len(data) - pairs, len(data) - pairs
+    return len(data) - pairs, len(data.translate(None, _UTF8_CONTINUATION)) - pairs
 
-    # 3) Verify original vs decrypted
-    same, idx = verify_files(raw_path, dec_path)
-    if same:
-        print("[SUCCESS] Decryption verified: decrypted_text.txt matches raw_text.txt")
-    else:
-        print("[WARNING] Files differ! First difference at index:", idx)
+
+def _pwrite(path: Path, data: bytes, offset: int) -> None:
+    """Write 'data' at byte 'offset' of an existing, pre-sized file."""
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.pwrite(fd, data, offset)
+    finally:
+        os.close(fd)
+
+
+def _range_offsets(sizes: Iterable[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+    """Turn per-range (bytes, chars) sizes into start offsets, each list ending with the total."""
+    byte_offsets = [0]
+    char_offsets = [0]
+    for nbytes, chars in sizes:
+        byte_offsets.append(byte_offsets[-1] + nbytes)
+        char_offsets.append(char_offsets[-1] + chars)
+    return byte_offsets, char_offsets
+
+
+def _encrypt_byte_range(
+    path: Path,
+    start: int,
+    end: int,
+    shift1: int,
+    shift2: int,
+    enc_path: Path,
+    enc_offset: int,
+    meta_path: Optional[Path],
+    meta_offset: int,
+) -> bytes:
+    """
+    Encrypt bytes [start, end) of 'path' and write the results in place (second pool pass).
+
+    The ciphertext is written at 'enc_offset' of 'enc_path'; text metadata is
+    written at 'meta_offset' of 'meta_path'. When 'meta_path' is None the
+    metadata is returned instead, for a binary `MetaWriter` in the parent.
+
+    Args:
+        path:        Plaintext input file (UTF-8).
+        start:       First byte offset (a character boundary).
+        end:         End byte offset (a character boundary, not inside '\r\n').
+        shift1:      First integer parameter.
+        shift2:      Second integer parameter.
+        enc_path:    Pre-sized ciphertext output file.
+        enc_offset:  Where this range's ciphertext starts.
+        meta_path:   Pre-sized text metadata file, or None.
+        meta_offset: Where this range's metadata starts.
+
+    Returns:
+        The metadata bytes if 'meta_path' is None, else b"".
+    """
+    cipher, meta = encrypt_bytes_with_meta(_read_range(path, start, end), shift1, shift2)
+    _pwrite(enc_path, cipher, enc_offset)
+    if meta_path is None:
+        return meta
+    _pwrite(meta_path, meta, meta_offset)
+    return b""
+
+
+def _encrypt_file_parallel(
+    src: Path,
+    enc_path: Path,
+    meta_path: Path,
+    shift1: int,
+    shift2: int,
+    chunk_bytes: int,
+    meta_format: str,
+    workers: int,
+) -> int:
+    """
+    Encrypt a file over a process pool, with each worker reading and writing its own byte range.
+
+    A first pass has every worker measure its range's output sizes; the
+    parent turns them into output offsets and pre-sizes the files, then a
+    second pass has every worker encrypt its range with
+    `encrypt_bytes_with_meta` and write it in place. The sizing pass only
+    counts bytes, so the second read of each range comes from the page cache.
+    The parent never touches the text itself (binary metadata is the
+    exception: its symbols come back to the parent's `MetaWriter`, which is one
+    byte per character). Both passes keep at most 2 × workers ranges in flight.
+
+    Args:
+        src:         Plaintext input file (UTF-8).
+        enc_path:    Ciphertext output file.
+        meta_path:   Metadata output file.
+        shift1:      First integer parameter.
+        shift2:      Second integer parameter.
+        chunk_bytes: Bytes per worker task.
+        meta_format: 'text', 'packed' or 'rle'.
+        workers:     Number of processes (> 1).
+
+    Returns:
+        The number of characters encrypted.
+    """
+    ranges = _utf8_byte_ranges(src, chunk_bytes)
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        sizes = _submit_ordered(pool, _byte_range_sizes, ((src, a, b) for a, b in ranges), window)
+        enc_offsets, meta_offsets = _range_offsets(sizes)
+
+        with open(enc_path, "wb") as fh:
+            fh.truncate(enc_offsets[-1])
+        in_place_meta: Optional[Path] = None
+        if meta_format == "text":
+            with open(meta_path, "wb") as fh:
+                fh.truncate(meta_offsets[-1])
+            in_place_meta = Path(meta_path)
+
+        jobs = ((src, a, b, shift1, shift2, enc_path, eo, in_place_meta, mo)
+                for (a, b), eo, mo in zip(ranges, enc_offsets, meta_offsets))
+        results = _submit_ordered(pool, _encrypt_byte_range, jobs, window)
+        if in_place_meta is not None:
+            deque(results, maxlen=0)
+        else:
+            with _open_meta_sink(meta_path, meta_format) as writer:
+                for meta in results:
+                    writer.write(meta.decode("ascii"))
+    return meta_offsets[-1]
+
+
+def _decrypt_byte_range(
+    enc_path: Path,
+    start: int,
+    end: int,
+    meta: Union[Path, str],
+    meta_offset: int,
+    chars: int,
+    shift1: int,
+    shift2: int,
+    dst: Path,
+    dst_offset: int,
+) -> None:
+    """
+    Decrypt bytes [start, end) of 'enc_path' and write the plaintext in place (second pool pass).
+
+    Decryption maps ASCII letters to ASCII letters and leaves everything else
+    alone, so the plaintext has exactly the range's translated byte length.
+
+    Args:
+        enc_path:    Ciphertext input file (UTF-8).
+        start:       First byte offset (a character boundary).
+        end:         End byte offset (a character boundary, not inside '\r\n').
+        meta:        Text metadata file to read 'chars' symbols from at
+                     'meta_offset', or the symbols themselves.
+        meta_offset: Where this range's metadata starts in a text metadata file.
+        chars:       Number of characters in the range.
+        shift1:      First integer parameter used during encryption.
+        shift2:      Second integer parameter used during encryption.
+        dst:         Pre-sized plaintext output file.
+        dst_offset:  Where this range's plaintext starts.
+
+    Raises:
+        ValueError: If fewer than 'chars' metadata symbols are available.
+    """
+    if not isinstance(meta, str):
+        with open(meta, "rb") as fh:
+            fh.seek(meta_offset)
+            meta = fh.read(chars).decode("ascii")
+    cipher = _read_range(enc_path, start, end).decode("utf-8")
+    _pwrite(dst, decrypt_with_meta(cipher, meta, shift1, shift2).encode("utf-8"), dst_offset)
+
+
+def _decrypt_file_parallel(
+    enc_path: Path,
+    meta_path: Path,
+    dst: Path,
+    shift1: int,
+    shift2: int,
+    chunk_bytes: int,
+    workers: int,
+) -> int:
+    """
+    Decrypt a file over a process pool, with each worker reading its own cipher and metadata slice.
+
+    Mirrors `_encrypt_file_parallel`: a counting pass gives every ciphertext
+    range its character count, hence its offset into a text metadata file
+    (one byte per symbol) and into the output. Workers then read both slices
+    by offset and write their plaintext in place. Binary metadata cannot be
+    sliced by offset, so the parent decodes it in order and ships each range
+    its symbols, with at most 2 × workers ranges in flight.
+
+    Args:
+        enc_path:    Ciphertext input file.
+        meta_path:   Metadata input file (text digits or binary format).
+        dst:         Plaintext output file.
+        shift1:      First integer parameter used during encryption.
+        shift2:      Second integer parameter used during encryption.
+        chunk_bytes: Ciphertext bytes per worker task.
+        workers:     Number of processes (> 1).
+
+    Returns:
+        The number of characters decrypted.
+
+    Raises:
+        ValueError: If the two inputs have different character lengths.
+    """
+    ranges = _utf8_byte_ranges(enc_path, chunk_bytes)
+    window = 2 * workers
+    with contextlib.ExitStack() as stack:
+        pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        sizes = list(_submit_ordered(pool, _byte_range_sizes,
+                                     ((enc_path, a, b) for a, b in ranges), window))
+        dst_offsets, meta_offsets = _range_offsets(sizes)
+
+        source = _open_meta_source(meta_path, stack)
+        count = source.count if isinstance(source, MetaReader) else os.path.getsize(meta_path)
+        if count != meta_offsets[-1]:
+            raise ValueError("Metadata length does not match ciphertext length.")
+        with open(dst, "wb") as fh:
+            fh.truncate(dst_offsets[-1])
+
+        def jobs() -> Iterator[Tuple]:
+            for (a, b), (_, chars), do, mo in zip(ranges, sizes, dst_offsets, meta_offsets):
+                meta = source.read(chars) if isinstance(source, MetaReader) else Path(meta_path)
+                yield enc_path, a, b, meta, mo, chars, shift1, shift2, dst, do
+
+        deque(_submit_ordered(pool, _decrypt_byte_range, jobs(), window), maxlen=0)
+    return meta_offsets[-1]
+
+
+# ------------------------- Binary Metadata Format ----------------------------
+#
+# Layout (little-endian):
+#   header  = magic b"Q1MT" | version u8 | encoding u8 | symbol count u64 | CRC-32 u32
+#   payload = encoding 0 ("packed"): 3 bits per symbol, MSB-first, zero-padded
+#                                    to a whole byte at the end;
+#             encoding 1 ("rle"):    one LEB128 varint per run, (length << 3) | symbol.
+# The CRC-32 covers the payload. Symbols are the metadata classes 0–4.
+
+META_MAGIC: bytes = b"Q1MT"
+META_VERSION: int = 1
+META_ENCODINGS: Dict[str, int] = {"packed": 0, "rle": 1}
+_META_HEADER = struct.Struct("<4sBBQI")
+
+# Symbols per packed block: a multiple of 8, so blocks end on a byte boundary.
+_PACKED_BLOCK_SYMBOLS: int = 1 << 16
+_RLE_READ_BYTES: int = 1 << 16
+
+_META_RUN_RE = re.compile(r"0+|1+|2+|3+|4+")
+_META_DIGITS_DELETE: Dict[int, None] = {ord(c): None for c in "01234"}
+
+
+def _pack_octal(digits: str) -> bytes:
+    """
+    Pack a string of digits 0–7 at 3 bits each, padding the final byte with zeros.
+
+    Parsing the string as a base-8 integer performs the bit packing in C.
+
+    Args:
+        digits: Metadata symbols as ASCII digits.
+
+    Returns:
+        ceil(3 * len(digits) / 8) packed bytes.
+    """
+    if not digits:
+        return b""
+    nbytes = (3 * len(digits) + 7) // 8
+    pad = nbytes * 8 - 3 * len(digits)
+    return (int(digits, 8) << pad).to_bytes(nbytes, "big")
+
+
+def _unpack_octal(data: bytes, count: int) -> str:
+    """
+    Inverse of `_pack_octal` for 'count' symbols.
+
+    Args:
+        data:  Packed bytes (exactly ceil(3 * count / 8) of them).
+        count: Number of symbols encoded in 'data'.
+
+    Returns:
+        The symbols as a string of ASCII digits.
+    """
+    if not count:
+        return ""
+    pad = len(data) * 8 - 3 * count
+    return format(int.from_bytes(data, "big") >> pad, "o").zfill(count)
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    """Append 'value' to 'out' as an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class MetaWriter:
+    """
+    Incrementally write metadata symbols in the binary format.
+
+    The header is reserved on construction and patched with the final symbol
+    count and checksum by `close()`, so the target must be seekable. Symbols
+    may be supplied in chunks of any size.
+    """
+
+    def __init__(self, fh: BinaryIO, encoding: str = "packed") -> None:
+        if encoding not in META_ENCODINGS:
+            raise ValueError(f"Unknown metadata encoding: {encoding!r}.")
+        self._fh = fh
+        self._code = META_ENCODINGS[encoding]
+        self._start = fh.tell()
+        self._count = 0
+        self._crc = 0
+        self._pending = ""      # packed: trailing symbols short of a full byte group
+        self._run_symbol = 0    # rle: symbol of the open run
+        self._run_length = 0    # rle: length of the open run
+        fh.write(bytes(_META_HEADER.size))
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self._crc = zlib.crc32(data, self._crc)
+            self._fh.write(data)
+
+    def write(self, meta: str) -> None:
+        """
+        Append metadata symbols.
+
+        Args:
+            meta: String of metadata digits '0'–'4'.
+
+        Raises:
+            ValueError: If 'meta' contains any other character.
+        """
+        if meta.translate(_META_DIGITS_DELETE):
+            raise ValueError("Metadata contains symbols outside '0'–'4'.")
+        self._count += len(meta)
+        if self._code == META_ENCODINGS["packed"]:
+            digits = self._pending + meta
+            full = len(digits) - len(digits) % 8
+            self._emit(_pack_octal(digits[:full]))
+            self._pending = digits[full:]
+            return
+
+        out = bytearray()
+        for run in _META_RUN_RE.finditer(meta):
+            symbol = ord(meta[run.start()]) - 48
+            length = run.end() - run.start()
+            if symbol == self._run_symbol and self._run_length:
+                self._run_length += length
+                continue
+            if self._run_length:
+                _encode_varint(self._run_length << 3 | self._run_symbol, out)
+            self._run_symbol, self._run_length = symbol, length
+        self._emit(bytes(out))
+
+    def position(self) -> Tuple[int, int]:
+        """
+        Locate the next symbol to be written, for random access via `MetaReader.seek`.
+
+        Returns:
+            (byte offset, skip): decoding starts at 'byte offset' and the
+            first 'skip' symbols found there precede this position (the
+            partial packed group, or the open run, respectively).
+        """
+        if self._code == META_ENCODINGS["packed"]:
+            return self._fh.tell(), len(self._pending)
+        return self._fh.tell(), self._run_length
+
+    def close(self) -> None:
+        """Flush buffered symbols and write the final header."""
+        if self._code == META_ENCODINGS["packed"]:
+            self._emit(_pack_octal(self._pending))
+            self._pending = ""
+        elif self._run_length:
+            out = bytearray()
+            _encode_varint(self._run_length << 3 | self._run_symbol, out)
+            self._emit(bytes(out))
+            self._run_length = 0
+        end = self._fh.tell()
+        self._fh.seek(self._start)
+        self._fh.write(_META_HEADER.pack(META_MAGIC, META_VERSION, self._code, self._count, self._crc))
+        self._fh.seek(end)
+
+    def __enter__(self) -> "MetaWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class MetaReader:
+    """
+    Incrementally read metadata written by `MetaWriter`.
+
+    `runs()` yields (symbol, length) pairs straight from the payload; `read(n)`
+    returns the next n symbols as digits for consumers that need a string.
+    The checksum is verified once the payload has been consumed, unless the
+    reader was repositioned with `seek()`.
+
+    Attributes:
+        count:    Total number of symbols in the stream.
+        encoding: 'packed' or 'rle'.
+    """
+
+    def __init__(self, fh: BinaryIO) -> None:
+        header = fh.read(_META_HEADER.size)
+        if len(header) != _META_HEADER.size:
+            raise ValueError("Metadata header is truncated.")
+        magic, version, code, count, crc = _META_HEADER.unpack(header)
+        if magic != META_MAGIC:
+            raise ValueError("Not a binary metadata file (bad magic).")
+        if version != META_VERSION:
+            raise ValueError(f"Unsupported metadata version: {version}.")
+        names = {v: k for k, v in META_ENCODINGS.items()}
+        if code not in names:
+            raise ValueError(f"Unknown metadata encoding code: {code}.")
+        self._fh = fh
+        self.count: int = count
+        self.encoding: str = names[code]
+        self._expected_crc = crc
+        self._crc = 0
+        self._verify = True
+        self._reset(count)
+        if not count:
+            self._finish()
+
+    def _reset(self, remaining: int) -> None:
+        self._blocks = self._iter_blocks(remaining) if self.encoding == "packed" else None
+        self._runs = self._iter_runs(remaining)
+        self._run_symbol = "0"
+        self._run_left = 0
+        self._buffer = ""
+
+    def seek(self, offset: int, skip: int, position: int) -> None:
+        """
+        Reposition at a checkpoint recorded with `MetaWriter.position()`.
+
+        Only the symbols read from here on are decoded; the checksum covers the
+        whole payload and is therefore not verified after a seek.
+
+        Args:
+            offset:   Byte offset returned by `MetaWriter.position()`.
+            skip:     Symbol skip returned alongside 'offset'.
+            position: Symbol index at which the checkpoint was taken.
+        """
+        self._fh.seek(offset)
+        self._verify = False
+        self._reset(self.count - position + skip)
+        self.read(skip)
+
+    def _read_payload(self, size: int) -> bytes:
+        data = self._fh.read(size)
+        self._crc = zlib.crc32(data, self._crc)
+        return data
+
+    def _finish(self) -> None:
+        if not self._verify:
+            return
+        if self._fh.read(1):
+            raise ValueError("Metadata has trailing data after the payload.")
+        if self._crc != self._expected_crc:
+            raise ValueError("Metadata checksum mismatch.")
+
+    def _iter_blocks(self, left: int) -> Iterator[str]:
+        """Yield 'left' packed symbols as digit strings, one fixed-size block at a time."""
+        while left:
+            n = min(left, _PACKED_BLOCK_SYMBOLS)
+            nbytes = (3 * n + 7) // 8
+            data = self._read_payload(nbytes)
+            if len(data) != nbytes:
+                raise ValueError("Metadata payload is truncated.")
+            digits = _unpack_octal(data, n)
+            if digits.translate(_META_DIGITS_DELETE):
+                raise ValueError("Metadata payload contains invalid symbols.")
+            left -= n
+            if not left:
+                self._finish()
+            yield digits
+
+    def _iter_runs(self, left: int) -> Iterator[Tuple[str, int]]:
+        if self._blocks is not None:
+            for digits in self._blocks:
+                for run in _META_RUN_RE.finditer(digits):
+                    yield digits[run.start()], run.end() - run.start()
+            return
+
+        value = shift = 0
+        while left:
+            data = self._read_payload(_RLE_READ_BYTES)
+            if not data:
+                raise ValueError("Metadata payload is truncated.")
+            runs: List[Tuple[str, int]] = []
+            for i, byte in enumerate(data):
+                value |= (byte & 0x7F) << shift
+                if byte & 0x80:
+                    shift += 7
+                    continue
+                symbol, length = value & 0x7, value >> 3
+                if symbol > 4 or not length or length > left:
+                    raise ValueError("Metadata payload contains an invalid run.")
+                left -= length
+                runs.append((chr(48 + symbol), length))
+                value = shift = 0
+                if not left:
+                    if i + 1 != len(data) and self._verify:
+                        raise ValueError("Metadata has trailing data after the payload.")
+                    break
+            if not left:
+                # Verify before handing out the final runs so a consumer that
+                # stops at the last symbol still sees corruption.
+                self._finish()
+            yield from runs
+
+    def runs(self) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (symbol, run length) pairs for the remaining symbols.
+
+        Returns:
+            An iterator over runs; consecutive runs may share a symbol.
+        """
+        if self._buffer:
+            raise ValueError("runs() cannot follow a partial read().")
+        if self._run_left:
+            yield self._run_symbol, self._run_left
+            self._run_left = 0
+        yield from self._runs
+
+    def read(self, n: int) -> str:
+        """
+        Return up to 'n' further symbols as a digit string ('' at the end).
+
+        Args:
+            n: Maximum number of symbols to return.
+        """
+        if self._blocks is not None:
+            while len(self._buffer) < n:
+                block = next(self._blocks, None)
+                if block is None:
+                    break
+                self._buffer += block
+            out, self._buffer = self._buffer[:n], self._buffer[n:]
+            return out
+
+        parts: List[str] = []
+        need = n
+        while need:
+            if not self._run_left:
+                run = next(self._runs, None)
+                if run is None:
+                    break
+                self._run_symbol, self._run_left = run
+            take = min(need, self._run_left)
+            parts.append(self._run_symbol * take)
+            self._run_left -= take
+            need -= take
+        return "".join(parts)
+
+
+def pack_meta(meta: str, encoding: str = "packed") -> bytes:
+    """
+    Encode a metadata string in the versioned binary format.
+
+    Args:
+        meta:     Metadata digits '0'–'4' as produced by `encrypt_with_meta`.
+        encoding: 'packed' (3 bits per symbol) or 'rle' (run-length varints).
+
+    Returns:
+        The header and payload as bytes.
+    """
+    buf = io.BytesIO()
+    with MetaWriter(buf, encoding) as writer:
+        writer.write(meta)
+    return buf.getvalue()
+
+
+def unpack_meta(blob: bytes) -> str:
+    """
+    Decode a binary metadata blob back into its digit string.
+
+    Args:
+        blob: Bytes produced by `pack_meta` or `MetaWriter`.
+
+    Returns:
+        The metadata digits.
+    """
+    reader = MetaReader(io.BytesIO(blob))
+    return reader.read(reader.count)
+
+
+def _decrypt_with_binary_meta(cipher: str, reader: MetaReader, tables: CipherTables) -> str:
+    """
+    Decrypt 'cipher' driven directly by a binary metadata stream.
+
+    Run-length metadata translates one ciphertext slice per run; packed
+    metadata is decoded a block at a time and never held in full.
+
+    Args:
+        cipher: The encrypted text.
+        reader: Metadata source positioned at the start of its payload.
+        tables: Cipher tables for the shift pair.
+
+    Returns:
+        The decrypted plaintext.
+
+    Raises:
+        ValueError: If the symbol count differs from the ciphertext length.
+    """
+    if reader.count != len(cipher):
+        raise ValueError("Metadata length does not match ciphertext length.")
+
+    out: List[str] = []
+    pos = 0
+    if reader.encoding == "rle":
+        for symbol, length in reader.runs():
+            out.append(cipher[pos:pos + length].translate(tables.inverse[symbol]))
+            pos += length
+        return "".join(out)
+
+    while pos < len(cipher):
+        digits = reader.read(_PACKED_BLOCK_SYMBOLS)
+        out.append(_decrypt_runs(cipher[pos:pos + len(digits)], digits, tables))
+        pos += len(digits)
+    return "".join(out)
+
+
+# --------------------------- Streaming Pipeline ------------------------------
+
+# Characters per read; bounds peak memory to a few times this many code points.
+DEFAULT_CHUNK_CHARS: int = 1 << 20
+
+# Characters between random-access index checkpoints (see `decrypt_range`).
+DEFAULT_INDEX_EVERY: int = 1 << 16
+
+
+def _read_chunks(fh: TextIO, chunk_chars: int) -> Iterator[str]:
+    """
+    Yield successive chunks of at most 'chunk_chars' characters from a text stream.
+
+    Text-mode streams decode incrementally, so a multi-byte UTF-8 sequence that
+    straddles a read boundary is held back until complete and never split.
+
+    Args:
+        fh:          An open text-mode file object.
+        chunk_chars: Maximum number of characters per chunk (≥ 1).
+
+    Returns:
+        An iterator over non-empty string chunks.
+    """
+    if chunk_chars < 1:
+        raise ValueError("chunk_chars must be ≥ 1.")
+    while True:
+        chunk = fh.read(chunk_chars)
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextlib.contextmanager
+def _open_meta_sink(meta_path: Path, meta_format: str) -> Iterator[Union[TextIO, MetaWriter]]:
+    """
+    Open a metadata output with a `write(str)` method for the requested format.
+
+    Args:
+        meta_path:   Metadata output file.
+        meta_format: 'text', 'packed' or 'rle'.
+
+    Returns:
+        A context manager yielding a text file or a `MetaWriter`.
+    """
+    if meta_format == "text":
+        with open(meta_path, "w", encoding="utf-8") as fh:
+            yield fh
+        return
+    with open(meta_path, "wb") as fh, MetaWriter(fh, meta_format) as writer:
+        yield writer
+
+
+def _open_meta_source(meta_path: Path, stack: contextlib.ExitStack) -> Union[TextIO, MetaReader]:
+    """
+    Open a metadata input with a `read(n) -> str` method, detecting its format.
+
+    Args:
+        meta_path: Metadata input file (text digits or binary format).
+        stack:     ExitStack that takes ownership of the opened file.
+
+    Returns:
+        A text file object or a `MetaReader`.
+    """
+    fh = stack.enter_context(open(meta_path, "rb"))
+    if fh.read(len(META_MAGIC)) == META_MAGIC:
+        fh.seek(0)
+        return MetaReader(fh)
+    fh.seek(0)
+    return stack.enter_context(io.TextIOWrapper(fh, encoding="utf-8"))
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """
+    Normalise a worker count: None or 0 means one worker per CPU core.
+
+    Args:
+        workers: Requested number of worker processes.
+
+    Returns:
+        A positive worker count.
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError("workers must be ≥ 0.")
+    return workers
+
+
+def _map_ordered(
+    fn: Callable[..., T], arg_tuples: Iterable[Tuple], workers: int
+) -> Iterator[T]:
+    """
+    Apply 'fn' to each argument tuple, yielding results in input order.
+
+    With more than one worker the calls run in a process pool. At most
+    2 × workers chunks are in flight, so memory stays bounded however large
+    the input is.
+
+    Args:
+        fn:         Module-level (picklable) function.
+        arg_tuples: Iterable of positional-argument tuples for 'fn'.
+        workers:    Number of processes (1 runs inline).
+
+    Returns:
+        An iterator over results, ordered like 'arg_tuples'.
+    """
+    if workers == 1:
+        for args in arg_tuples:
+            yield fn(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _submit_ordered(pool, fn, arg_tuples, 2 * workers)
+
+
+def _submit_ordered(
+    pool: ProcessPoolExecutor, fn: Callable[..., T], arg_tuples: Iterable[Tuple], window: int
+) -> Iterator[T]:
+    """
+    Submit 'fn' calls to 'pool' lazily, yielding results in input order.
+
+    At most 'window' calls are pending at a time; the oldest one is drained
+    before the next is submitted.
+
+    Args:
+        pool:       Running process pool.
+        fn:         Module-level (picklable) function.
+        arg_tuples: Iterable of positional-argument tuples for 'fn'.
+        window:     Maximum number of submitted, unconsumed calls.
+
+    Returns:
+        An iterator over results, ordered like 'arg_tuples'.
+    """
+    pending: Deque[Future] = deque()
+    for args in arg_tuples:
+        pending.append(pool.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def encrypt_file(
+    src: Path,
+    enc_path: Path,
+    meta_path: Path,
+    shift1: int,
+    shift2: int,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    meta_format: str = "text",
+    workers: Optional[int] = 1,
+    index_path: Optional[Path] = None,
+    index_every: int = DEFAULT_INDEX_EVERY,
+) -> int:
+    """
+    Stream-encrypt 'src' into ciphertext and metadata files with a fixed buffer.
+
+    Output is identical to `encrypt_with_meta` on the whole file followed by
+    `Path.write_text`, including newline handling. With 'meta_format' set to
+    'packed' or 'rle' the metadata is written in the binary format instead.
+
+    The cipher is position-independent, so with 'workers' > 1 the file is
+    split into byte ranges at character boundaries (never inside '\r\n'), and
+    each worker reads, encrypts (`encrypt_bytes_with_meta`) and writes its own
+    range in place (see `_encrypt_file_parallel`). Single-worker runs
+    with text metadata stay in bytes and use the ASCII fast path chunk by
+    chunk; with 'workers' > 1 'chunk_chars' is the byte length of each range.
+
+    With 'index_path' a sidecar offset index is written that records, every
+    'index_every' characters, where that position starts in the ciphertext
+    and metadata files (see `decrypt_range`).
+
+    Args:
+        src:         Plaintext input file (UTF-8).
+        enc_path:    Ciphertext output file.
+        meta_path:   Metadata output file.
+        shift1:      First integer parameter.
+        shift2:      Second integer parameter.
+        chunk_chars: Characters processed per iteration.
+        meta_format: 'text' (one digit per character), 'packed' or 'rle'.
+        workers:     Worker processes; 0 or None uses every CPU core.
+        index_path:  Optional sidecar index output file (JSON).
+        index_every: Characters between index checkpoints.
+
+    Returns:
+        The number of characters encrypted.
+    """
+    workers = _resolve_workers(workers)
+    if index_path is None and os.linesep == "\n":
+        if workers > 1 and hasattr(os, "pwrite"):
+            return _encrypt_file_parallel(src, enc_path, meta_path, shift1, shift2, chunk_chars,
+                                          meta_format, workers)
+        if meta_format == "text":
+            with open(src, "rb") as fin, open(enc_path, "wb") as fenc, open(meta_path, "wb") as fmeta:
+                return _encrypt_stream_ascii(fin, fenc, fmeta, shift1, shift2, chunk_chars)
+
+    total = 0
+    with contextlib.ExitStack() as stack:
+        fin = stack.enter_context(open(src, "r", encoding="utf-8"))
+        fenc = stack.enter_context(open(enc_path, "w", encoding="utf-8"))
+        fmeta = stack.enter_context(_open_meta_sink(meta_path, meta_format))
+        index = _OffsetIndexBuilder(index_every, fmeta) if index_path is not None else None
+        jobs = ((chunk, shift1, shift2) for chunk in _read_chunks(fin, chunk_chars))
+        for cipher, meta in _map_ordered(encrypt_with_meta, jobs, workers):
+            if index is None:
+                fenc.write(cipher)
+                fmeta.write(meta)
+            else:
+                index.write(cipher, meta, fenc, fmeta)
+            total += len(cipher)
+    if index is not None:
+        index.save(index_path, meta_format)
+    return total
+
+
+def decrypt_file(
+    enc_path: Path,
+    meta_path: Path,
+    dst: Path,
+    shift1: int,
+    shift2: int,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    workers: Optional[int] = 1,
+) -> int:
+    """
+    Stream-decrypt ciphertext + metadata files into 'dst' with a fixed buffer.
+
+    Both inputs are read in lock-step chunks of the same character count, so
+    positions stay aligned across chunk boundaries. Text and binary metadata
+    files are told apart by the binary format's magic number. With 'workers'
+    > 1 the ciphertext is split into byte ranges and each worker reads its own
+    cipher and metadata slice and writes its plaintext in place (see
+    `_decrypt_file_parallel`); 'chunk_chars' is then the byte length of each range.
+
+    Args:
+        enc_path:    Ciphertext input file.
+        meta_path:   Metadata input file.
+        dst:         Plaintext output file.
+        shift1:      First integer parameter used during encryption.
+        shift2:      Second integer parameter used during encryption.
+        chunk_chars: Characters processed per iteration.
+        workers:     Worker processes; 0 or None uses every CPU core.
+
+    Returns:
+        The number of characters decrypted.
+
+    Raises:
+        ValueError: If the two inputs have different character lengths.
+    """
+    workers = _resolve_workers(workers)
+    if workers > 1 and os.linesep == "\n" and hasattr(os, "pwrite"):
+        return _decrypt_file_parallel(enc_path, meta_path, dst, shift1, shift2, chunk_chars, workers)
+
+    total = 0
+    with contextlib.ExitStack() as stack:
+        fenc = stack.enter_context(open(enc_path, "r", encoding="utf-8"))
+        fmeta = _open_meta_source(meta_path, stack)
+        fout = stack.enter_context(open(dst, "w", encoding="utf-8"))
+
+        def jobs() -> Iterator[Tuple[str, str, int, int]]:
+            while True:
+                cipher = fenc.read(chunk_chars)
+                meta = fmeta.read(chunk_chars)
+                if not cipher and not meta:
+                    return
+                # decrypt_with_meta rejects a short read on either side
+                yield cipher, meta, shift1, shift2
+
+        for plain in _map_ordered(decrypt_with_meta, jobs(), workers):
+            fout.write(plain)
+            total += len(plain)
+    return total
+
+
+# --------------------------- Random-Access Index -----------------------------
+#
+# Sidecar JSON written next to the ciphertext:
+#   {"version": 1, "every": N, "chars": total, "meta_format": "text|packed|rle",
+#    "entries": [[char_pos, cipher_byte, meta_byte, meta_skip], ...]}
+# with one entry every N characters (char_pos = 0, N, 2N, ...). 'meta_skip'
+# is the number of symbols decoded at 'meta_byte' before char_pos (always 0
+# for text metadata).
+
+INDEX_VERSION: int = 1
+
+
+def _encoded_len(text: str) -> int:
+    """Return the size in bytes of 'text' as written by a UTF-8 text-mode file."""
+    n = len(text) if text.isascii() else len(text.encode("utf-8"))
+    if os.linesep != "\n":
+        n += text.count("\n") * (len(os.linesep) - 1)
+    return n
+
+
+class _OffsetIndexBuilder:
+    """
+    Write ciphertext and metadata while recording checkpoint offsets.
+
+    Chunks are split at checkpoint boundaries so the metadata writer can
+    report its exact position there.
+    """
+
+    def __init__(self, every: int, fmeta: Union[TextIO, MetaWriter]) -> None:
+        if every < 1:
+            raise ValueError("index_every must be ≥ 1.")
+        self.every = every
+        self.chars = 0
+        self.cipher_bytes = 0
+        self.entries: List[List[int]] = [[0, 0, *self._meta_position(fmeta)]]
+
+    def _meta_position(self, fmeta: Union[TextIO, MetaWriter]) -> Tuple[int, int]:
+        if isinstance(fmeta, MetaWriter):
+            return fmeta.position()
+        return self.chars, 0  # text metadata: one ASCII byte per character
+
+    def write(self, cipher: str, meta: str, fenc: TextIO, fmeta: Union[TextIO, MetaWriter]) -> None:
+        """Write one encrypted chunk, adding an entry at each checkpoint crossed."""
+        pos = 0
+        while pos < len(cipher):
+            take = min(len(cipher) - pos, self.every - self.chars % self.every)
+            piece = cipher[pos:pos + take]
+            fenc.write(piece)
+            fmeta.write(meta[pos:pos + take])
+            self.cipher_bytes += _encoded_len(piece)
+            self.chars += take
+            pos += take
+            if self.chars % self.every == 0:
+                self.entries.append([self.chars, self.cipher_bytes, *self._meta_position(fmeta)])
+
+    def save(self, path: Path, meta_format: str) -> None:
+        """Persist the index as JSON."""
+        index = {
+            "version": INDEX_VERSION,
+            "every": self.every,
+            "chars": self.chars,
+            "meta_format": meta_format,
+            "entries": self.entries,
+        }
+        Path(path).write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+
+
+def load_offset_index(index_path: Path) -> Dict:
+    """
+    Load and validate a sidecar index written by `encrypt_file`.
+
+    Args:
+        index_path: Index file.
+
+    Returns:
+        The index as a dict (see the layout above).
+
+    Raises:
+        ValueError: If the file is not a supported index.
+    """
+    index = json.loads(Path(index_path).read_text(encoding="utf-8"))
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported index version: {index.get('version')}.")
+    return index
+
+
+def decrypt_range(
+    enc_path: Path,
+    meta_path: Path,
+    index_path: Path,
+    start: int,
+    end: int,
+    shift1: int,
+    shift2: int,
+) -> str:
+    """
+    Decrypt characters [start, end) without reading the files from the beginning.
+
+    The nearest checkpoint at or before 'start' is looked up in the index;
+    both files are opened at the recorded byte offsets, so the work done is
+    proportional to the range plus at most one index interval.
+
+    Args:
+        enc_path:   Ciphertext file.
+        meta_path:  Metadata file (any format) written in the same run.
+        index_path: Sidecar index written by `encrypt_file`.
+        start:      First character position (inclusive).
+        end:        Last character position (exclusive).
+        shift1:     First integer parameter used during encryption.
+        shift2:     Second integer parameter used during encryption.
+
+    Returns:
+        The decrypted text of the requested range.
+
+    Raises:
+        ValueError: If the range lies outside the encrypted text.
+    """
+    index = load_offset_index(index_path)
+    if not 0 <= start <= end <= index["chars"]:
+        raise ValueError(f"Range [{start}, {end}) outside 0..{index['chars']}.")
+    entries = index["entries"]
+    k = bisect.bisect_right(entries, [start, float("inf")]) - 1
+    char_pos, cipher_byte, meta_byte, meta_skip = entries[k]
+    lead, n = start - char_pos, end - start
+
+    with open(enc_path, "rb") as fb:
+        fb.seek(cipher_byte)
+        text = io.TextIOWrapper(fb, encoding="utf-8")
+        text.read(lead)
+        cipher = text.read(n)
+
+    with open(meta_path, "rb") as fm:
+        if index["meta_format"] == "text":
+            fm.seek(meta_byte + lead)
+            meta = fm.read(n).decode("ascii")
+        else:
+            reader = MetaReader(fm)
+            reader.seek(meta_byte, meta_skip, char_pos)
+            reader.read(lead)
+            meta = reader.read(n)
+
+    return decrypt_with_meta(cipher, meta, shift1, shift2)
+
+
+# ------------------------------ Verification ---------------------------------
+
+# Bytes compared per step when scanning memory-mapped files.
+VERIFY_BLOCK_BYTES: int = 1 << 20
+DEFAULT_DIGEST: str = "blake2b"
+
+
+@contextlib.contextmanager
+def _mapped(path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    Memory-map 'path' read-only (empty files yield b'', which cannot be mapped).
+
+    Args:
+        path: File to map.
+
+    Returns:
+        A context manager yielding an `mmap.mmap` (or b'' for an empty file).
+    """
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _first_difference(
+    a: Union[mmap.mmap, bytes], b: Union[mmap.mmap, bytes], block: int
+) -> Optional[int]:
+    """
+    Return the first byte offset at which two buffers differ, or None.
+
+    Whole blocks are compared first; inside the first mismatching block the
+    range is halved until a single byte remains, so only O(log block) extra
+    comparisons are needed.
+
+    Args:
+        a, b:  Buffers supporting slicing (mmap or bytes).
+        block: Bytes compared per step.
+
+    Returns:
+        The offset of the first difference; the shorter length if one buffer
+        is a prefix of the other; None if they are identical.
+    """
+    n = min(len(a), len(b))
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        if a[start:end] == b[start:end]:
+            continue
+        lo, hi = start, end  # invariant: [start, lo) equal, difference in [lo, hi)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if a[lo:mid] == b[lo:mid]:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+    return None if len(a) == len(b) else n
+
+
+def byte_offset_to_char_index(data: Union[mmap.mmap, bytes], offset: int) -> int:
+    """
+    Convert a byte offset in UTF-8 'data' to the index of the character containing it.
+
+    Characters are counted as code points of the raw bytes (no newline
+    translation), by counting the bytes that start a UTF-8 sequence.
+
+    Args:
+        data:   UTF-8 encoded file contents (mmap or bytes).
+        offset: Byte offset (0 ≤ offset ≤ len(data)).
+
+    Returns:
+        The character index.
+    """
+    # Step back to the lead byte of a multi-byte sequence.
+    while 0 < offset < len(data) and 0x80 <= data[offset] < 0xC0:
+        offset -= 1
+    index = 0
+    for start in range(0, offset, VERIFY_BLOCK_BYTES):
+        chunk = data[start:min(start + VERIFY_BLOCK_BYTES, offset)]
+        index += len(chunk.translate(None, _UTF8_CONTINUATION))
+    return index
+
+
+def _verify_text_chunks(a: Path, b: Path, chunk_chars: int) -> Tuple[bool, Optional[int]]:
+    """
+    Compare two files as decoded text in bounded chunks (universal newlines).
+
+    Args:
+        a, b:        Files to compare.
+        chunk_chars: Characters read from each file per step.
+
+    Returns:
+        Same contract as `verify_files`.
+    """
+    pos = 0
+    with open(a, "r", encoding="utf-8") as fa, open(b, "r", encoding="utf-8") as fb:
+        while True:
+            ca, cb = fa.read(chunk_chars), fb.read(chunk_chars)
+            if ca == cb:
+                if not ca:
+                    return True, None
+                pos += len(ca)
+                continue
+            for i, (x, y) in enumerate(zip(ca, cb)):
+                if x != y:
+                    return False, pos + i
+            return False, pos + min(len(ca), len(cb))
+
+
+def verify_files(a: Path, b: Path) -> Tuple[bool, int | None]:
+    """
+    Compare two text files for equality.
+
+    Both files are memory-mapped and compared in large blocks; on a mismatch
+    the first differing byte is located by bisection inside the block and
+    converted to a character index. If the bytes differ and either file
+    contains a carriage return, the files are compared as decoded text
+    instead (in bounded chunks), so CRLF and LF line endings still compare
+    equal as before.
+
+    Args:
+        a: Path to the first file.
+        b: Path to the second file.
+
+    Returns:
+        (True, None) if files are identical; otherwise
+        (False, index_of_first_difference).
+    """
+    with _mapped(a) as ma, _mapped(b) as mb:
+        offset = _first_difference(ma, mb, VERIFY_BLOCK_BYTES)
+        if offset is None:
+            return True, None
+        if ma.find(b"\r") < 0 and mb.find(b"\r") < 0:
+            return False, byte_offset_to_char_index(ma, offset)
+    return _verify_text_chunks(a, b, DEFAULT_CHUNK_CHARS)
+
+
+def file_digest(path: Path, algorithm: str = DEFAULT_DIGEST, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> str:
+    """
+    Stream a hex digest of a text file's content, as `verify_files` sees it.
+
+    The file is decoded with universal newlines and re-encoded as UTF-8
+    chunk by chunk, so a digest taken of raw_text.txt matches the digest of
+    a correct decrypted_text.txt even if the original used CRLF. The
+    original can then be discarded and round-trips checked against the
+    stored digest alone.
+
+    Args:
+        path:        File to hash.
+        algorithm:   Any `hashlib` algorithm name (default BLAKE2b).
+        chunk_chars: Characters hashed per step.
+
+    Returns:
+        The hexadecimal digest.
+    """
+    h = hashlib.new(algorithm)
+    with open(path, "r", encoding="utf-8") as fh:
+        for chunk in _read_chunks(fh, chunk_chars):
+            h.update(chunk.encode("utf-8"))
+    return h.hexdigest()
+
+
+def verify_digest(path: Path, expected: str, algorithm: str = DEFAULT_DIGEST) -> bool:
+    """
+    Check a file against a previously stored `file_digest`.
+
+    Args:
+        path:      File to check.
+        expected:  Hex digest recorded earlier.
+        algorithm: Algorithm used to produce 'expected'.
+
+    Returns:
+        True if the digests match.
+    """
+    return hmac.compare_digest(file_digest(path, algorithm), expected.strip().lower())
+
+
+# ------------------------------- Batch Mode ----------------------------------
+
+class BatchJob(NamedTuple):
+    """
+    One file to encrypt in a batch run.
+
+    Attributes:
+        src:    Plaintext input file.
+        enc:    Ciphertext output file.
+        meta:   Metadata output file.
+        shift1: First integer parameter.
+        shift2: Second integer parameter.
+    """
+    src: Path
+    enc: Path
+    meta: Path
+    shift1: int
+    shift2: int
+
+
+def jobs_from_directory(
+    folder: Path, out_dir: Path, shift1: int, shift2: int, pattern: str = "*.txt"
+) -> List[BatchJob]:
+    """
+    Build one job per file under 'folder' matching 'pattern' (recursively).
+
+    Outputs mirror the input tree under 'out_dir' as '<name>.enc' / '<name>.meta'.
+
+    Args:
+        folder:  Input directory.
+        out_dir: Output directory.
+        shift1:  First integer parameter for every file.
+        shift2:  Second integer parameter for every file.
+        pattern: Glob pattern selecting input files.
+
+    Returns:
+        Jobs sorted by input path.
+    """
+    jobs: List[BatchJob] = []
+    for src in sorted(Path(folder).rglob(pattern)):
+        if not src.is_file():
+            continue
+        rel = src.relative_to(folder)
+        target = Path(out_dir) / rel.parent
+        jobs.append(BatchJob(src, target / f"{rel.name}.enc", target / f"{rel.name}.meta",
+                             shift1, shift2))
+    return jobs
+
+
+def jobs_from_manifest(
+    manifest: Path, out_dir: Path, shift1: Optional[int] = None, shift2: Optional[int] = None
+) -> List[BatchJob]:
+    """
+    Build jobs from a JSONL manifest.
+
+    Each non-blank line is an object with "path" and, unless defaults are
+    given, "shift1"/"shift2"; optional "encrypted"/"meta" override the output
+    paths. Relative paths are resolved against the manifest's folder. Default
+    outputs mirror each input's path relative to that folder under 'out_dir'
+    (as `jobs_from_directory` does); inputs outside it fall back to their
+    file name.
+
+    Args:
+        manifest: JSONL file.
+        out_dir:  Output directory for entries without explicit outputs.
+        shift1:   Default first parameter for entries that omit it.
+        shift2:   Default second parameter for entries that omit it.
+
+    Returns:
+        Jobs in manifest order.
+
+    Raises:
+        ValueError: If a line is malformed, lacks shifts, or two entries
+                    would write the same output file.
+    """
+    base = Path(manifest).parent
+    jobs: List[BatchJob] = []
+    claimed: Dict[Path, int] = {}
+    with open(manifest, "r", encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                src = base / entry["path"]
+                s1 = int(entry.get("shift1", shift1))
+                s2 = int(entry.get("shift2", shift2))
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"{manifest}:{lineno}: invalid manifest entry ({exc}).") from exc
+            rel = Path(os.path.normpath(os.path.relpath(src, base)))
+            if rel.is_absolute() or rel.parts[:1] == ("..",):
+                rel = Path(src.name)
+            target = Path(out_dir) / rel.parent
+            enc = base / entry["encrypted"] if "encrypted" in entry else target / f"{rel.name}.enc"
+            meta = base / entry["meta"] if "meta" in entry else target / f"{rel.name}.meta"
+            for out in (enc, meta):
+                key = out.resolve()
+                if key in claimed:
+                    raise ValueError(f"{manifest}:{lineno}: output {out} is already written by "
+                                     f"the entry on line {claimed[key]}.")
+                claimed[key] = lineno
+            jobs.append(BatchJob(src, enc, meta, s1, s2))
+    return jobs
+
+
+def _run_batch_job(job: BatchJob, meta_format: str, verify: bool) -> Dict[str, object]:
+    """
+    Encrypt one batch job (optionally verifying the round-trip) and report on it.
+
+    Runs in pool workers; errors are captured in the result rather than raised
+    so one bad file does not stop the batch.
+
+    Returns:
+        A summary record: path, encrypted and meta output paths, status ('ok',
+        'mismatch' or 'error'), chars, seconds, and error text if any.
+    """
+    start = time.perf_counter()
+    record: Dict[str, object] = {"path": str(job.src), "encrypted": str(job.enc),
+                                 "meta": str(job.meta), "status": "ok", "chars": 0}
+    try:
+        job.enc.parent.mkdir(parents=True, exist_ok=True)
+        job.meta.parent.mkdir(parents=True, exist_ok=True)
+        record["chars"] = encrypt_file(job.src, job.enc, job.meta, job.shift1, job.shift2,
+                                       meta_format=meta_format)
+        if verify:
+            fd, tmp = tempfile.mkstemp(dir=job.enc.parent, suffix=".dec")
+            os.close(fd)
+            try:
+                decrypt_file(job.enc, job.meta, Path(tmp), job.shift1, job.shift2)
+                same, idx = verify_files(job.src, Path(tmp))
+            finally:
+                os.remove(tmp)
+            if not same:
+                record.update(status="mismatch", first_difference=idx)
+    except (OSError, ValueError, UnicodeDecodeError) as exc:
+        record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    workers: Optional[int] = None,
+    executor: str = "process",
+    meta_format: str = "text",
+    verify: bool = False,
+) -> List[Dict[str, object]]:
+    """
+    Encrypt many files over a thread or process pool.
+
+    Each worker keeps its own `build_cipher_tables` cache, so tables are
+    built once per distinct shift pair per worker rather than per file.
+
+    Args:
+        jobs:        Files to process.
+        workers:     Pool size; 0 or None uses every CPU core.
+        executor:    'process' or 'thread'.
+        meta_format: Metadata encoding for every output.
+        verify:      Decrypt each output to a temporary file and compare.
+
+    Returns:
+        One summary record per job, in job order (see `_run_batch_job`).
+
+    Raises:
+        ValueError: If `executor` is neither 'process' nor 'thread'.
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unknown executor: {executor!r}.")
+    workers = _resolve_workers(workers)
+    fn = functools.partial(_run_batch_job, meta_format=meta_format, verify=verify)
+    if workers == 1 or len(jobs) <= 1:
+        return [fn(job) for job in jobs]
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, jobs))
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, jobs, chunksize=chunksize))
+
+
+def write_batch_summary(records: List[Dict[str, object]], path: Path) -> Dict[str, object]:
+    """
+    Persist per-file batch records with totals as JSON.
+
+    Args:
+        records: Output of `run_batch`.
+        path:    Summary file.
+
+    Returns:
+        The totals block that was written.
+    """
+    totals: Dict[str, object] = {
+        "files": len(records),
+        "ok": sum(r["status"] == "ok" for r in records),
+        "mismatch": sum(r["status"] == "mismatch" for r in records),
+        "error": sum(r["status"] == "error" for r in records),
+        "chars": sum(int(r["chars"]) for r in records),
+        "seconds": round(sum(float(r["seconds"]) for r in records), 6),
+    }
+    Path(path).write_text(json.dumps({"totals": totals, "files": records}, indent=2),
+                          encoding="utf-8")
+    return totals
+
+
+def _prompt_int(msg: str) -> int:
+    """
+    Prompt the user until a valid integer is entered.
+
+    Args:
+        msg: The message displayed to the user.
+
+    Returns:
+        A validated integer provided by the user.
+    """
+    while True:
+        try:
+            return int(input(msg).strip())
+        except ValueError:
+            print("Please enter an integer.")
+
+
+# ----------------------------- Main Program ----------------------------------
+
+def run_pipeline(
+    raw_path: Path,
+    enc_path: Path,
+    meta_path: Path,
+    dec_path: Path,
+    shift1: int,
+    shift2: int,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    meta_format: str = "text",
+    workers: Optional[int] = 1,
+) -> bool:
+    """
+    Encrypt → decrypt → verify using the streaming pipeline, reporting progress.
+
+    Args:
+        raw_path:    Plaintext input file.
+        enc_path:    Ciphertext output file.
+        meta_path:   Metadata output file.
+        dec_path:    Decrypted output file.
+        shift1:      First integer parameter.
+        shift2:      Second integer parameter.
+        chunk_chars: Characters processed per iteration.
+        meta_format: 'text', 'packed' or 'rle' metadata encoding.
+        workers:     Worker processes; 0 or None uses every CPU core.
+
+    Returns:
+        True if the decrypted file matches the original.
+    """
+    # Ensure raw input file exists before proceeding
+    if not raw_path.exists():
+        raise FileNotFoundError(
+            f"Input file not found: {raw_path.resolve()}.\n"
+            f"Please create '{raw_path.name}' in the same folder."
+        )
+
+    # 1) Encrypt raw → encrypted + metadata
+    encrypt_file(raw_path, enc_path, meta_path, shift1, shift2, chunk_chars, meta_format, workers)
+    print(f"[OK] Encrypted  → {enc_path.name}")
+    print(f"[OK] Metadata   → {meta_path.name}")
+
+    # 2) Decrypt encrypted using metadata → decrypted
+    decrypt_file(enc_path, meta_path, dec_path, shift1, shift2, chunk_chars, workers)
+    print(f"[OK] Decrypted  → {dec_path.name}")
+
+    # 3) Verify original vs decrypted
+    same, idx = verify_files(raw_path, dec_path)
+    if same:
+        print(f"[SUCCESS] Decryption verified: {dec_path.name} matches {raw_path.name}")
+    else:
+        print("[WARNING] Files differ! First difference at index:", idx)
+    return same
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the non-interactive command-line interface.
+
+    Returns:
+        An argparse parser with 'encrypt', 'decrypt', 'decrypt-range', 'run',
+        'batch', 'verify' and 'digest' sub-commands.
+    """
+    base = Path(__file__).parent
+    parser = argparse.ArgumentParser(
+        description="HIT137 Q1 cipher. Run without arguments for the interactive flow."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--shift1", type=int, required=True, help="first shift parameter")
+        p.add_argument("--shift2", type=int, required=True, help="second shift parameter")
+        p.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS,
+                       help="characters per streaming chunk (default: %(default)s)")
+        p.add_argument("--workers", type=int, default=1,
+                       help="worker processes; 0 = one per CPU core (default: %(default)s)")
+
+    def add_meta_format(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--meta-format", choices=["text", *META_ENCODINGS], default="text",
+                       help="metadata encoding (default: %(default)s)")
+
+    p_enc = sub.add_parser("encrypt", help="encrypt a file and write ciphertext + metadata")
+    p_enc.add_argument("input", type=Path, help="plaintext input file")
+    p_enc.add_argument("encrypted", type=Path, help="ciphertext output file")
+    p_enc.add_argument("meta", type=Path, help="metadata output file")
+    add_common(p_enc)
+    add_meta_format(p_enc)
+    p_enc.add_argument("--index", type=Path, help="also write a random-access offset index here")
+    p_enc.add_argument("--index-every", type=int, default=DEFAULT_INDEX_EVERY,
+                       help="characters between index checkpoints (default: %(default)s)")
+
+    p_dec = sub.add_parser("decrypt", help="decrypt ciphertext using its metadata")
+    p_dec.add_argument("encrypted", type=Path, help="ciphertext input file")
+    p_dec.add_argument("meta", type=Path, help="metadata input file")
+    p_dec.add_argument("output", type=Path, help="plaintext output file")
+    add_common(p_dec)
+
+    p_rng = sub.add_parser("decrypt-range", help="decrypt characters [start, end) via an index")
+    p_rng.add_argument("encrypted", type=Path, help="ciphertext input file")
+    p_rng.add_argument("meta", type=Path, help="metadata input file")
+    p_rng.add_argument("index", type=Path, help="index written by 'encrypt --index'")
+    p_rng.add_argument("start", type=int, help="first character position")
+    p_rng.add_argument("end", type=int, help="character position after the last one")
+    p_rng.add_argument("--shift1", type=int, required=True, help="first shift parameter")
+    p_rng.add_argument("--shift2", type=int, required=True, help="second shift parameter")
+
+    p_run = sub.add_parser("run", help="encrypt → decrypt → verify round-trip")
+    p_run.add_argument("--input", type=Path, default=base / "raw_text.txt")
+    p_run.add_argument("--encrypted", type=Path, default=base / "encrypted_text.txt")
+    p_run.add_argument("--meta", type=Path, default=base / "encrypted_text.meta")
+    p_run.add_argument("--decrypted", type=Path, default=base / "decrypted_text.txt")
+    add_common(p_run)
+    add_meta_format(p_run)
+
+    p_bat = sub.add_parser("batch", help="encrypt many files from a directory or JSONL manifest")
+    source = p_bat.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", type=Path, help="encrypt every file matching --pattern here")
+    source.add_argument("--manifest", type=Path, help='JSONL lines: {"path": ..., "shift1": .., "shift2": ..}')
+    p_bat.add_argument("--pattern", default="*.txt", help="glob for --dir (default: %(default)s)")
+    p_bat.add_argument("--out", type=Path, required=True, help="output directory")
+    p_bat.add_argument("--shift1", type=int, help="shift1 for --dir (default for manifest entries)")
+    p_bat.add_argument("--shift2", type=int, help="shift2 for --dir (default for manifest entries)")
+    p_bat.add_argument("--workers", type=int, default=0, help="pool size; 0 = one per CPU core")
+    p_bat.add_argument("--executor", choices=["process", "thread"], default="process")
+    p_bat.add_argument("--verify", action="store_true", help="round-trip check every file")
+    p_bat.add_argument("--summary", type=Path, help="summary JSON (default: OUT/batch_summary.json)")
+    add_meta_format(p_bat)
+
+    p_ver = sub.add_parser("verify", help="compare a file with another file or a stored digest")
+    p_ver.add_argument("file", type=Path, help="file to check (e.g. the decrypted output)")
+    target = p_ver.add_mutually_exclusive_group(required=True)
+    target.add_argument("--against", type=Path, help="reference file (e.g. the original)")
+    target.add_argument("--digest", help="hex digest recorded with the 'digest' command")
+    p_ver.add_argument("--algorithm", default=DEFAULT_DIGEST, help="hashlib algorithm for --digest")
+
+    p_dig = sub.add_parser("digest", help="print a streaming digest of a text file")
+    p_dig.add_argument("file", type=Path, help="file to hash")
+    p_dig.add_argument("--algorithm", default=DEFAULT_DIGEST, help="hashlib algorithm (default: %(default)s)")
+    return parser
+
+
+def _run_cli(argv: List[str]) -> int:
+    """
+    Execute one non-interactive sub-command.
+
+    Args:
+        argv: Command-line arguments (without the program name).
+
+    Returns:
+        Process exit status (0 on success).
+    """
+    args = _build_parser().parse_args(argv)
+    if args.command == "encrypt":
+        n = encrypt_file(args.input, args.encrypted, args.meta,
+                         args.shift1, args.shift2, args.chunk_chars, args.meta_format,
+                         args.workers, args.index, args.index_every)
+        print(f"[OK] Encrypted {n} chars → {args.encrypted} (+ {args.meta})")
+        return 0
+    if args.command == "decrypt":
+        n = decrypt_file(args.encrypted, args.meta, args.output,
+                         args.shift1, args.shift2, args.chunk_chars, args.workers)
+        print(f"[OK] Decrypted {n} chars → {args.output}")
+        return 0
+    if args.command == "decrypt-range":
+        sys.stdout.write(decrypt_range(args.encrypted, args.meta, args.index,
+                                       args.start, args.end, args.shift1, args.shift2))
+        return 0
+    if args.command == "batch":
+        if args.dir is not None:
+            if args.shift1 is None or args.shift2 is None:
+                raise SystemExit("batch --dir requires --shift1 and --shift2.")
+            jobs = jobs_from_directory(args.dir, args.out, args.shift1, args.shift2, args.pattern)
+        else:
+            try:
+                jobs = jobs_from_manifest(args.manifest, args.out, args.shift1, args.shift2)
+            except ValueError as exc:
+                raise SystemExit(str(exc)) from exc
+        records = run_batch(jobs, args.workers, args.executor, args.meta_format, args.verify)
+        args.out.mkdir(parents=True, exist_ok=True)
+        summary = args.summary or args.out / "batch_summary.json"
+        totals = write_batch_summary(records, summary)
+        print(f"[OK] {totals['ok']}/{totals['files']} files, {totals['chars']} chars "
+              f"({totals['error']} errors, {totals['mismatch']} mismatches) → {summary}")
+        return 0 if totals["ok"] == totals["files"] else 1
+    if args.command == "digest":
+        print(f"{file_digest(args.file, args.algorithm)}  {args.file}")
+        return 0
+    if args.command == "verify":
+        if args.digest is not None:
+            same = verify_digest(args.file, args.digest, args.algorithm)
+            print("[SUCCESS] Digest matches." if same else "[WARNING] Digest mismatch!")
+        else:
+            same, idx = verify_files(args.against, args.file)
+            print("[SUCCESS] Files match." if same
+                  else f"[WARNING] Files differ! First difference at index: {idx}")
+        return 0 if same else 1
+    same = run_pipeline(args.input, args.encrypted, args.meta, args.decrypted,
+                        args.shift1, args.shift2, args.chunk_chars, args.meta_format,
+                        args.workers)
+    return 0 if same else 1
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Orchestrate the end-to-end workflow:
+        - Validate source availability
+        - Collect shift parameters
+        - Encrypt with metadata and persist outputs
+        - Decrypt using metadata and persist output
+        - Verify original vs decrypted, reporting byte-level parity
+
+    With command-line arguments the prompts are skipped and the requested
+    sub-command runs non-interactively (see `_build_parser`).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(_run_cli(argv))
+
+    print("=== HIT137 Q1: Encrypt → Decrypt → Verify (lossless with metadata) ===")
+
+    # Define file paths relative to current script
+    base = Path(__file__).parent
+    raw_path = base / "raw_text.txt"         # original input text
+    enc_path = base / "encrypted_text.txt"   # encrypted text output
+    meta_path = base / "encrypted_text.meta" # metadata output
+    dec_path = base / "decrypted_text.txt"   # decrypted text output
+
+    # Ensure raw input file exists before prompting
+    if not raw_path.exists():
+        raise FileNotFoundError(
+            f"Input file not found: {raw_path.resolve()}.\n"
+            "Please create 'raw_text.txt' in the same folder."
+        )
+
+    # User input: shift parameters
+    shift1 = _prompt_int("Enter shift1 (integer): ")
+    shift2 = _prompt_int("Enter shift2 (integer): ")
+
+    run_pipeline(raw_path, enc_path, meta_path, dec_path, shift1, shift2)
 
 
 # Entry point
@@ -0,0 +1,405 @@
+# question_1_benchmark
+# ---------------------------------------------------------------------
+# Benchmark Suite for the Question 1 Cipher
+# ---------------------------------------------------------------------
+# Reproducible, offline benchmark harness for question_1.py. Synthetic
+# corpora are generated deterministically from a seed in four character
+# mixes and any number of sizes (1 KB … 1 GB), and each selected function
+# is measured for:
+#   - throughput   (characters per second, best of N runs),
+#   - peak RSS     (resident set size of a fresh child process per case),
+#   - memory       (tracemalloc peak bytes, and the sys.getallocatedblocks()
+#                   delta across the call: blocks it allocated and still
+#                   holds on return, result included).
+# Results are emitted as JSON so runs can be compared across commits
+# (see --compare). Before timing, every engine is checked for parity
+# with the per-character reference loops kept in question_1.py.
+#
+# Usage:
+#   python question_1_benchmark.py [--sizes 1KB,1MB,16MB]
+#       [--corpora ascii,prose,punct,unicode]
+#       [--functions encrypt,decrypt,verify,encrypt_bytes]
+#       [--repeat N] [--output results.json] [--compare baseline.json]
+#
+# Dependencies: Python 3.8+, standard library only (peak RSS needs the
+#               Unix 'resource' module and is reported as null elsewhere).
+# ---------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import question_1 as q1
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ------------------------- Global Constants ----------------------------------
+
+DEFAULT_SIZES: str = "1KB,1MB,16MB"
+DEFAULT_CORPORA: str = "ascii,prose,punct,unicode"
+DEFAULT_FUNCTIONS: str = "encrypt,decrypt,verify,encrypt_bytes"
+DEFAULT_REPEAT: int = 3
+DEFAULT_SEED: int = 137
+SHIFT1: int = 3
+SHIFT2: int = 5
+
+SIZE_UNITS: Dict[str, int] = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30, "": 1}
+
+# Seed block length; corpora are tiled from one deterministic block.
+_BLOCK_CHARS: int = 1 << 16
+
+_WORDS: List[str] = (
+    "the quick brown fox jumps over lazy dog beneath shady willows startled "
+    "from his peaceful afternoon nap rises and chases after mischievous "
+    "Adelaide Darwin Sydney North River Station Monday January"
+).split()
+
+
+# ----------------------------- Corpora ---------------------------------------
+
+def _block_ascii(rng: random.Random) -> str:
+    """Letters only, mixed case: every character goes through a shift rule."""
+    letters = q1.ALPHA_LOWER + q1.ALPHA_UPPER
+    return "".join(rng.choice(letters) for _ in range(_BLOCK_CHARS))
+
+
+def _block_prose(rng: random.Random) -> str:
+    """Words, spaces and sentence punctuation, like raw_text.txt."""
+    parts: List[str] = []
+    size = 0
+    while size < _BLOCK_CHARS:
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 15)))
+        sentence = sentence[0].upper() + sentence[1:] + rng.choice([". ", ", ", "! ", ".\n"])
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)
+
+
+def _block_punct(rng: random.Random) -> str:
+    """Roughly 70% digits, punctuation and whitespace (metadata class '0')."""
+    other = "0123456789 \t\n.,;:!?-()[]{}'\"/\\@#$%^&*_+=<>|~`"
+    letters = q1.ALPHA_LOWER + q1.ALPHA_UPPER
+    return "".join(
+        rng.choice(other) if rng.random() < 0.7 else rng.choice(letters)
+        for _ in range(_BLOCK_CHARS)
+    )
+
+
+def _block_unicode(rng: random.Random) -> str:
+    """Prose interleaved with accented Latin, Greek, CJK and emoji."""
+    extra = "éèüößñçÆØÅΩλπ中文字日本語한국어😀🚀✓€"
+    prose = _block_prose(rng)
+    return "".join(rng.choice(extra) if rng.random() < 0.15 else ch for ch in prose)[:_BLOCK_CHARS]
+
+
+CORPORA: Dict[str, Callable[[random.Random], str]] = {
+    "ascii": _block_ascii,
+    "prose": _block_prose,
+    "punct": _block_punct,
+    "unicode": _block_unicode,
+}
+
+
+def make_corpus(kind: str, chars: int, seed: int = DEFAULT_SEED) -> str:
+    """
+    Generate a deterministic synthetic corpus.
+
+    Args:
+        kind:  One of CORPORA.
+        chars: Number of characters.
+        seed:  Random seed; equal seeds give identical corpora.
+
+    Returns:
+        The corpus string.
+    """
+    block = CORPORA[kind](random.Random(f"{kind}:{seed}"))
+    reps = chars // len(block) + 1
+    return (block * reps)[:chars]
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as '1KB', '16MB' or '1GB' into a character count.
+
+    Args:
+        text: Size with an optional KB/MB/GB suffix (powers of 1024).
+
+    Returns:
+        Number of characters.
+    """
+    text = text.strip().upper()
+    for unit in ("KB", "MB", "GB", ""):
+        if text.endswith(unit) and text[:len(text) - len(unit)].isdigit():
+            return int(text[:len(text) - len(unit)]) * SIZE_UNITS[unit]
+    raise ValueError(f"Invalid size: {text!r}.")
+
+
+# ----------------------------- Measurement -----------------------------------
+
+def _peak_rss_kb() -> Optional[int]:
+    """Return this process's peak RSS in KiB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    """
+    Return the fastest wall time (seconds) of 'repeat' calls to 'fn'.
+
+    Args:
+        fn:     Zero-argument callable to time.
+        repeat: Number of timed runs.
+
+    Returns:
+        Minimum elapsed time across runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _allocations(fn: Callable[[], object]) -> Tuple[int, int]:
+    """
+    Measure the memory one call of 'fn' allocates.
+
+    The block count is the change in `sys.getallocatedblocks()` across a
+    call made with the cyclic GC disabled, read while the return value is
+    still alive. It counts every object-allocator block the call allocated
+    and had not freed on return, its result included. It is taken on its
+    own call without tracemalloc, so tracing overhead is not counted. Peak
+    bytes come from a second, traced call.
+
+    Args:
+        fn: Zero-argument callable.
+
+    Returns:
+        (peak traced bytes during the call, blocks allocated by the call).
+    """
+    gc.collect()
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        result = fn()
+        blocks = sys.getallocatedblocks() - before
+        del result
+    finally:
+        if was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, blocks
+
+
+def _setup(function: str, text: str, workdir: Path) -> Callable[[], object]:
+    """
+    Prepare inputs for one function and return a zero-argument runner.
+
+    Args:
+        function: Benchmark function name (see FUNCTIONS).
+        text:     Corpus.
+        workdir:  Scratch directory for file-based functions.
+
+    Returns:
+        Callable performing exactly the measured work.
+    """
+    if function == "encrypt":
+        return lambda: q1.encrypt_with_meta(text, SHIFT1, SHIFT2)
+    if function == "encrypt_loop":
+        return lambda: q1._encrypt_with_meta_loop(text, SHIFT1, SHIFT2)
+    if function == "encrypt_bytes":
+        data = text.encode("utf-8")
+        return lambda: q1.encrypt_bytes_with_meta(data, SHIFT1, SHIFT2)
+    if function in ("decrypt", "decrypt_loop"):
+        cipher, meta = q1.encrypt_with_meta(text, SHIFT1, SHIFT2)
+        fn = q1.decrypt_with_meta if function == "decrypt" else q1._decrypt_with_meta_loop
+        return lambda: fn(cipher, meta, SHIFT1, SHIFT2)
+    if function == "verify":
+        a, b = workdir / "a.txt", workdir / "b.txt"
+        a.write_text(text, encoding="utf-8")
+        b.write_text(text, encoding="utf-8")
+        return lambda: q1.verify_files(a, b)
+    raise ValueError(f"Unknown function: {function!r}.")
+
+
+FUNCTIONS: Tuple[str, ...] = (
+    "encrypt", "decrypt", "verify", "encrypt_bytes", "encrypt_loop", "decrypt_loop",
+)
+
+
+def run_case(function: str, corpus: str, chars: int, repeat: int, seed: int, memory: bool) -> Dict:
+    """
+    Measure one (function, corpus, size) combination in the current process.
+
+    Intended to run in a fresh child process so that peak RSS reflects this
+    case alone; 'baseline_rss_kb' is the peak after building the inputs.
+
+    Returns:
+        A JSON-serialisable result record.
+    """
+    text = make_corpus(corpus, chars, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = _setup(function, text, Path(tmp))
+        baseline = _peak_rss_kb()
+        seconds = _best_of(fn, repeat)
+        peak_rss = _peak_rss_kb()
+        peak_alloc, blocks = _allocations(fn) if memory else (None, None)
+    return {
+        "function": function,
+        "corpus": corpus,
+        "chars": chars,
+        "seconds": seconds,
+        "chars_per_sec": chars / seconds if seconds > 0 else None,
+        "baseline_rss_kb": baseline,
+        "peak_rss_kb": peak_rss,
+        "peak_alloc_bytes": peak_alloc,
+        "alloc_blocks": blocks,
+    }
+
+
+def check_parity(seed: int) -> None:
+    """
+    Check every engine against the reference loops on each corpus kind.
+
+    Raises:
+        SystemExit: On the first mismatch.
+    """
+    for kind in CORPORA:
+        text = make_corpus(kind, 20_000, seed)
+        ref = q1._encrypt_with_meta_loop(text, SHIFT1, SHIFT2)
+        if q1.encrypt_with_meta(text, SHIFT1, SHIFT2) != ref:
+            raise SystemExit(f"[FAIL] encrypt_with_meta differs from reference ({kind}).")
+        fast = q1.encrypt_bytes_with_meta(text.encode("utf-8"), SHIFT1, SHIFT2)
+        if fast != (ref[0].encode("utf-8"), ref[1].encode("ascii")):
+            raise SystemExit(f"[FAIL] encrypt_bytes_with_meta differs from reference ({kind}).")
+        if q1.decrypt_with_meta(*ref, SHIFT1, SHIFT2) != text:
+            raise SystemExit(f"[FAIL] decrypt_with_meta round-trip failed ({kind}).")
+
+
+# ----------------------------- Reporting -------------------------------------
+
+def _environment() -> Dict[str, Optional[str]]:
+    """Describe the interpreter, platform and (if available) git commit."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results: List[Dict], baseline_path: Path) -> None:
+    """
+    Print throughput ratios against a previous JSON report.
+
+    Args:
+        results:       Current result records.
+        baseline_path: JSON written by an earlier run.
+    """
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    old = {(r["function"], r["corpus"], r["chars"]): r for r in baseline["results"]}
+    print(f"--- vs {baseline_path} (commit {baseline['environment'].get('commit')}) ---", file=sys.stderr)
+    for r in results:
+        prev = old.get((r["function"], r["corpus"], r["chars"]))
+        if prev and prev["chars_per_sec"] and r["chars_per_sec"]:
+            ratio = r["chars_per_sec"] / prev["chars_per_sec"]
+            flag = "  REGRESSION" if ratio < 0.9 else ""
+            print(f"{r['function']:<14} {r['corpus']:<8} {r['chars']:>12,} {ratio:>7.2f}x{flag}",
+                  file=sys.stderr)
+
+
+# ----------------------------- Main Program ----------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Check parity, run every requested case in its own child process, print a
+    summary table to stderr and the JSON report to stdout (or --output).
+    """
+    parser = argparse.ArgumentParser(description="Question 1 cipher benchmark suite")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated sizes, e.g. 1KB,1MB,1GB")
+    parser.add_argument("--corpora", default=DEFAULT_CORPORA, help=f"subset of {','.join(CORPORA)}")
+    parser.add_argument("--functions", default=DEFAULT_FUNCTIONS, help=f"subset of {','.join(FUNCTIONS)}")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per case")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="corpus random seed")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc allocation tracing")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run cases in this process (faster; peak RSS is then cumulative)")
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare throughput against")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    corpora = args.corpora.split(",")
+    functions = args.functions.split(",")
+    for name in corpora:
+        if name not in CORPORA:
+            parser.error(f"unknown corpus {name!r}")
+    for name in functions:
+        if name not in FUNCTIONS:
+            parser.error(f"unknown function {name!r}")
+
+    check_parity(args.seed)
+    results: List[Dict] = []
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'function':<14} {'corpus':<8} {'chars':>12} {'chars/s':>15} {'peak RSS KiB':>13}",
+          file=sys.stderr)
+    for function in functions:
+        for corpus in corpora:
+            for chars in sizes:
+                case = (function, corpus, chars, args.repeat, args.seed, not args.no_memory)
+                if args.in_process:
+                    record = run_case(*case)
+                else:
+                    with ctx.Pool(1) as pool:  # fresh process: isolated peak RSS
+                        record = pool.apply(run_case, case)
+                results.append(record)
+                print(f"{function:<14} {corpus:<8} {chars:>12,} {record['chars_per_sec'] or 0:>15,.0f} "
+                      f"{record['peak_rss_kb'] or 0:>13,}", file=sys.stderr)
+
+    report = {"environment": _environment(), "shifts": [SHIFT1, SHIFT2], "results": results}
+    if args.compare:
+        compare(results, args.compare)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
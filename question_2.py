@@ -17,27 +17,80 @@
 # - Seasons are defined using a conventional austral mapping:
 #     Summer: Dec–Feb; Autumn: Mar–May; Winter: Jun–Aug; Spring: Sep–Nov.
 # - Results are persisted to three text files for auditability and downstream use.
+# - `--wide` skips the melt: a float32 station-record x month matrix with a
+#   NaN mask feeds the same aggregates (vectorised NaN-aware reductions)
+#   and writes the same rounded results.
+# - CSVs are parsed with a pinned schema (categorical names, float32 months,
+#   unused columns skipped), optionally over a process/thread pool, and
+#   cached as typed columnar .npz files keyed on each source file's path,
+#   size and mtime; unchanged files are never re-parsed.
+# - `--incremental` keeps per-station aggregates on disk and folds in only
+#   newly added CSVs, so a new year costs O(new data) rather than O(history).
+# - `--chunked` streams CSVs in row chunks and merges per-chunk aggregates,
+#   so peak memory is bounded by the chunk size, not the dataset.
+# - A memory-mapped station x year x month cube (year taken from the file
+#   name) with prefix sums and sparse min/max tables answers "station S,
+#   years Y1-Y2" summaries in constant time (`--query`).
+# - A grid index over station LAT/LON answers radius, nearest-k and
+#   bounding-box selections and runs the three analytics on just that
+#   region (`--near`, `--nearest`, `--bbox`).
+# - `--profile` (or Q2_PROFILE=1) records wall/CPU time, rows and peak
+#   memory per stage and writes them to profile_report.json.
 #
 # Reproducibility & Transparency:
 # - The pipeline is expressed as pure functions with single responsibilities.
 # - No in-place mutation of inputs; outputs are explicitly returned and saved.
 # - Computation is limited to descriptive statistics (mean, range, std. dev.).
 #
-# Dependencies: pandas, glob, os
+# Dependencies: pandas, numpy, glob, os
 # ---------------------------------------------------------------------
 
 from __future__ import annotations
 
+import argparse
 import glob
+import hashlib
+import json
+import math
 import os
-from typing import Dict, List, Tuple
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
 
+import numpy as np
 import pandas as pd
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 # ------------------------- Constants ---------------------------------
 
+T = TypeVar("T")
+
 DATA_FOLDER: str = "temperatures"
 
+# Parsed-table cache (one .npz per source CSV plus a JSON manifest)
+CACHE_FOLDER: str = ".temperature_cache"
+CACHE_MANIFEST: str = "manifest.json"
+CACHE_VERSION: int = 3
+
+# Rows per chunk in out-of-core mode (see `stream_station_stats`)
+DEFAULT_CHUNK_ROWS: int = 100_000
+
+# Persistent aggregate state for incremental runs (see `update_aggregate_state`)
+STATE_FILE: str = ".temperature_state.npz"
+STATE_VERSION: int = 2
+
+# Significant digits restored when widening float32 temperatures (see `_widen`)
+WIDE_SIGNIFICANT_DIGITS: int = 6
+
 SEASON_MONTHS: Dict[str, List[str]] = {
     "Summer": ["December", "January", "February"],
     "Autumn": ["March", "April", "May"],
@@ -50,10 +103,160 @@ MONTH_COLUMNS: List[str] = [
     "July", "August", "September", "October", "November", "December",
 ]
 
+SEASON_NAMES: List[str] = list(SEASON_MONTHS)
+
+# Columns read from each CSV and their pinned dtypes (STN_ID is skipped)
+STATION_SCHEMA: Dict[str, object] = {
+    "STATION_NAME": "category",
+    "LAT": np.float64,
+    "LON": np.float64,
+    **{month: np.float32 for month in MONTH_COLUMNS},
+}
+
+# Season index for each month position in MONTH_COLUMNS; the trailing -1 is
+# picked up by categorical code -1 (a month label outside MONTH_COLUMNS).
+MONTH_SEASON: np.ndarray = np.array(
+    [
+        next(i for i, months in enumerate(SEASON_MONTHS.values()) if month in months)
+        for month in MONTH_COLUMNS
+    ] + [-1],
+    dtype=np.int64,
+)
+
+# Opt-in per-stage instrumentation (see `StageProfiler`)
+PROFILE_ENV: str = "Q2_PROFILE"
+PROFILE_REPORT: str = "profile_report.json"
+
+# Station x year x month cube (see `build_temperature_cube`)
+CUBE_FOLDER: str = ".temperature_cube"
+CUBE_VERSION: int = 1
+CUBE_GROUPS: List[str] = list(SEASON_MONTHS) + ["All"]
+YEAR_PATTERN = re.compile(r"(\d{4})\D*$")
+
+# Spatial index over station coordinates (see `StationGrid`)
+EARTH_RADIUS_KM: float = 6371.0088
+GRID_CELL_DEGREES: float = 1.0
+
 
 # ------------------------- Data I/O & Reshaping -----------------------
 
-def load_data(folder: str) -> pd.DataFrame:
+def station_files(folder: str) -> List[str]:
+    """Return the temperature CSVs in `folder`, in file-name order."""
+    return sorted(glob.glob(os.path.join(folder, "*.csv")))
+
+
+def read_station_file(path: str) -> pd.DataFrame:
+    """
+    Parse one station CSV into a wide DataFrame (one row per station).
+
+    Only the STATION_SCHEMA columns are read, with pinned dtypes
+    (categorical names, float64 coordinates, float32 months), so pandas
+    does no type inference.
+
+    Args:
+        path: Path to a temperature CSV file.
+
+    Returns:
+        The parsed table: 'STATION_NAME', 'LAT', 'LON' and the twelve month columns.
+    """
+    return pd.read_csv(path, usecols=list(STATION_SCHEMA), dtype=STATION_SCHEMA)
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """
+    Normalise a worker count: None or 0 means one worker per CPU core.
+
+    Args:
+        workers: Requested number of workers.
+
+    Returns:
+        A positive worker count.
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError("workers must be ≥ 0.")
+    return workers
+
+
+def read_station_files(
+    paths: List[str], workers: int = 1, executor: str = "process"
+) -> List[pd.DataFrame]:
+    """
+    Parse many station CSVs, optionally over a process or thread pool.
+
+    Args:
+        paths:    CSV files to parse.
+        workers:  Pool size; 0 or None uses every CPU core.
+        executor: 'process' or 'thread'.
+
+    Returns:
+        One parsed table per path, in input order.
+    """
+    workers = min(_resolve_workers(workers), max(1, len(paths)))
+    if workers == 1:
+        return [read_station_file(path) for path in paths]
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(read_station_file, paths))
+    if executor != "process":
+        raise ValueError(f"Unknown executor: {executor!r}.")
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_station_file, paths, chunksize=chunksize))
+
+
+def _pin_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Re-apply STATION_SCHEMA dtypes where they differ (e.g. after a cache read)."""
+    drift = {
+        col: dtype for col, dtype in STATION_SCHEMA.items()
+        if col in df and df[col].dtype != pd.api.types.pandas_dtype(dtype)
+    }
+    return df.astype(drift) if drift else df
+
+
+def _unify_station_categories(tables: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Give every table the same STATION_NAME categories.
+
+    Concatenating categoricals with different categories silently falls back
+    to strings; with a shared category set the combined column stays categorical.
+    """
+    if not tables:
+        return tables
+    categories = pd.Index(
+        sorted(set().union(*(t["STATION_NAME"].cat.categories for t in tables)))
+    )
+    return [
+        t.assign(STATION_NAME=t["STATION_NAME"].cat.set_categories(categories))
+        for t in tables
+    ]
+
+
+def melt_station_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reshape a wide station table to long format.
+
+    Args:
+        df: Wide DataFrame with 'STATION_NAME' and one column per month.
+
+    Returns:
+        DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+    """
+    return df.melt(
+        id_vars=["STATION_NAME"],
+        value_vars=MONTH_COLUMNS,
+        var_name="Month",
+        value_name="Temperature",
+    )
+
+
+def load_data(
+    folder: str,
+    cache_dir: Optional[str] = None,
+    workers: int = 1,
+    executor: str = "process",
+) -> pd.DataFrame:
     """
     Load and vertically concatenate monthly temperature data from all CSV files in `folder`.
 
@@ -62,95 +265,1181 @@ def load_data(folder: str) -> pd.DataFrame:
     ['STATION_NAME', 'Month', 'Temperature'].
 
     Args:
-        folder: Path to the directory containing temperature CSV files.
+        folder:    Path to the directory containing temperature CSV files.
+        cache_dir: Optional parsed-table cache directory (see `load_station_tables`).
+        workers:   Parallel CSV parsers; 0 uses every CPU core.
+        executor:  'process' or 'thread' pool for parsing.
 
     Returns:
         A pandas DataFrame in long format with non-null 'Temperature' observations.
     """
-    all_files: List[str] = glob.glob(os.path.join(folder, "*.csv"))
-    df_list: List[pd.DataFrame] = []
+    return combine_long(load_station_tables(folder, cache_dir, workers, executor))
 
-    for file in all_files:
-        df = pd.read_csv(file)
-        df_long = df.melt(
-            id_vars=["STATION_NAME"],
-            value_vars=MONTH_COLUMNS,
-            var_name="Month",
-            value_name="Temperature",
-        )
-        df_list.append(df_long)
 
+def combine_long(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Melt wide station tables and concatenate them into one long frame.
+
+    Args:
+        tables: Wide tables (as from `load_station_tables`).
+
+    Returns:
+        Long-format DataFrame with non-null 'Temperature' observations.
+    """
+    df_list: List[pd.DataFrame] = [
+        melt_station_table(df) for df in _unify_station_categories(tables)
+    ]
     combined_df = pd.concat(df_list, ignore_index=True)
     combined_df = combined_df.dropna(subset=["Temperature"])
     return combined_df
 
 
+# ------------------------- Parsed-Table Cache -------------------------
+
+def _file_signature(path: str) -> Dict[str, int]:
+    """Return the (size, mtime) fingerprint a cache entry is keyed on."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _cache_entry_name(path: str) -> str:
+    """Stable cache file name for a source CSV (hash of its absolute path)."""
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return f"{digest[:20]}.npz"
+
+
+def _write_atomic(path: str, write) -> None:
+    """Write via a sibling temporary file so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def save_table_npz(df: pd.DataFrame, path: str) -> None:
+    """
+    Store a parsed table as one typed NumPy array per column.
+
+    Categorical columns are stored as codes plus a category array, other
+    text columns as fixed-width unicode arrays, so the file can be read back
+    without pickle.
+
+    Args:
+        df:   Table to store.
+        path: Destination .npz path.
+    """
+    arrays: Dict[str, np.ndarray] = {"__columns__": np.array(list(df.columns), dtype=str)}
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f"c{i}"] = values.cat.codes.to_numpy()
+            arrays[f"k{i}"] = values.cat.categories.to_numpy(dtype=str)
+        elif values.dtype.kind in "biuf":
+            arrays[f"c{i}"] = values.to_numpy()
+        else:
+            arrays[f"c{i}"] = values.astype(str).to_numpy(dtype=str)
+    _write_atomic(path, lambda fh: np.savez(fh, **arrays))
+
+
+def load_table_npz(path: str) -> pd.DataFrame:
+    """
+    Read a table written by `save_table_npz`.
+
+    Args:
+        path: Source .npz path.
+
+    Returns:
+        The table with its original column order and dtypes.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        columns = [str(c) for c in data["__columns__"]]
+        return pd.DataFrame({
+            col: pd.Categorical.from_codes(data[f"c{i}"], data[f"k{i}"])
+            if f"k{i}" in data else data[f"c{i}"]
+            for i, col in enumerate(columns)
+        })
+
+
+def _read_manifest(cache_dir: str) -> Dict[str, Dict[str, object]]:
+    """Return the cache manifest's file entries (empty if missing or stale)."""
+    try:
+        with open(os.path.join(cache_dir, CACHE_MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != CACHE_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def load_station_tables(
+    folder: str,
+    cache_dir: Optional[str] = None,
+    workers: int = 1,
+    executor: str = "process",
+) -> List[pd.DataFrame]:
+    """
+    Load every CSV in `folder` as a wide table, reusing cached parses.
+
+    With a cache directory, each CSV is looked up by absolute path and
+    matched on size and mtime; only new or changed files are parsed with
+    `read_station_file` and written back. Entries for files that no longer
+    exist are pruned. A warm run therefore does no CSV parsing at all.
+    Files that do need parsing are spread over `read_station_files`' pool.
+
+    Args:
+        folder:    Directory containing temperature CSV files.
+        cache_dir: Cache directory, or None to always parse the CSVs.
+        workers:   Parallel CSV parsers; 0 uses every CPU core.
+        executor:  'process' or 'thread' pool for parsing.
+
+    Returns:
+        One wide DataFrame per CSV, in file-name order, typed per STATION_SCHEMA.
+    """
+    all_files: List[str] = station_files(folder)
+    if cache_dir is None:
+        return read_station_files(all_files, workers, executor)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = _read_manifest(cache_dir)
+    files: Dict[str, Dict[str, object]] = {}
+    tables: List[Optional[pd.DataFrame]] = []
+    misses: List[int] = []
+
+    for i, file in enumerate(all_files):
+        key = os.path.abspath(file)
+        signature = _file_signature(file)
+        entry = cached.get(key)
+        table: Optional[pd.DataFrame] = None
+        if entry is not None and all(entry.get(k) == v for k, v in signature.items()):
+            try:
+                table = _pin_schema(load_table_npz(os.path.join(cache_dir, str(entry["entry"]))))
+            except (OSError, ValueError, KeyError):
+                table = None
+        if table is None:
+            entry = dict(signature, entry=_cache_entry_name(file))
+            misses.append(i)
+        files[key] = entry
+        tables.append(table)
+
+    parsed = read_station_files([all_files[i] for i in misses], workers, executor)
+    for i, table in zip(misses, parsed):
+        entry = files[os.path.abspath(all_files[i])]
+        save_table_npz(table, os.path.join(cache_dir, str(entry["entry"])))
+        tables[i] = table
+    changed = bool(misses)
+
+    for key, entry in cached.items():
+        if key not in files and key.startswith(os.path.abspath(folder) + os.sep):
+            entry_path = os.path.join(cache_dir, str(entry.get("entry", "")))
+            if os.path.isfile(entry_path):
+                os.unlink(entry_path)
+            changed = True
+        elif key not in files:
+            files[key] = entry  # belongs to another folder sharing this cache
+
+    if changed:
+        payload = json.dumps({"version": CACHE_VERSION, "files": files}, indent=2)
+        _write_atomic(
+            os.path.join(cache_dir, CACHE_MANIFEST),
+            lambda fh: fh.write(payload.encode("utf-8")),
+        )
+    return tables
+
+
+# ------------------------- Station Statistics -------------------------
+
+class StationStats(NamedTuple):
+    """
+    Per-station aggregates shared by the three analytics.
+
+    Attributes:
+        stations:     Station names, sorted (the groupby order).
+        count:        Observations per station.
+        total:        Sum of temperatures per station.
+        m2:           Sum of squared deviations from each station's mean.
+        t_min:        Minimum temperature per station.
+        t_max:        Maximum temperature per station.
+        season_count: Observations per (station, season), columns in SEASON_NAMES order.
+        season_total: Temperature sums per (station, season).
+        season_min:   Minimum temperature per (station, season); +inf if none.
+        season_max:   Maximum temperature per (station, season); -inf if none.
+    """
+    stations: np.ndarray
+    count: np.ndarray
+    total: np.ndarray
+    m2: np.ndarray
+    t_min: np.ndarray
+    t_max: np.ndarray
+    season_count: np.ndarray
+    season_total: np.ndarray
+    season_min: np.ndarray
+    season_max: np.ndarray
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation per station (NaN below two observations)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = self.m2 / (self.count - 1)
+        return np.sqrt(np.where(self.count > 1, var, np.nan))
+
+    def season_mean(self) -> Dict[str, float]:
+        """
+        Mean temperature per season over all stations (NaN if a season is empty).
+
+        Values stay np.float64 so `round` keeps NumPy's rounding, as the
+        original pandas `.mean()` results did.
+        """
+        counts = self.season_count.sum(axis=0)
+        totals = self.season_total.sum(axis=0)
+        return {
+            season: totals[i] / counts[i] if counts[i] else np.float64("nan")
+            for i, season in enumerate(SEASON_NAMES)
+        }
+
+
+# Value of each StationStats field (after `stations`) for a station with no
+# observations; merging with it leaves the other side unchanged.
+_EMPTY_FIELDS: Tuple[object, ...] = (0, 0.0, 0.0, np.inf, -np.inf, 0, 0.0, np.inf, -np.inf)
+
+
+def station_stats_from_codes(
+    station_codes: np.ndarray,
+    stations: np.ndarray,
+    season_codes: np.ndarray,
+    temps: np.ndarray,
+) -> StationStats:
+    """
+    Aggregate observations already encoded as integer station/season codes.
+
+    Every statistic is a single vectorised pass (`np.bincount` or an
+    unbuffered `ufunc.at` reduction); the variance uses the two-pass form
+    (sum of squared deviations from the per-station mean).
+
+    Args:
+        station_codes: Index into `stations` per observation (-1 = unknown).
+        stations:      Station names.
+        season_codes:  Index into SEASON_NAMES per observation (-1 = no season).
+        temps:         Temperatures (NaN observations are ignored).
+
+    Returns:
+        The populated StationStats.
+    """
+    temps = np.asarray(temps, dtype=np.float64)
+    keep = (station_codes >= 0) & ~np.isnan(temps)
+    codes, seasons, temps = station_codes[keep], season_codes[keep], temps[keep]
+    n, n_seasons = len(stations), len(SEASON_NAMES)
+
+    count = np.bincount(codes, minlength=n)
+    total = np.bincount(codes, weights=temps, minlength=n)
+    t_min = np.full(n, np.inf)
+    t_max = np.full(n, -np.inf)
+    np.minimum.at(t_min, codes, temps)
+    np.maximum.at(t_max, codes, temps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+    dev = temps - mean[codes]
+    m2 = np.bincount(codes, weights=dev * dev, minlength=n)
+
+    in_season = seasons >= 0
+    cell = codes[in_season] * n_seasons + seasons[in_season]
+    season_count = np.bincount(cell, minlength=n * n_seasons).reshape(n, n_seasons)
+    season_total = np.bincount(
+        cell, weights=temps[in_season], minlength=n * n_seasons
+    ).reshape(n, n_seasons)
+    season_min = np.full(n * n_seasons, np.inf)
+    season_max = np.full(n * n_seasons, -np.inf)
+    np.minimum.at(season_min, cell, temps[in_season])
+    np.maximum.at(season_max, cell, temps[in_season])
+
+    return StationStats(
+        np.asarray(stations, dtype=object), count, total, m2, t_min, t_max,
+        season_count, season_total,
+        season_min.reshape(n, n_seasons), season_max.reshape(n, n_seasons),
+    )
+
+
+def compute_station_stats(df: pd.DataFrame) -> StationStats:
+    """
+    Compute every per-station aggregate the analytics need in one pass.
+
+    float32 temperatures (the pinned CSV schema) are widened with `_widen`,
+    so the statistics equal those of a float64 parse of the same text.
+
+    Args:
+        df: Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+
+    Returns:
+        StationStats over the observations in `df`.
+    """
+    codes, stations = pd.factorize(df["STATION_NAME"], sort=True)
+    months = pd.Categorical(df["Month"], categories=MONTH_COLUMNS).codes
+    temps = df["Temperature"].to_numpy()
+    temps = _widen(temps) if temps.dtype == np.float32 else temps.astype(np.float64)
+    return station_stats_from_codes(
+        codes, stations.to_numpy(dtype=object), MONTH_SEASON[months], temps,
+    )
+
+
+# ------------------------- Wide-Format Model --------------------------
+
+class WideTemperatures(NamedTuple):
+    """
+    Melt-free data model: one matrix row per CSV row (station-year record).
+
+    Attributes:
+        stations:      Station names, sorted (the groupby order).
+        station_index: Index into `stations` for each row.
+        temps:         float32 matrix (rows x 12, MONTH_COLUMNS order); NaN = missing.
+        mask:          Boolean matrix, True where a temperature was observed.
+        file_offsets:  Row where each source file starts, plus the total row count.
+    """
+    stations: np.ndarray
+    station_index: np.ndarray
+    temps: np.ndarray
+    mask: np.ndarray
+    file_offsets: np.ndarray
+
+
+def build_wide_temperatures(tables: List[pd.DataFrame]) -> WideTemperatures:
+    """
+    Stack wide station tables into a WideTemperatures matrix.
+
+    Args:
+        tables: Wide DataFrames with 'STATION_NAME' and the month columns.
+
+    Returns:
+        The dense float32 model; no long-format frame is created.
+    """
+    names = np.concatenate(
+        [t["STATION_NAME"].to_numpy(dtype=object) for t in tables]
+    ) if tables else np.empty(0, dtype=object)
+    codes, stations = pd.factorize(names, sort=True)
+    temps = np.vstack(
+        [t[MONTH_COLUMNS].to_numpy(dtype=np.float32) for t in tables]
+    ) if tables else np.empty((0, len(MONTH_COLUMNS)), dtype=np.float32)
+    offsets = np.concatenate([[0], np.cumsum([len(t) for t in tables], dtype=np.int64)])
+    return WideTemperatures(
+        np.asarray(stations, dtype=object), codes.astype(np.int32), temps,
+        ~np.isnan(temps), offsets,
+    )
+
+
+def load_wide_data(
+    folder: str,
+    cache_dir: Optional[str] = None,
+    workers: int = 1,
+    executor: str = "process",
+) -> WideTemperatures:
+    """
+    Load every CSV in `folder` into the wide model (no melt, no long frame).
+
+    Args:
+        folder:    Path to the directory containing temperature CSV files.
+        cache_dir: Optional parsed-table cache directory (see `load_station_tables`).
+        workers:   Parallel CSV parsers; 0 uses every CPU core.
+        executor:  'process' or 'thread' pool for parsing.
+
+    Returns:
+        WideTemperatures over all files.
+    """
+    return build_wide_temperatures(load_station_tables(folder, cache_dir, workers, executor))
+
+
+def _widen(values: np.ndarray) -> np.ndarray:
+    """
+    Convert float32 temperatures to the float64 that their decimal text parses to.
+
+    A float32 holds any decimal of up to WIDE_SIGNIFICANT_DIGITS significant
+    digits closely enough to round it back exactly, so the wide path
+    aggregates the same float64 values as the long path (the CSVs carry one
+    decimal place). Zeros, NaN and infinities pass through unchanged.
+    """
+    wide = values.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        digits = WIDE_SIGNIFICANT_DIGITS - 1 - np.floor(np.log10(np.abs(wide)))
+        scale = 10.0 ** np.abs(digits)
+        restored = np.where(
+            digits >= 0, np.rint(wide * scale) / scale, np.rint(wide / scale) * scale
+        )
+    return np.where(np.isfinite(restored), restored, wide)
+
+
+def _season_columns() -> List[List[int]]:
+    """Month column indices for each season, in SEASON_NAMES order."""
+    return [[MONTH_COLUMNS.index(m) for m in months] for months in SEASON_MONTHS.values()]
+
+
+def station_stats_from_records(
+    stations: np.ndarray, codes: np.ndarray, values: np.ndarray
+) -> StationStats:
+    """
+    Aggregate station-year records (one row of twelve months each).
+
+    Each season is a NaN-aware reduction over that season's month columns
+    (`np.nansum`, and fmin/fmax, which skip NaN like nanmin/nanmax without
+    warning on all-missing records), folded onto the station axis with
+    `np.bincount` or an unbuffered `ufunc.at`. The seasons partition the
+    year, so station totals and extremes follow from the season partials.
+    The variance uses the same two-pass form as `station_stats_from_codes`.
+
+    Args:
+        stations: Station names.
+        codes:    Index into `stations` for each record.
+        values:   float64 matrix (records x 12, MONTH_COLUMNS order); NaN = missing.
+
+    Returns:
+        StationStats over the records' observations.
+    """
+    n, n_seasons = len(stations), len(SEASON_NAMES)
+    season_count = np.empty((n, n_seasons), dtype=np.int64)
+    season_total = np.empty((n, n_seasons))
+    season_min = np.full((n, n_seasons), np.inf)
+    season_max = np.full((n, n_seasons), -np.inf)
+    for k, cols in enumerate(_season_columns()):
+        block = values[:, cols]
+        season_count[:, k] = np.bincount(codes, weights=(~np.isnan(block)).sum(axis=1), minlength=n)
+        season_total[:, k] = np.bincount(codes, weights=np.nansum(block, axis=1), minlength=n)
+        np.fmin.at(season_min[:, k], codes, np.fmin.reduce(block, axis=1, initial=np.inf))
+        np.fmax.at(season_max[:, k], codes, np.fmax.reduce(block, axis=1, initial=-np.inf))
+
+    count = season_count.sum(axis=1)
+    total = season_total.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+    dev = values - mean[codes][:, None]
+    m2 = np.bincount(codes, weights=np.nansum(dev * dev, axis=1), minlength=n)
+
+    return StationStats(
+        np.asarray(stations, dtype=object), count, total, m2,
+        season_min.min(axis=1), season_max.max(axis=1),
+        season_count, season_total, season_min, season_max,
+    )
+
+
+def station_stats_from_wide(wide: WideTemperatures) -> StationStats:
+    """
+    Aggregate the wide model into StationStats without melting it.
+
+    See `station_stats_from_records`. Sums are added in a different order
+    than on the long frame, so they can differ in the last bits; the rounded
+    outputs are the same.
+
+    Args:
+        wide: Wide-format temperatures.
+
+    Returns:
+        StationStats matching `compute_station_stats` on the melted data.
+    """
+    return station_stats_from_records(wide.stations, wide.station_index, _widen(wide.temps))
+
+
+# ------------------------- Incremental Aggregation --------------------
+
+def empty_station_stats() -> StationStats:
+    """Return StationStats over no observations (the identity for merging)."""
+    n_seasons = len(SEASON_NAMES)
+    return StationStats(
+        np.empty(0, dtype=object), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0),
+        np.zeros(0), np.zeros(0),
+        np.zeros((0, n_seasons), dtype=np.int64), np.zeros((0, n_seasons)),
+        np.zeros((0, n_seasons)), np.zeros((0, n_seasons)),
+    )
+
+
+def reindex_station_stats(stats: StationStats, stations: np.ndarray) -> StationStats:
+    """
+    Spread StationStats onto a sorted superset of its stations.
+
+    Args:
+        stats:    Aggregates to spread.
+        stations: Sorted station names containing every name in `stats`.
+
+    Returns:
+        Aggregates aligned with `stations`; added stations have no observations.
+    """
+    if len(stations) == len(stats.stations):
+        return stats
+    idx = np.searchsorted(stations, stats.stations)
+    fields = []
+    for values, fill in zip(stats[1:], _EMPTY_FIELDS):
+        out = np.full((len(stations),) + values.shape[1:], fill, dtype=values.dtype)
+        out[idx] = values
+        fields.append(out)
+    return StationStats(stations, *fields)
+
+
+def merge_station_stats(a: StationStats, b: StationStats) -> StationStats:
+    """
+    Combine aggregates over two disjoint sets of observations.
+
+    Both sides are spread onto the union of their (sorted) station names
+    with `np.union1d` and `np.searchsorted`, then combined position by
+    position (see `_merge_aligned`). Stations present on one side only are
+    carried over unchanged.
+
+    Args:
+        a: Aggregates of the first set.
+        b: Aggregates of the second set.
+
+    Returns:
+        Aggregates of the union, with stations in sorted order.
+    """
+    stations = np.union1d(a.stations, b.stations)
+    return _merge_aligned(reindex_station_stats(a, stations), reindex_station_stats(b, stations))
+
+
+def _merge_aligned(a: StationStats, b: StationStats) -> StationStats:
+    """
+    Combine two aggregates over the same station array.
+
+    Counts, sums and min/max combine directly; the sums of squared
+    deviations use the parallel form of Welford's update (Chan et al.):
+    M2 = M2_a + M2_b + delta^2 * n_a * n_b / n, where delta is the
+    difference of the two means.
+    """
+    count = a.count + b.count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = b.total / b.count - a.total / a.count
+        correction = delta * delta * a.count * b.count / count
+    both = (a.count > 0) & (b.count > 0)
+    return StationStats(
+        a.stations, count, a.total + b.total,
+        a.m2 + b.m2 + np.where(both, correction, 0.0),
+        np.minimum(a.t_min, b.t_min), np.maximum(a.t_max, b.t_max),
+        a.season_count + b.season_count, a.season_total + b.season_total,
+        np.minimum(a.season_min, b.season_min), np.maximum(a.season_max, b.season_max),
+    )
+
+
+def save_aggregate_state(
+    stats: StationStats, files: Dict[str, Dict[str, int]], path: str
+) -> None:
+    """
+    Persist aggregates plus the source files they cover.
+
+    Args:
+        stats: Aggregates to store.
+        files: Absolute CSV path -> signature (size, mtime_ns) of each folded file.
+        path:  Destination .npz path.
+    """
+    arrays: Dict[str, np.ndarray] = {
+        name: getattr(stats, name) for name in StationStats._fields[1:]
+    }
+    arrays["stations"] = stats.stations.astype(str)
+    arrays["files"] = np.array(json.dumps({"version": STATE_VERSION, "files": files}))
+    _write_atomic(path, lambda fh: np.savez(fh, **arrays))
+
+
+def load_aggregate_state(path: str) -> Tuple[StationStats, Dict[str, Dict[str, int]]]:
+    """
+    Read a state written by `save_aggregate_state`.
+
+    Args:
+        path: Source .npz path.
+
+    Returns:
+        (stats, files); an empty state if the file is missing or from another version.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["files"]))
+            if meta.get("version") != STATE_VERSION:
+                return empty_station_stats(), {}
+            stats = StationStats(
+                data["stations"].astype(object),
+                *(data[name] for name in StationStats._fields[1:]),
+            )
+    except (OSError, ValueError, KeyError):
+        return empty_station_stats(), {}
+    return stats, meta["files"]
+
+
+def update_aggregate_state(
+    folder: str,
+    state_path: str = STATE_FILE,
+    workers: int = 1,
+    executor: str = "process",
+) -> StationStats:
+    """
+    Fold CSVs that are new since the last run into the persistent state.
+
+    Only files absent from the state are parsed and aggregated (through the
+    wide model), then merged with `merge_station_stats`; the cost is
+    proportional to the new data. Min/max cannot be un-merged, so if a
+    previously folded file changed or disappeared the state is rebuilt from
+    every file instead.
+
+    Args:
+        folder:     Directory containing temperature CSV files.
+        state_path: State file (created on first use).
+        workers:    Parallel CSV parsers; 0 uses every CPU core.
+        executor:   'process' or 'thread' pool for parsing.
+
+    Returns:
+        Aggregates over every CSV currently in `folder`.
+    """
+    all_files = {
+        os.path.abspath(f): f for f in station_files(folder)
+    }
+    stats, files = load_aggregate_state(state_path)
+    if any(
+        key not in all_files or _file_signature(all_files[key]) != signature
+        for key, signature in files.items()
+    ):
+        stats, files = empty_station_stats(), {}
+
+    new = [key for key in all_files if key not in files]
+    if new or not os.path.exists(state_path):
+        tables = read_station_files([all_files[key] for key in new], workers, executor)
+        if tables:
+            stats = merge_station_stats(
+                stats, station_stats_from_wide(build_wide_temperatures(tables))
+            )
+        files.update({key: _file_signature(all_files[key]) for key in new})
+        save_aggregate_state(stats, files, state_path)
+    return stats
+
+
+def stream_station_stats(folder: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> StationStats:
+    """
+    Aggregate every CSV in `folder` out of core.
+
+    Each file is read `chunk_rows` rows at a time with the pinned schema.
+    The running aggregates are indexed by integer station code: a chunk's
+    station categories are mapped onto the running (sorted) station array
+    with `np.searchsorted`, which grows through `np.union1d` only when a
+    chunk brings new names. The chunk's per-station, per-season partials
+    (`station_stats_from_records`) are then merged position by position.
+    No combined frame is ever built, so peak memory is one chunk plus the
+    per-station aggregates. The M2 merge is the numerically stable form of
+    the count/sum/sum-of-squares combination.
+
+    Args:
+        folder:     Directory containing temperature CSV files.
+        chunk_rows: CSV rows per chunk.
+
+    Returns:
+        Aggregates over every observation in `folder`.
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0.")
+    stats = empty_station_stats()
+    for path in station_files(folder):
+        with pd.read_csv(
+            path, usecols=list(STATION_SCHEMA), dtype=STATION_SCHEMA, chunksize=chunk_rows
+        ) as reader:
+            for chunk in reader:
+                names = chunk["STATION_NAME"].cat
+                categories = names.categories.to_numpy(dtype=object)
+                lookup = np.searchsorted(stats.stations, categories)
+                known = lookup < len(stats.stations)
+                known[known] = stats.stations[lookup[known]] == categories[known]
+                if not known.all():
+                    stats = reindex_station_stats(stats, np.union1d(stats.stations, categories))
+                    lookup = np.searchsorted(stats.stations, categories)
+                codes = names.codes.to_numpy()
+                rows = codes >= 0
+                values = _widen(chunk[MONTH_COLUMNS].to_numpy(dtype=np.float32)[rows])
+                part = station_stats_from_records(stats.stations, lookup[codes[rows]], values)
+                stats = _merge_aligned(stats, part)
+    return stats
+
+
+# ------------------------- Station x Year Cube -------------------------
+
+class CubeSummary(NamedTuple):
+    """Statistics for one station over a year range (NaN when no observations)."""
+    count: int
+    mean: float
+    t_min: float
+    t_max: float
+    range: float
+    std: float
+
+
+def file_year(path: str) -> int:
+    """
+    Extract the year from a file name such as 'stations_group_1986.csv'.
+
+    Raises:
+        ValueError: If the name has no four-digit year.
+    """
+    match = YEAR_PATTERN.search(os.path.basename(path))
+    if match is None:
+        raise ValueError(f"No year in file name: {path!r}.")
+    return int(match.group(1))
+
+
+def _group_columns() -> List[List[int]]:
+    """Month column indices for each CUBE_GROUPS entry."""
+    return _season_columns() + [list(range(len(MONTH_COLUMNS)))]
+
+
+def build_temperature_cube(
+    folder: str,
+    cube_dir: str = CUBE_FOLDER,
+    cache_dir: Optional[str] = None,
+    workers: int = 1,
+    executor: str = "process",
+) -> "TemperatureCube":
+    """
+    Build (or reuse) the on-disk station x year x month cube for `folder`.
+
+    Files written to `cube_dir`, all plain .npy so they can be memory-mapped:
+      - cube.npy:   float32 (stations, years, 12), NaN where missing; the year
+                    axis is every year from the first to the last file.
+      - prefix.npy: float64 (stations, years + 1, groups, 3) running totals of
+                    count, sum and sum of squares over years, per CUBE_GROUPS.
+      - min.npy / max.npy: float32 (levels, stations, years, groups) sparse
+                    tables; level k holds the min/max over 2**k years.
+      - index.json: station names, first year, and source file signatures.
+    The cube is rebuilt only when the source files change. If a station is
+    listed twice in one file, its last row is kept.
+
+    Args:
+        folder:    Directory containing temperature CSV files.
+        cube_dir:  Output directory.
+        cache_dir: Optional parsed-table cache directory (see `load_station_tables`).
+        workers:   Parallel CSV parsers; 0 uses every CPU core.
+        executor:  'process' or 'thread' pool for parsing.
+
+    Returns:
+        The memory-mapped cube.
+
+    Raises:
+        ValueError: If a file name has no year, or two files share a year.
+    """
+    files = station_files(folder)
+    signatures = {os.path.abspath(f): _file_signature(f) for f in files}
+    index_path = os.path.join(cube_dir, "index.json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == CUBE_VERSION and index.get("files") == signatures:
+            return TemperatureCube(cube_dir)
+    except (OSError, ValueError):
+        pass
+
+    years = [file_year(f) for f in files]
+    seen: Dict[int, str] = {}
+    for path, year in zip(files, years):
+        if year in seen:
+            raise ValueError(
+                f"Files {os.path.basename(seen[year])!r} and {os.path.basename(path)!r} "
+                f"both map to year {year}."
+            )
+        seen[year] = path
+    tables = load_station_tables(folder, cache_dir, workers, executor)
+    wide = build_wide_temperatures(tables)
+    first_year = min(years) if years else 0
+    n_stations, n_years = len(wide.stations), (max(years) - first_year + 1) if years else 0
+    n_groups, n_levels = len(CUBE_GROUPS), max(1, n_years.bit_length())
+    os.makedirs(cube_dir, exist_ok=True)
+
+    def create(name: str, dtype, shape: Tuple[int, ...]) -> np.ndarray:
+        return np.lib.format.open_memmap(
+            os.path.join(cube_dir, name), mode="w+", dtype=dtype, shape=shape
+        )
+
+    cube = create("cube.npy", np.float32, (n_stations, n_years, len(MONTH_COLUMNS)))
+    cube[:] = np.nan
+    row_year = np.repeat(np.array(years, dtype=np.int64) - first_year, [len(t) for t in tables])
+    cube[wide.station_index, row_year] = wide.temps
+
+    prefix = create("prefix.npy", np.float64, (n_stations, n_years + 1, n_groups, 3))
+    t_min = create("min.npy", np.float32, (n_levels, n_stations, n_years, n_groups))
+    t_max = create("max.npy", np.float32, (n_levels, n_stations, n_years, n_groups))
+    prefix[:, 0] = 0.0
+    for g, cols in enumerate(_group_columns()):
+        for y in range(n_years):
+            block = cube[:, y, cols]
+            observed = ~np.isnan(block)
+            values = np.where(observed, _widen(block), 0.0)
+            prefix[:, y + 1, g, 0] = prefix[:, y, g, 0] + observed.sum(axis=1)
+            prefix[:, y + 1, g, 1] = prefix[:, y, g, 1] + values.sum(axis=1)
+            prefix[:, y + 1, g, 2] = prefix[:, y, g, 2] + (values * values).sum(axis=1)
+            t_min[0, :, y, g] = np.where(observed, block, np.inf).min(axis=1)
+            t_max[0, :, y, g] = np.where(observed, block, -np.inf).max(axis=1)
+    for k in range(1, n_levels):
+        span, half = 1 << k, 1 << (k - 1)
+        last = n_years - span + 1
+        t_min[k, :, :last] = np.minimum(t_min[k - 1, :, :last], t_min[k - 1, :, half:half + last])
+        t_max[k, :, :last] = np.maximum(t_max[k - 1, :, :last], t_max[k - 1, :, half:half + last])
+    for array in (cube, prefix, t_min, t_max):
+        array.flush()
+    del cube, prefix, t_min, t_max
+
+    payload = json.dumps({
+        "version": CUBE_VERSION,
+        "stations": [str(name) for name in wide.stations],
+        "first_year": first_year,
+        "groups": CUBE_GROUPS,
+        "files": signatures,
+    })
+    _write_atomic(index_path, lambda fh: fh.write(payload.encode("utf-8")))
+    return TemperatureCube(cube_dir)
+
+
+class TemperatureCube:
+    """
+    Read-only, memory-mapped view of a cube written by `build_temperature_cube`.
+
+    Attributes:
+        stations:   Station names (cube axis 0).
+        years:      Years covered (cube axis 1).
+        temps:      float32 memmap (stations, years, 12).
+    """
+
+    def __init__(self, cube_dir: str = CUBE_FOLDER) -> None:
+        with open(os.path.join(cube_dir, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        self.stations: List[str] = index["stations"]
+        self.temps = np.load(os.path.join(cube_dir, "cube.npy"), mmap_mode="r")
+        first_year = int(index["first_year"])
+        self.years: List[int] = list(range(first_year, first_year + self.temps.shape[1]))
+        self._station_pos = {name: i for i, name in enumerate(self.stations)}
+        self._prefix = np.load(os.path.join(cube_dir, "prefix.npy"), mmap_mode="r")
+        self._min = np.load(os.path.join(cube_dir, "min.npy"), mmap_mode="r")
+        self._max = np.load(os.path.join(cube_dir, "max.npy"), mmap_mode="r")
+
+    def query(
+        self, station: str, first_year: int, last_year: int, season: Optional[str] = None
+    ) -> CubeSummary:
+        """
+        Summarise one station over the inclusive year range, in O(1).
+
+        Count, mean and std come from two prefix-sum lookups; min and max
+        from two overlapping sparse-table lookups.
+
+        Args:
+            station:    Station name.
+            first_year: First year of the range.
+            last_year:  Last year of the range (inclusive).
+            season:     A SEASON_MONTHS key, or None for all months.
+
+        Returns:
+            CubeSummary for the selection.
+
+        Raises:
+            KeyError:   Unknown station or season.
+            ValueError: Empty or out-of-range year span.
+        """
+        if station not in self._station_pos:
+            raise KeyError(f"Unknown station: {station!r}.")
+        s = self._station_pos[station]
+        group = season or "All"
+        if group not in CUBE_GROUPS:
+            raise KeyError(f"Unknown season: {season!r}.")
+        g = CUBE_GROUPS.index(group)
+        lo, hi = first_year - self.years[0], last_year - self.years[0]
+        if not 0 <= lo <= hi < len(self.years):
+            raise ValueError(
+                f"Years must satisfy {self.years[0]} ≤ first_year ≤ last_year ≤ {self.years[-1]}."
+            )
+        count, total, squares = self._prefix[s, hi + 1, g] - self._prefix[s, lo, g]
+        count = int(round(count))
+        if count == 0:
+            nan = float("nan")
+            return CubeSummary(0, nan, nan, nan, nan, nan)
+        k = (hi - lo + 1).bit_length() - 1
+        tail = hi - (1 << k) + 1
+        t_min = float(_widen(np.minimum(self._min[k, s, lo, g], self._min[k, s, tail, g])))
+        t_max = float(_widen(np.maximum(self._max[k, s, lo, g], self._max[k, s, tail, g])))
+        mean = total / count
+        var = (squares - total * mean) / (count - 1) if count > 1 else float("nan")
+        return CubeSummary(
+            count, float(mean), t_min, t_max, t_max - t_min, math.sqrt(max(var, 0.0)),
+        )
+
+
+# ------------------------- Spatial Index ------------------------------
+
+def station_coordinates(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    One (LAT, LON) per station: the last non-null pair across all tables.
+
+    Args:
+        tables: Wide station tables (as from `load_station_tables`).
+
+    Returns:
+        DataFrame indexed by sorted station name with 'LAT' and 'LON' columns.
+    """
+    if not tables:
+        return pd.DataFrame({"LAT": [], "LON": []}, index=pd.Index([], name="STATION_NAME"))
+    coords = pd.concat(
+        [t[["STATION_NAME", "LAT", "LON"]].astype({"STATION_NAME": object}) for t in tables],
+        ignore_index=True,
+    ).dropna()
+    return coords.groupby("STATION_NAME")[["LAT", "LON"]].last()
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from (lat, lon) to each (lats, lons) point."""
+    phi1, phi2 = np.radians(lat), np.radians(lats)
+    dphi, dlmb = phi2 - phi1, np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class StationGrid:
+    """
+    Fixed-size lat/lon grid over station coordinates.
+
+    Stations are bucketed into `cell_degrees` cells once. A query visits only
+    the cells that can intersect the requested region and then filters
+    those candidates exactly (haversine distance, or plain coordinate tests
+    for boxes).
+    """
+
+    def __init__(self, coords: pd.DataFrame, cell_degrees: float = GRID_CELL_DEGREES) -> None:
+        """
+        Args:
+            coords:       Output of `station_coordinates` (index = station name).
+            cell_degrees: Grid cell size in degrees.
+        """
+        self.names = np.asarray(coords.index, dtype=object)
+        self.lat = coords["LAT"].to_numpy(dtype=np.float64)
+        self.lon = (coords["LON"].to_numpy(dtype=np.float64) + 180.0) % 360.0 - 180.0
+        self.cell = cell_degrees
+        self.rows = int(math.ceil(180.0 / cell_degrees))
+        self.cols = int(math.ceil(360.0 / cell_degrees))
+        keys = self._row(self.lat) * self.cols + self._col(self.lon)
+        order = np.argsort(keys, kind="stable")
+        cells, starts = np.unique(keys[order], return_index=True)
+        self._cells: Dict[int, np.ndarray] = dict(zip(cells.tolist(), np.split(order, starts[1:])))
+
+    def _row(self, lat):
+        """Grid row(s) for latitude(s)."""
+        return np.clip(((np.asarray(lat) + 90.0) // self.cell).astype(np.int64), 0, self.rows - 1)
+
+    def _col(self, lon):
+        """Grid column(s) for longitude(s) in [-180, 180]."""
+        return np.clip(((np.asarray(lon) + 180.0) // self.cell).astype(np.int64), 0, self.cols - 1)
+
+    def _col_span(self, lon_lo: float, lon_hi: float) -> set:
+        """Grid columns covering [lon_lo, lon_hi] degrees, wrapping at the antimeridian."""
+        if lon_hi - lon_lo >= 360.0:
+            return set(range(self.cols))
+        lo = (lon_lo + 180.0) % 360.0 - 180.0
+        hi = lo + (lon_hi - lon_lo)
+        if hi <= 180.0:
+            return set(range(int(self._col(lo)), int(self._col(hi)) + 1))
+        return set(range(int(self._col(lo)), self.cols)) | set(range(int(self._col(hi - 360.0)) + 1))
+
+    def _candidates(self, lat_lo: float, lat_hi: float, cols: set) -> np.ndarray:
+        """Station ids in the grid rows spanning [lat_lo, lat_hi] and the given columns."""
+        rows = range(int(self._row(lat_lo)), int(self._row(lat_hi)) + 1)
+        if len(rows) * len(cols) <= len(self._cells):
+            keys = (r * self.cols + c for r in rows for c in sorted(cols))
+            found = [self._cells[key] for key in keys if key in self._cells]
+        else:
+            # Large block: scanning the occupied cells is cheaper
+            found = [
+                ids for key, ids in self._cells.items()
+                if key // self.cols in rows and key % self.cols in cols
+            ]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[str]:
+        """Stations within `radius_km` of (lat, lon), nearest first."""
+        ids, dist = self._within(lat, lon, radius_km)
+        return [str(self.names[i]) for i in ids[np.argsort(dist, kind="stable")]]
+
+    def _within(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and distances of the stations within `radius_km` (unordered)."""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cols = self._col_span(-180.0, 180.0)
+        if abs(lat) + dlat < 90.0:
+            # Widest longitude span of a spherical cap centred at `lat`
+            ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+            if radius_km / EARTH_RADIUS_KM < math.pi / 2 and ratio < 1.0:
+                dlon = math.degrees(math.asin(ratio))
+                cols = self._col_span(lon - dlon, lon + dlon)
+        ids = self._candidates(lat - dlat, lat + dlat, cols)
+        dist = haversine_km(lat, lon, self.lat[ids], self.lon[ids])
+        keep = dist <= radius_km
+        return ids[keep], dist[keep]
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[str]:
+        """
+        The `k` stations closest to (lat, lon), nearest first.
+
+        Searches radius queries of doubling size; once one returns at least
+        k stations, nothing outside it can be closer than its k-th result.
+        """
+        k = min(k, len(self.names))
+        if k <= 0:
+            return []
+        radius = self.cell * 111.0
+        while True:
+            ids, dist = self._within(lat, lon, radius)
+            if len(ids) >= k or radius >= math.pi * EARTH_RADIUS_KM:
+                order = np.argsort(dist, kind="stable")[:k]
+                return [str(self.names[i]) for i in ids[order]]
+            radius *= 2
+
+    def in_bbox(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> List[str]:
+        """
+        Stations inside the box, in name order. If min_lon > max_lon the box
+        crosses the antimeridian.
+        """
+        span = max_lon - min_lon if min_lon <= max_lon else max_lon + 360.0 - min_lon
+        ids = self._candidates(min_lat, max_lat, self._col_span(min_lon, min_lon + span))
+        lat, lon = self.lat[ids], self.lon[ids]
+        inside = (lat >= min_lat) & (lat <= max_lat)
+        if min_lon <= max_lon:
+            inside &= (lon >= min_lon) & (lon <= max_lon)
+        else:
+            inside &= (lon >= min_lon) | (lon <= max_lon)
+        return sorted(str(self.names[i]) for i in ids[inside])
+
+
+def subset_station_stats(stats: StationStats, stations: List[str]) -> StationStats:
+    """
+    Restrict StationStats to the named stations (kept in sorted order).
+
+    Args:
+        stats:    Aggregates over all stations.
+        stations: Names to keep; unknown names are ignored.
+
+    Returns:
+        Aggregates over the selected stations only.
+    """
+    keep = np.isin(stats.stations, np.asarray(stations, dtype=object))
+    return StationStats(*(field[keep] for field in stats))
+
+
+class RegionReport(NamedTuple):
+    """The three analytics evaluated on one spatial selection."""
+    stations: List[str]
+    seasonal_avg: Dict[str, float]
+    largest_range: List[Tuple[str, float, float, float]]
+    most_stable: List[Tuple[str, float]]
+    most_variable: List[Tuple[str, float]]
+
+
+class RegionalAnalysis:
+    """
+    Run the seasonal/range/stability analytics over spatial selections.
+
+    Reports are cached per region, keyed on the query kind and parameters,
+    so repeating a region costs a dictionary lookup.
+    """
+
+    def __init__(self, stats: StationStats, grid: StationGrid) -> None:
+        self.stats = stats
+        self.grid = grid
+        self._reports: Dict[Tuple[object, ...], RegionReport] = {}
+
+    def _report(self, key: Tuple[object, ...], select) -> RegionReport:
+        report = self._reports.get(key)
+        if report is None:
+            stations = select()
+            subset = subset_station_stats(self.stats, stations)
+            stable, variable = find_temperature_stability(None, subset)
+            report = RegionReport(
+                stations,
+                calculate_seasonal_avg(None, subset),
+                find_largest_temp_range(None, subset),
+                stable,
+                variable,
+            )
+            self._reports[key] = report
+        return report
+
+    def radius(self, lat: float, lon: float, radius_km: float) -> RegionReport:
+        """Analytics for stations within `radius_km` of (lat, lon)."""
+        return self._report(
+            ("radius", lat, lon, radius_km), lambda: self.grid.within_radius(lat, lon, radius_km)
+        )
+
+    def nearest(self, lat: float, lon: float, k: int) -> RegionReport:
+        """Analytics for the `k` stations nearest (lat, lon)."""
+        return self._report(("nearest", lat, lon, k), lambda: self.grid.nearest(lat, lon, k))
+
+    def bbox(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> RegionReport:
+        """Analytics for stations inside a lat/lon box."""
+        return self._report(
+            ("bbox", min_lat, max_lat, min_lon, max_lon),
+            lambda: self.grid.in_bbox(min_lat, max_lat, min_lon, max_lon),
+        )
+
+
 # ------------------------- Analytics ----------------------------------
 
-def calculate_seasonal_avg(df: pd.DataFrame) -> Dict[str, float]:
+def calculate_seasonal_avg(
+    df: Optional[pd.DataFrame], stats: Optional[StationStats] = None
+) -> Dict[str, float]:
     """
     Compute mean temperature for each predefined season.
 
     Args:
-        df: Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+        df:    Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+        stats: Precomputed aggregates for `df`; computed from `df` when omitted.
 
     Returns:
         Mapping season -> mean temperature rounded to 1 decimal place.
     """
-    results: Dict[str, float] = {}
-    for season, months in SEASON_MONTHS.items():
-        avg_temp = df[df["Month"].isin(months)]["Temperature"].mean()
-        results[season] = round(avg_temp, 1)
-    return results
+    if stats is None:
+        stats = compute_station_stats(df)
+    return {season: round(avg, 1) for season, avg in stats.season_mean().items()}
 
 
-def find_largest_temp_range(df: pd.DataFrame) -> List[Tuple[str, float, float, float]]:
+def find_largest_temp_range(
+    df: Optional[pd.DataFrame], stats: Optional[StationStats] = None
+) -> List[Tuple[str, float, float, float]]:
     """
     Identify station(s) exhibiting the largest absolute temperature range (max - min).
 
     Args:
-        df: Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+        df:    Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+        stats: Precomputed aggregates for `df`; computed from `df` when omitted.
 
     Returns:
         A list of tuples (station, range, t_max, t_min) for the station(s) with maximal range.
     """
-    ranges: List[Tuple[str, float, float, float]] = []
-    max_range: float = 0.0
-
-    for station, temps in df.groupby("STATION_NAME")["Temperature"]:
-        t_max = float(temps.max())
-        t_min = float(temps.min())
-        r = t_max - t_min
-        if r > max_range:
-            max_range = r
-            ranges = [(station, r, t_max, t_min)]
-        elif r == max_range:
-            ranges.append((station, r, t_max, t_min))
-    return ranges
+    if stats is None:
+        stats = compute_station_stats(df)
+    has_data = stats.count > 0
+    if not has_data.any():
+        return []
+    ranges = stats.t_max - stats.t_min
+    max_range = ranges[has_data].max()
+    return [
+        (str(stats.stations[i]), float(ranges[i]), float(stats.t_max[i]), float(stats.t_min[i]))
+        for i in np.flatnonzero(has_data & (ranges == max_range))
+    ]
 
 
 def find_temperature_stability(
-    df: pd.DataFrame,
+    df: Optional[pd.DataFrame], stats: Optional[StationStats] = None
 ) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
     """
     Determine most stable and most variable stations by standard deviation.
 
     Args:
-        df: Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+        df:    Long-form DataFrame with columns ['STATION_NAME', 'Month', 'Temperature'].
+        stats: Precomputed aggregates for `df`; computed from `df` when omitted.
 
     Returns:
         A 2-tuple:
           - most_stable:  list of (station, std_dev) having the minimum std. deviation
           - most_variable: list of (station, std_dev) having the maximum std. deviation
     """
-    std_list: List[Tuple[str, float]] = [
-        (station, float(temps.std()))
-        for station, temps in df.groupby("STATION_NAME")["Temperature"]
-    ]
-    min_std = min(std_list, key=lambda x: x[1])[1]
-    max_std = max(std_list, key=lambda x: x[1])[1]
-    most_stable = [(s, sd) for s, sd in std_list if sd == min_std]
-    most_variable = [(s, sd) for s, sd in std_list if sd == max_std]
+    if stats is None:
+        stats = compute_station_stats(df)
+    std = stats.std
+    defined = ~np.isnan(std)
+    if not defined.any():
+        return [], []
+    min_std, max_std = std[defined].min(), std[defined].max()
+    most_stable = [(str(stats.stations[i]), float(std[i])) for i in np.flatnonzero(std == min_std)]
+    most_variable = [(str(stats.stations[i]), float(std[i])) for i in np.flatnonzero(std == max_std)]
     return most_stable, most_variable
 
 
@@ -201,24 +1490,231 @@ def save_temperature_stability(
             f.write(f"Most Variable: Station {station}: StdDev {sd:.1f}°C\n")
 
 
+# ------------------------- Instrumentation ----------------------------
+
+def _peak_rss_kb() -> Optional[int]:
+    """Return this process's peak RSS in KiB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def _row_count(value: object) -> Optional[int]:
+    """Rows (or stations / records) produced by a stage, where meaningful."""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, StationStats):
+        return len(value.stations)
+    if isinstance(value, WideTemperatures):
+        return int(value.mask.sum())
+    if isinstance(value, (list, dict)):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(len(v) for v in value if isinstance(v, (list, dict)))
+    return None
+
+
+class StageProfiler:
+    """
+    Optional per-stage timing and memory recorder for `main()`.
+
+    When disabled, `run` simply calls the function. When enabled, each stage
+    records wall and CPU time, its row count, the peak of newly traced
+    allocations (tracemalloc) and the growth of the process peak RSS.
+    Tracing slows allocation-heavy stages, so compare profiled runs with
+    each other rather than with unprofiled wall times.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.stages: List[Dict[str, object]] = []
+        self._started = time.perf_counter()
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def run(self, name: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call `fn(*args, **kwargs)` as stage `name` and return its result."""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        rss_before = _peak_rss_kb()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = fn(*args, **kwargs)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        rss_after = _peak_rss_kb()
+        self.stages.append({
+            "stage": name,
+            "function": getattr(fn, "__name__", repr(fn)),
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "rows": _row_count(result),
+            "peak_alloc_delta_bytes": tracemalloc.get_traced_memory()[1] - traced_before,
+            "peak_rss_delta_kb": (
+                rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            ),
+        })
+        return result
+
+    def report(self, argv: List[str]) -> Dict[str, object]:
+        """Build the JSON-serialisable report for the stages recorded so far."""
+        return {
+            "argv": argv,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "total_wall_seconds": time.perf_counter() - self._started,
+            "peak_rss_kb": _peak_rss_kb(),
+            "stages": self.stages,
+        }
+
+    def write(self, path: str, argv: List[str]) -> None:
+        """Write the report to `path` (no-op when disabled)."""
+        if self.enabled:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(argv), f, indent=2)
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+def _profile_target(flag: Optional[str]) -> Optional[str]:
+    """
+    Resolve where to write the profile report, if profiling is on.
+
+    The --profile flag wins; otherwise Q2_PROFILE enables it ('1', 'true',
+    'yes' use the default report name, any other non-empty value is a path).
+    """
+    if flag:
+        return flag
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "no"):
+        return None
+    return PROFILE_REPORT if value.lower() in ("1", "true", "yes") else value
+
+
 # ------------------------- Orchestration ------------------------------
 
-def main() -> None:
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command-line interface.
+
+    Returns:
+        An argparse parser; with no options the default long-format run is used.
+    """
+    parser = argparse.ArgumentParser(description="HIT137 Q2 seasonal temperature analysis.")
+    parser.add_argument("--data", default=DATA_FOLDER,
+                        help="folder of station CSVs (default: %(default)s)")
+    parser.add_argument("--cache", default=CACHE_FOLDER,
+                        help="parsed-table cache folder (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse the CSVs")
+    parser.add_argument("--wide", action="store_true",
+                        help="use the float32 wide-matrix model instead of melting")
+    parser.add_argument("--chunked", action="store_true",
+                        help="stream CSVs in row chunks (bounded memory, no cache)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="rows per chunk for --chunked (default: %(default)s)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="fold only new CSVs into the saved aggregate state")
+    parser.add_argument("--state", default=STATE_FILE,
+                        help="aggregate state file for --incremental (default: %(default)s)")
+    parser.add_argument("--query", nargs=3, metavar=("STATION", "FIRST_YEAR", "LAST_YEAR"),
+                        help="print cube statistics for one station and year range")
+    parser.add_argument("--season", choices=list(SEASON_MONTHS),
+                        help="restrict --query to one season")
+    parser.add_argument("--cube", default=CUBE_FOLDER,
+                        help="cube folder for --query (default: %(default)s)")
+    parser.add_argument("--near", nargs=3, type=float, metavar=("LAT", "LON", "KM"),
+                        help="print analytics for stations within KM of a point")
+    parser.add_argument("--nearest", nargs=3, type=float, metavar=("LAT", "LON", "K"),
+                        help="print analytics for the K stations nearest a point")
+    parser.add_argument("--bbox", nargs=4, type=float,
+                        metavar=("MIN_LAT", "MAX_LAT", "MIN_LON", "MAX_LON"),
+                        help="print analytics for stations inside a box")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_REPORT, metavar="REPORT",
+                        help="record per-stage timing/memory to REPORT "
+                             f"(default: {PROFILE_REPORT}; also enabled by {PROFILE_ENV}=1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parallel CSV parsers; 0 = one per CPU core (default: %(default)s)")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process",
+                        help="pool used by --workers (default: %(default)s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     End-to-end execution:
-      1) load & reshape data,
-      2) compute seasonal averages, largest ranges, and stability,
+      1) load & reshape data (re-parsing only CSVs that changed since the last run),
+      2) aggregate per-station statistics once, then derive seasonal averages,
+         largest ranges, and stability from them,
       3) persist results to plain-text files,
       4) provide a simple console acknowledgement.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:]); see `_build_parser`.
     """
-    df = load_data(DATA_FOLDER)
-    seasonal_avg = calculate_seasonal_avg(df)
-    largest_range = find_largest_temp_range(df)
-    most_stable, most_variable = find_temperature_stability(df)
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    cache_dir = None if args.no_cache else args.cache
+
+    if args.query:
+        station, first_year, last_year = args.query
+        try:
+            years = int(first_year), int(last_year)
+        except ValueError:
+            parser.error("--query FIRST_YEAR and LAST_YEAR must be integers")
+        try:
+            cube = build_temperature_cube(args.data, args.cube, cache_dir, args.workers, args.executor)
+            summary = cube.query(station, *years, args.season)
+        except KeyError as exc:
+            parser.error(f"--query: {exc.args[0]}")
+        except ValueError as exc:
+            parser.error(f"--query: {exc}")
+        print(json.dumps(summary._asdict(), indent=2))
+        return
+
+    if args.near or args.nearest or args.bbox:
+        tables = load_station_tables(args.data, cache_dir, args.workers, args.executor)
+        regional = RegionalAnalysis(
+            station_stats_from_wide(build_wide_temperatures(tables)),
+            StationGrid(station_coordinates(tables)),
+        )
+        if args.near:
+            report = regional.radius(*args.near)
+        elif args.nearest:
+            lat, lon, k = args.nearest
+            report = regional.nearest(lat, lon, int(k))
+        else:
+            report = regional.bbox(*args.bbox)
+        print(json.dumps(report._asdict(), indent=2, default=float))
+        return
+
+    profile_path = _profile_target(args.profile)
+    profiler = StageProfiler(enabled=profile_path is not None)
+    run = profiler.run
+
+    df: Optional[pd.DataFrame] = None
+    if args.chunked:
+        stats = run("load+stats", stream_station_stats, args.data, args.chunk_rows)
+    elif args.incremental:
+        stats = run(
+            "load+stats", update_aggregate_state, args.data, args.state, args.workers, args.executor
+        )
+    elif args.wide:
+        wide = run("load", load_wide_data, args.data, cache_dir, args.workers, args.executor)
+        stats = run("stats", station_stats_from_wide, wide)
+    else:
+        df = run("load", load_data, args.data, cache_dir, args.workers, args.executor)
+        stats = run("stats", compute_station_stats, df)
+    seasonal_avg = run("seasonal", calculate_seasonal_avg, df, stats)
+    largest_range = run("range", find_largest_temp_range, df, stats)
+    most_stable, most_variable = run("stability", find_temperature_stability, df, stats)
 
-    save_seasonal_avg(seasonal_avg)
-    save_largest_temp_range(largest_range)
-    save_temperature_stability(most_stable, most_variable)
+    run("save_seasonal", save_seasonal_avg, seasonal_avg)
+    run("save_range", save_largest_temp_range, largest_range)
+    run("save_stability", save_temperature_stability, most_stable, most_variable)
+    profiler.write(profile_path or PROFILE_REPORT, sys.argv[1:] if argv is None else list(argv))
     print("Analysis complete. Results saved to text files.")
 
 
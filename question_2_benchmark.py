@@ -0,0 +1,404 @@
+# question_2_benchmark
+# ---------------------------------------------------------------------
+# Synthetic-Scale Benchmark for the Question 2 Temperature Analysis
+# ---------------------------------------------------------------------
+# The bundled 'temperatures/' folder (20 files x 112 stations) is too small
+# to say anything about scaling, so this harness:
+#   1) generates synthetic station CSVs in the same schema
+#      (STATION_NAME, STN_ID, LAT, LON, January ... December) for any
+#      number of stations and years, deterministically from a seed, and
+#   2) runs the question_2 pipelines stage by stage (ingest, melt/wide,
+#      stats, seasonal, range, stability, persist) at several scales,
+#      recording per stage:
+#        - wall and CPU time,
+#        - peak traced allocations (tracemalloc, in a separate pass),
+#        - peak RSS of a fresh child process per scale point.
+# The JSON report lists every measurement plus per-stage scaling curves
+# (seconds vs. observations) with a fitted log-log exponent.
+#
+# Usage:
+#   python question_2_benchmark.py generate OUT_DIR --stations 50000 --years 100
+#   python question_2_benchmark.py run [--scales 1000x10,10000x20]
+#       [--pipelines long,wide,chunked] [--output results.json]
+#
+# Dependencies: pandas, numpy (peak RSS comes from question_2's helper and
+#               is reported as null where 'resource' is unavailable).
+# ---------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import question_2 as q2
+
+# ------------------------- Global Constants ----------------------------------
+
+DEFAULT_SCALES: str = "500x10,2000x20,8000x40"
+DEFAULT_PIPELINES: str = "long,wide,chunked"
+DEFAULT_SEED: int = 137
+FIRST_YEAR: int = 1900
+MISSING_RATE: float = 0.01
+
+# Australian-ish bounding box for synthetic station coordinates
+LAT_RANGE: Tuple[float, float] = (-43.5, -10.5)
+LON_RANGE: Tuple[float, float] = (113.0, 154.0)
+
+
+# ----------------------------- Generator -------------------------------------
+
+def parse_scale(text: str) -> Tuple[int, int]:
+    """
+    Parse 'STATIONSxYEARS' (e.g. '50000x100') into a pair of ints.
+
+    Args:
+        text: Scale specification.
+
+    Returns:
+        (stations, years).
+    """
+    stations, sep, years = text.strip().lower().partition("x")
+    if not sep or not stations.isdigit() or not years.isdigit():
+        raise ValueError(f"Invalid scale: {text!r} (expected STATIONSxYEARS).")
+    return int(stations), int(years)
+
+
+def generate_dataset(
+    folder: Path, stations: int, years: int, seed: int = DEFAULT_SEED
+) -> List[Path]:
+    """
+    Write one 'stations_group_YYYY.csv' per year for a synthetic network.
+
+    Each station gets fixed coordinates, a mean temperature that falls with
+    latitude and a seasonal amplitude; monthly values add year-level and
+    monthly noise and are rounded to two decimals like the real files. About
+    MISSING_RATE of the monthly values are left empty. The same arguments
+    always produce byte-identical files.
+
+    Args:
+        folder:   Output directory (created if needed).
+        stations: Stations per file.
+        years:    Number of yearly files.
+        seed:     Random seed.
+
+    Returns:
+        Paths of the written files, in year order.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    width = len(str(stations - 1))
+    names = np.array([f"STATION-{i:0{width}d}" for i in range(stations)], dtype=object)
+    stn_id = np.arange(10_000, 10_000 + stations)
+    lat = np.round(rng.uniform(*LAT_RANGE, stations), 2)
+    lon = np.round(rng.uniform(*LON_RANGE, stations), 2)
+    base = 38.0 + 0.45 * lat + rng.normal(0.0, 1.5, stations)      # warmer towards the equator
+    amplitude = np.clip(0.25 * -lat + rng.normal(0.0, 1.0, stations), 0.5, None)
+    phase = np.cos(2 * np.pi * np.arange(12) / 12.0)                 # January = austral summer peak
+
+    paths: List[Path] = []
+    for offset in range(years):
+        year_rng = np.random.default_rng([seed, offset])
+        temps = (
+            base[:, None]
+            + amplitude[:, None] * phase[None, :]
+            + year_rng.normal(0.0, 0.6, (stations, 1))
+            + year_rng.normal(0.0, 0.8, (stations, 12))
+        )
+        temps[year_rng.random((stations, 12)) < MISSING_RATE] = np.nan
+        table = pd.DataFrame({"STATION_NAME": names, "STN_ID": stn_id, "LAT": lat, "LON": lon})
+        table = pd.concat([table, pd.DataFrame(np.round(temps, 2), columns=q2.MONTH_COLUMNS)], axis=1)
+        path = folder / f"stations_group_{FIRST_YEAR + offset}.csv"
+        table.to_csv(path, index=False, float_format="%.2f")
+        paths.append(path)
+    return paths
+
+
+def _dataset(root: Path, stations: int, years: int, seed: int) -> Path:
+    """Return a generated dataset folder under `root`, reusing an earlier one."""
+    folder = root / f"s{stations}_y{years}_seed{seed}"
+    marker = folder / ".complete"
+    if not marker.exists():
+        generate_dataset(folder, stations, years, seed)
+        marker.write_text("ok", encoding="utf-8")
+    return folder
+
+
+# ----------------------------- Measurement -----------------------------------
+
+@contextlib.contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    """Temporarily chdir (the save_* functions write to the current directory)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _rows(value: object) -> Optional[int]:
+    """Best-effort row/observation count of a stage result."""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, list) and value and isinstance(value[0], pd.DataFrame):
+        return sum(len(t) for t in value)
+    if isinstance(value, q2.WideTemperatures):
+        return int(value.mask.sum())
+    if isinstance(value, q2.StationStats):
+        return len(value.stations)
+    return None
+
+
+Stage = Tuple[str, Callable[[Dict[str, object]], object]]
+
+
+def _pipeline(name: str, folder: Path, out_dir: Path) -> List[Stage]:
+    """
+    Stages of one pipeline; each takes the shared context and returns its result.
+
+    Args:
+        name:    'long', 'wide' or 'chunked'.
+        folder:  Dataset folder.
+        out_dir: Directory the persist stage writes into.
+    """
+    data = str(folder)
+
+    def persist(ctx: Dict[str, object]) -> None:
+        with _working_directory(out_dir):
+            q2.save_seasonal_avg(ctx["seasonal"])
+            q2.save_largest_temp_range(ctx["range"])
+            q2.save_temperature_stability(*ctx["stability"])
+
+    analytics: List[Stage] = [
+        ("seasonal", lambda ctx: q2.calculate_seasonal_avg(ctx.get("melt"), ctx["stats"])),
+        ("range", lambda ctx: q2.find_largest_temp_range(ctx.get("melt"), ctx["stats"])),
+        ("stability", lambda ctx: q2.find_temperature_stability(ctx.get("melt"), ctx["stats"])),
+        ("persist", persist),
+    ]
+    if name == "long":
+        return [
+            ("ingest", lambda ctx: q2.load_station_tables(data)),
+            ("melt", lambda ctx: q2.combine_long(ctx.pop("ingest"))),
+            ("stats", lambda ctx: q2.compute_station_stats(ctx["melt"])),
+        ] + analytics
+    if name == "wide":
+        return [
+            ("ingest", lambda ctx: q2.load_station_tables(data)),
+            ("wide", lambda ctx: q2.build_wide_temperatures(ctx.pop("ingest"))),
+            ("stats", lambda ctx: q2.station_stats_from_wide(ctx["wide"])),
+        ] + analytics
+    if name == "chunked":
+        return [("stats", lambda ctx: q2.stream_station_stats(data))] + analytics
+    raise ValueError(f"Unknown pipeline: {name!r}.")
+
+
+def _run_stages(stages: List[Stage], memory: bool) -> Dict[str, Dict[str, object]]:
+    """
+    Run stages in order, timing each (or tracing allocations if `memory`).
+
+    Returns:
+        Stage name -> measurement record.
+    """
+    ctx: Dict[str, object] = {}
+    records: Dict[str, Dict[str, object]] = {}
+    for name, fn in stages:
+        if memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            ctx[name] = result = fn(ctx)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            records[name] = {"peak_alloc_bytes": peak - before, "retained_bytes": current - before}
+        else:
+            wall, cpu = time.perf_counter(), time.process_time()
+            ctx[name] = result = fn(ctx)
+            records[name] = {
+                "seconds": time.perf_counter() - wall,
+                "cpu_seconds": time.process_time() - cpu,
+                "rows": _rows(result),
+                "peak_rss_kb": q2._peak_rss_kb(),
+            }
+    return records
+
+
+def run_point(
+    pipeline: str, stations: int, years: int, seed: int, root: str, memory: bool
+) -> Dict[str, object]:
+    """
+    Measure one pipeline at one scale in the current process.
+
+    Intended to run in a fresh child process so that peak RSS reflects this
+    point alone. Timings come from an untraced pass; allocations from a
+    second, tracemalloc-traced pass.
+
+    Returns:
+        A JSON-serialisable result record.
+    """
+    folder = _dataset(Path(root), stations, years, seed)
+    baseline = q2._peak_rss_kb()
+    with tempfile.TemporaryDirectory() as out:
+        stages = _run_stages(_pipeline(pipeline, folder, Path(out)), memory=False)
+        if memory:
+            traced = _run_stages(_pipeline(pipeline, folder, Path(out)), memory=True)
+            for name, extra in traced.items():
+                stages[name].update(extra)
+    return {
+        "pipeline": pipeline,
+        "stations": stations,
+        "years": years,
+        "observations": stations * years * 12,
+        "baseline_rss_kb": baseline,
+        "total_seconds": sum(s["seconds"] for s in stages.values()),
+        "stages": stages,
+    }
+
+
+# ----------------------------- Reporting -------------------------------------
+
+def _environment() -> Dict[str, Optional[str]]:
+    """Describe the interpreter, library versions, platform and git commit."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": str(os.cpu_count()),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def scaling_curves(results: List[Dict]) -> Dict[str, Dict[str, Dict[str, object]]]:
+    """
+    Group stage timings into curves of seconds vs. observations.
+
+    The exponent is the least-squares slope of log(seconds) against
+    log(observations): ~1 is linear scaling, ~2 quadratic. It is omitted
+    when there are fewer than two points.
+
+    Returns:
+        pipeline -> stage -> {"points": [[observations, seconds], ...], "exponent": float|None}.
+    """
+    curves: Dict[str, Dict[str, Dict[str, object]]] = {}
+    for r in sorted(results, key=lambda r: r["observations"]):
+        for stage, m in r["stages"].items():
+            curve = curves.setdefault(r["pipeline"], {}).setdefault(stage, {"points": []})
+            curve["points"].append([r["observations"], m["seconds"]])
+    for stages in curves.values():
+        for curve in stages.values():
+            pts = [(math.log(n), math.log(t)) for n, t in curve["points"] if n > 0 and t > 0]
+            xs = {x for x, _ in pts}
+            curve["exponent"] = float(np.polyfit(*zip(*pts), 1)[0]) if len(xs) >= 2 else None
+    return curves
+
+
+# ----------------------------- Main Program ----------------------------------
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the 'generate' / 'run' command-line interface."""
+    parser = argparse.ArgumentParser(description="Question 2 synthetic-scale benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_gen = sub.add_parser("generate", help="write synthetic station CSVs")
+    p_gen.add_argument("output", type=Path, help="output folder")
+    p_gen.add_argument("--stations", type=int, required=True)
+    p_gen.add_argument("--years", type=int, required=True)
+    p_gen.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    p_run = sub.add_parser("run", help="benchmark the pipelines across scales")
+    p_run.add_argument("--scales", default=DEFAULT_SCALES,
+                       help="comma-separated STATIONSxYEARS points (default: %(default)s)")
+    p_run.add_argument("--pipelines", default=DEFAULT_PIPELINES,
+                       help="subset of long,wide,chunked (default: %(default)s)")
+    p_run.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    p_run.add_argument("--workdir", type=Path,
+                       help="keep generated datasets here (default: a temporary folder)")
+    p_run.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    p_run.add_argument("--in-process", action="store_true",
+                       help="run points in this process (faster; peak RSS is then cumulative)")
+    p_run.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    'generate' writes a dataset; 'run' measures every (pipeline, scale) point
+    in its own child process, prints a summary table to stderr and the JSON
+    report to stdout (or --output).
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        paths = generate_dataset(args.output, args.stations, args.years, args.seed)
+        print(f"Wrote {len(paths)} files to {args.output}", file=sys.stderr)
+        return
+
+    try:
+        scales = [parse_scale(s) for s in args.scales.split(",")]
+    except ValueError as exc:
+        parser.error(str(exc))
+    pipelines = args.pipelines.split(",")
+    for name in pipelines:
+        if name not in ("long", "wide", "chunked"):
+            parser.error(f"unknown pipeline {name!r}")
+
+    with contextlib.ExitStack() as stack:
+        root = args.workdir or Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        results: List[Dict] = []
+        ctx = multiprocessing.get_context("spawn")
+        print(f"{'pipeline':<8} {'scale':>12} {'observations':>13} {'seconds':>9} {'peak RSS KiB':>13}",
+              file=sys.stderr)
+        for stations, years in scales:
+            _dataset(Path(root), stations, years, args.seed)  # generate once, outside timing
+            for pipeline in pipelines:
+                point = (pipeline, stations, years, args.seed, str(root), not args.no_memory)
+                if args.in_process:
+                    record = run_point(*point)
+                else:
+                    with ctx.Pool(1) as pool:  # fresh process: isolated peak RSS
+                        record = pool.apply(run_point, point)
+                results.append(record)
+                peak = max((s["peak_rss_kb"] or 0) for s in record["stages"].values())
+                print(f"{pipeline:<8} {f'{stations}x{years}':>12} {record['observations']:>13,} "
+                      f"{record['total_seconds']:>9.3f} {peak:>13,}", file=sys.stderr)
+
+    report = {
+        "environment": _environment(),
+        "seed": args.seed,
+        "results": results,
+        "curves": scaling_curves(results),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -23,24 +23,68 @@
 #   - Depth 1: ——\⁄—— (one indentation).
 #   - Depth 2+: each new segment gets its own indentation, growing in detail.
 #
+# Geometry Engine:
+#   - `fractal_points` builds the whole outline as a NumPy complex vertex
+#     array, subdividing every segment of a level at once (no recursion, no
+#     turtle), so depth 9–10 geometry takes well under a second.
+#   - One unit-edge template per depth is cached (LRU, memory-bounded) and
+#     placed on each side with a single affine map, so re-renders at other
+#     `sides`/`side_length` skip the subdivision entirely.
+#   - Turtle drawing consumes those vertices with `goto`.
+#   - Centering uses `polygon_bbox`, a closed-form bounding box of the base
+#     polygon; indentations point inward, so it bounds every depth exactly.
+#
 # Reproducibility & Transparency:
 #   - Pure, single-responsibility functions for edge drawing and polygon assembly.
 #   - No in-place mutation of inputs beyond turtle drawing state.
 #   - Console prompts for parameters; deterministic rendering given inputs.
 #
-# Dependencies: turtle (Screen, Turtle), math (cos/sin/radians), typing (Tuple)
+# Headless Export:
+#   - `--svg PATH` writes the outline as a single SVG <path>; `--png PATH`
+#     rasterises it with a NumPy line sampler and writes the PNG with
+#     zlib/struct. Neither path imports turtle/Tk, so it runs on servers
+#     without a display.
+#   - Example: python question_3.py --sides 3 --length 300 --depth 8 --png out.png --size 8192
+#
+# Level of Detail & Culling:
+#   - `--lod PX` stops subdividing once segments would be shorter than PX
+#     pixels (default 0.5, a sub-pixel change; 0 = full depth); `--zoom`/`--center` choose a viewport and subtrees whose
+#     indentation triangle lies outside it are never expanded.
+#
+# Streaming:
+#   - `stream_segments` yields the outline in batches from an explicit stack
+#     (O(depth) state, no recursion); the SVG writer, rasteriser and turtle
+#     consume it incrementally, so `--stream` handles depth 12+ in bounded memory.
+#
+# Dependencies: turtle (Screen, Turtle; lazy), math, typing, collections
+#               (OrderedDict), argparse, struct, zlib, time, numpy
 # ---------------------------------------------------------------------
 
 
 # ------------------------- Imports & Typing ---------------------------
-from turtle import Screen, Turtle
-from math import cos, sin, radians
-from typing import Tuple
+import argparse
+import os
+import struct
+import time
+import zlib
+from math import ceil, cos, sin, radians
+from collections import OrderedDict
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:  # turtle (and Tk) is imported lazily, only for on-screen drawing
+    from turtle import Turtle
 
 
 # ------------------------- Analytics: Edge Rule -----------------------
-# Draw one edge of the polygon recursively using the Koch-like triangle rule
-def draw_edge(t: Turtle, length: float, depth: int) -> None:
+# Draw one edge of the polygon recursively using the Koch-like triangle rule.
+# Kept as the reference implementation: it is the executable specification
+# of the edge rule, and the vectorised engine below (`fractal_points`,
+# `stream_segments`) is tested against the path it walks
+# (tests/test_question_3.py).
+def draw_edge(t: "Turtle", length: float, depth: int) -> None:
     if depth == 0:
         # Base case: at depth 0, draw a straight line
         t.forward(length)
@@ -64,61 +108,561 @@ def draw_edge(t: Turtle, length: float, depth: int) -> None:
             t.right(val)
 
 
-# ------------------------- Orchestration: Polygon ---------------------
-# Draw the full polygon by connecting multiple recursive edges
-def draw_polygon_fractal(t: Turtle, sides: int, side_length: float, depth: int) -> None:
+# ------------------------- Geometry: Vertex Engine -------------------
+# Unit rotation by +60° (the "L 60" turn that starts each indentation)
+INDENT_ROTATION: complex = complex(cos(radians(60)), sin(radians(60)))
+
+
+# Apply the edge rule to every segment of a polyline at once.
+# Segment a→b becomes a, a+v, a+v+v·e^{i60°}, a+2v (→ b) with v = (b-a)/3,
+# i.e. the same F L60 F R120 F L60 F walk that draw_edge performs.
+def subdivide(points: np.ndarray) -> np.ndarray:
+    a, b = points[:-1], points[1:]
+    v = (b - a) / 3.0
+    out = np.empty(4 * len(a) + 1, dtype=np.complex128)
+    out[0:-1:4] = a
+    out[1:-1:4] = a + v
+    out[2:-1:4] = a + v + v * INDENT_ROTATION
+    out[3:-1:4] = b - v
+    out[-1] = points[-1]
+    return out
+
+
+# Side vectors of the base polygon: side k has length `side_length` and points
+# along `heading` + k·(360/sides) degrees (counter-clockwise walk)
+def polygon_sides(sides: int, side_length: float, heading: float = 0.0) -> np.ndarray:
     if sides < 3:
-        raise ValueError("Number of sides must be ≥ 3.")  # Ensure polygon validity
-    exterior_angle = 360.0 / sides  # Calculate exterior angle of polygon
-    for _ in range(sides):
-        draw_edge(t, side_length, depth)  # Draw one recursive edge
-        t.left(exterior_angle)            # Turn to next edge
-
-
-# ------------------------- Layout: Centering Sim ----------------------
-# Simulate the turtle's path to estimate bounding box for centering
-def simulate_path_bbox(sides: int, side_length: float, depth: int) -> Tuple[float, float, float, float]:
-    x = y = heading = 0.0
-    min_x = max_x = x
-    min_y = max_y = y
-
-    # Move forward in simulation without drawing
-    def forward_sim(len_):
-        nonlocal x, y, min_x, max_x, min_y, max_y
-        rad = radians(heading)
-        x += len_ * cos(rad)
-        y += len_ * sin(rad)
-        # Update bounding box coordinates
-        min_x, max_x = min(min_x, x), max(max_x, x)
-        min_y, max_y = min(min_y, y), max(max_y, y)
-
-    # Simulate turning left or right
-    def turn_sim(kind: str, angle: float):
-        nonlocal heading
-        heading += angle if kind == "left" else -angle
-
-    # Simulate recursive edge drawing
-    def draw_edge_sim(length: float, d: int):
-        if d == 0:
-            forward_sim(length)
+        raise ValueError("Number of sides must be ≥ 3.")
+    turns = np.radians(heading) + 2.0 * np.pi * np.arange(sides) / sides
+    return side_length * np.exp(1j * turns)
+
+
+# Corners of the base polygon as a closed complex polyline (sides + 1 points),
+# walked counter-clockwise from `start` with the first side along `heading` degrees
+def polygon_corners(sides: int, side_length: float, start: complex = 0j,
+                    heading: float = 0.0) -> np.ndarray:
+    corners = np.empty(sides + 1, dtype=np.complex128)
+    corners[0] = start
+    corners[1:] = start + np.cumsum(polygon_sides(sides, side_length, heading))
+    corners[-1] = start  # close exactly instead of accumulating rounding error
+    return corners
+
+
+# ------------------------- Geometry: Edge Templates ------------------
+# LRU cache of unit-edge templates: the depth-d outline of the edge 0 → 1 as
+# 4^d + 1 complex points. Depth d is built from the deepest cached depth below
+# it, every intermediate level is kept, and least-recently-used templates are
+# evicted once the stored arrays exceed `max_bytes`.
+class EdgeTemplateCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._templates: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    # Read-only template for `depth`, building and caching missing levels
+    def get(self, depth: int) -> np.ndarray:
+        if depth < 0:
+            raise ValueError("Recursion depth must be ≥ 0.")
+        template = self._templates.get(depth)
+        if template is not None:
+            self.hits += 1
+            self._templates.move_to_end(depth)
+            return template
+
+        self.misses += 1
+        base = max((d for d in self._templates if d < depth), default=None)
+        if base is None:
+            base, template = 0, np.array([0j, 1 + 0j])
+            template.setflags(write=False)
+            self._store(0, template)
+        else:
+            template = self._templates[base]
+        for d in range(base + 1, depth + 1):
+            template = subdivide(template)
+            template.setflags(write=False)
+            self._store(d, template)
+        return template
+
+    # Insert one level and evict the least recently used ones past the budget;
+    # a template larger than the whole budget is returned but never kept
+    def _store(self, depth: int, template: np.ndarray) -> None:
+        if template.nbytes > self.max_bytes:
             return
-        L = length / 3.0
-        seq = [("F", L), ("L", 60), ("F", L), ("R", 120), ("F", L), ("L", 60), ("F", L)]
-        for op, val in seq:
-            if op == "F":
-                draw_edge_sim(val, d - 1)
-            elif op == "L":
-                turn_sim("left", val)
-            elif op == "R":
-                turn_sim("right", val)
+        self._templates[depth] = template
+        self._templates.move_to_end(depth)
+        self.nbytes += template.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._templates.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    # Drop every cached template
+    def clear(self) -> None:
+        self._templates.clear()
+        self.nbytes = 0
+
+    # Cached depths (least → most recently used), memory use and hit counts
+    def info(self) -> Dict[str, object]:
+        return {"depths": list(self._templates), "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide template cache shared by every polygon / re-render
+EDGE_TEMPLATES = EdgeTemplateCache()
+
+
+# Place a unit-edge template on every side with one affine map per side
+# (z ↦ corner + side·z, i.e. rotate, scale and translate) and join the sides
+# into a closed outline
+def place_template(template: np.ndarray, corners: np.ndarray) -> np.ndarray:
+    starts, vectors = corners[:-1], corners[1:] - corners[:-1]
+    body = starts[:, None] + vectors[:, None] * template[None, :-1]
+    return np.append(body.ravel(), corners[-1])
+
+
+# Full fractal outline as complex vertices (x + iy) from the cached unit template:
+# depth d gives sides·4^d segments and sides·4^d + 1 points (first == last)
+def fractal_points(sides: int, side_length: float, depth: int, start: complex = 0j,
+                   heading: float = 0.0) -> np.ndarray:
+    corners = polygon_corners(sides, side_length, start, heading)
+    return place_template(EDGE_TEMPLATES.get(depth), corners)
+
+
+# Same outline as an (N, 2) float array of (x, y) vertices
+def fractal_vertices(sides: int, side_length: float, depth: int,
+                     start: Tuple[float, float] = (0.0, 0.0), heading: float = 0.0) -> np.ndarray:
+    points = fractal_points(sides, side_length, depth, complex(*start), heading)
+    return np.column_stack((points.real, points.imag))
+
+
+# ------------------------- Layout: Bounding Box -----------------------
+BBox = Tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+
+
+# Bounding box of a vertex array in one vectorised pass
+def points_bbox(points: np.ndarray) -> BBox:
+    return (float(points.real.min()), float(points.imag.min()),
+            float(points.real.max()), float(points.imag.max()))
+
+
+# Single geometry pass: the outline vertices together with their bounding box
+def fractal_geometry(sides: int, side_length: float, depth: int, start: complex = 0j,
+                     heading: float = 0.0) -> Tuple[np.ndarray, BBox]:
+    points = fractal_points(sides, side_length, depth, start, heading)
+    return points, points_bbox(points)
+
+
+# Largest cos(phase + 2πk/sides) over all k, in closed form: the nearest
+# multiple of the corner step to angle 0 decides the maximum
+def _max_cos(phase: float, sides: int) -> float:
+    step = 2.0 * np.pi / sides
+    m = phase % step
+    return cos(min(m, step - m))
+
+
+# Closed-form bounding box for the polygon walked from the origin with heading 0.
+# Every indentation points inward and the corners survive at every depth, so
+# this is also the exact bbox of the fractal at any depth — no traversal needed.
+def polygon_bbox(sides: int, side_length: float) -> BBox:
+    if sides < 3:
+        raise ValueError("Number of sides must be ≥ 3.")
+    half = np.pi / sides
+    radius = side_length / (2.0 * sin(half))           # circumradius
+    cx, cy = side_length / 2.0, side_length / (2.0 * np.tan(half))  # centre
+    phase = -np.pi / 2.0 - half                          # angle of corner 0 from the centre
+    return (cx - radius * _max_cos(phase + np.pi, sides),
+            cy - radius * _max_cos(phase + np.pi / 2.0, sides),
+            cx + radius * _max_cos(phase, sides),
+            cy + radius * _max_cos(phase - np.pi / 2.0, sides))
+
+
+# ------------------------- Orchestration: Polygon ---------------------
+# Trace a precomputed vertex array with the turtle (pen state is left as is)
+def draw_points(t: "Turtle", points: np.ndarray) -> None:
+    for p in points[1:]:
+        t.goto(p.real, p.imag)
+
+
+# Turtle sink: trace streamed segment batches, lifting the pen across gaps
+def trace_segments(t: "Turtle", segments: Iterable[Tuple[np.ndarray, np.ndarray]]) -> None:
+    last = None
+    for a, b in segments:
+        for start, end in zip(a.tolist(), b.tolist()):
+            if start != last:
+                t.penup()
+                t.goto(start.real, start.imag)
+                t.pendown()
+            t.goto(end.real, end.imag)
+            last = end
+
+
+# Draw the full polygon from the precomputed vertex array, starting at the
+# turtle's current position and heading (the turtle ends where it started)
+def draw_polygon_fractal(t: "Turtle", sides: int, side_length: float, depth: int) -> None:
+    x, y = t.position()
+    draw_points(t, fractal_points(sides, side_length, depth, complex(x, y), t.heading()))
+
+
+# ------------------------- Export: Pixel Frame ----------------------
+INK = "#333333"        # stroke colour, same as the turtle pen
+INK_GRAY = 0x33        # the same colour as an 8-bit gray level
+PAPER_GRAY = 0xFF      # white background
+
+
+# Mapping from world coordinates (y up) to pixel coordinates (column, row down)
+class PixelFrame(NamedTuple):
+    width: int
+    height: int
+    scale: float       # pixels per world unit
+    origin: complex    # world point that lands on pixel (0, 0)
+
+    # World points (complex) → pixel points (complex: column + i·row)
+    def to_pixels(self, points: np.ndarray) -> np.ndarray:
+        return np.conj(points - self.origin) * self.scale
+
+
+# Fit a bounding box into an image whose longer side is `size` pixels,
+# keeping the aspect ratio and a `margin` pixel border. `zoom` magnifies the
+# view around `center` (world coordinates, default: the box centre) while the
+# image keeps the same pixel size.
+def fit_frame(bbox: BBox, size: int, margin: int = 16, zoom: float = 1.0,
+              center: Optional[Tuple[float, float]] = None) -> PixelFrame:
+    min_x, min_y, max_x, max_y = bbox
+    w, h = max_x - min_x, max_y - min_y
+    inner = size - 2 * margin
+    if inner <= 0:
+        raise ValueError("Image size must exceed twice the margin.")
+    if zoom <= 0:
+        raise ValueError("Zoom must be > 0.")
+    fit = inner / max(w, h)
+    width = size if w >= h else int(ceil(w * fit)) + 2 * margin
+    height = size if h >= w else int(ceil(h * fit)) + 2 * margin
+    scale = fit * zoom
+    cx, cy = center if center is not None else ((min_x + max_x) / 2.0, (min_y + max_y) / 2.0)
+    origin = complex(cx - width / (2.0 * scale), cy + height / (2.0 * scale))
+    return PixelFrame(width, height, scale, origin)
+
+
+# World-space rectangle (min_x, min_y, max_x, max_y) visible in a frame
+def frame_world_bbox(frame: PixelFrame) -> BBox:
+    return (frame.origin.real, frame.origin.imag - frame.height / frame.scale,
+            frame.origin.real + frame.width / frame.scale, frame.origin.imag)
 
-    # Simulate drawing entire polygon
-    exterior = 360.0 / sides
-    for _ in range(sides):
-        draw_edge_sim(side_length, depth)
-        turn_sim("left", exterior)
 
-    return min_x, min_y, max_x, max_y  # Return bounding box
+# ------------------------- Rendering: LOD & Culling -------------------
+# Height of an indentation's apex above its edge, as a fraction of the edge
+APEX_HEIGHT = 3 ** 0.5 / 6.0
+
+# Default LOD cutoff in pixels: the skipped levels then move the outline by
+# well under a pixel, so the render matches the full depth to within a pixel
+DEFAULT_LOD = 0.5
+
+
+# Deepest level worth generating at `scale` pixels per world unit: segments at
+# level k are side_length / 3^k long, and subdivision stops once they would
+# be shorter than `min_pixels` on screen (min_pixels <= 0 disables the cutoff)
+def lod_depth(side_length: float, depth: int, scale: float, min_pixels: float) -> int:
+    if min_pixels <= 0:
+        return depth
+    level = 0
+    while level < depth and side_length * scale / 3 ** level >= min_pixels:
+        level += 1
+    return level
+
+
+# Apply the edge rule to disjoint segments a[i] → b[i] (same order as subdivide)
+def subdivide_segments(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    v = (b - a) / 3.0
+    p1, p3 = a + v, b - v
+    p2 = p1 + v * INDENT_ROTATION
+    return (np.column_stack((a, p1, p2, p3)).ravel(),
+            np.column_stack((p1, p2, p3, b)).ravel())
+
+
+# Segments whose whole subtree can touch `rect`: every descendant of a → b lies
+# in the triangle (a, b, apex) on its inner side, so test that triangle's bbox
+# (grown by `pad` for the pen width) against the rectangle
+def _touches(a: np.ndarray, b: np.ndarray, rect: BBox, pad: float) -> np.ndarray:
+    apex = (a + b) / 2.0 + (b - a) * 1j * APEX_HEIGHT
+    xs = np.stack((a.real, b.real, apex.real))
+    ys = np.stack((a.imag, b.imag, apex.imag))
+    min_x, min_y, max_x, max_y = rect
+    return ((xs.min(axis=0) <= max_x + pad) & (xs.max(axis=0) >= min_x - pad)
+            & (ys.min(axis=0) <= max_y + pad) & (ys.max(axis=0) >= min_y - pad))
+
+
+# Only the geometry that lands inside `rect`, as world-space segments a → b.
+# Subtrees outside the rectangle are dropped before they are expanded, so a
+# zoomed-in view of a very deep fractal generates just the visible part.
+def visible_segments(sides: int, side_length: float, depth: int, rect: BBox,
+                     pad: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    corners = polygon_corners(sides, side_length)
+    a, b = corners[:-1], corners[1:]
+    for _ in range(depth):
+        keep = _touches(a, b, rect, pad)
+        a, b = subdivide_segments(a[keep], b[keep])
+    keep = _touches(a, b, rect, pad)
+    return a[keep], b[keep]
+
+
+# ------------------------- Geometry: Streaming Segments -------------
+# Lazily yield the outline as batches of segments (a[i] → b[i], in path order)
+# from an explicit stack instead of recursion: the stack never holds more than
+# sides + 3·depth pending edges, so memory is O(depth + batch) however deep
+# the fractal is, and Python's recursion limit never applies. The last levels
+# of each subtree are expanded at once from the cached unit template, so every
+# batch has at most `batch` segments (batch=1 walks one segment at a time).
+# An optional `rect` culls subtrees outside a world-space viewport.
+def stream_segments(sides: int, side_length: float, depth: int, start: complex = 0j,
+                    heading: float = 0.0, batch: int = 65536, rect: Optional[BBox] = None,
+                    pad: float = 0.0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    if depth < 0:
+        raise ValueError("Recursion depth must be ≥ 0.")
+    leaf = 0
+    while leaf < depth and 4 ** (leaf + 1) <= batch:
+        leaf += 1
+    template = EDGE_TEMPLATES.get(leaf)
+
+    corners = polygon_corners(sides, side_length, start, heading)
+    stack = [(corners[k], corners[k + 1], depth) for k in reversed(range(sides))]
+    while stack:
+        a, b, level = stack.pop()
+        if rect is not None and not _touches(np.array([a]), np.array([b]), rect, pad)[0]:
+            continue
+        if level == leaf:
+            points = a + (b - a) * template
+            points[0], points[-1] = a, b  # shared endpoints stay bit-identical
+            yield points[:-1], points[1:]
+            continue
+        v = (b - a) / 3.0
+        p1, p3 = a + v, b - v
+        p2 = p1 + v * INDENT_ROTATION
+        # Push in reverse so the first child is expanded (and emitted) first
+        stack.extend(((p3, b, level - 1), (p2, p3, level - 1),
+                      (p1, p2, level - 1), (a, p1, level - 1)))
+
+
+# ------------------------- Export: SVG --------------------------------
+# Incremental SVG sink: segments (pixel coordinates) are appended to a single
+# <path> element as they arrive and formatted in batches, so the file streams
+# to disk without holding the outline in memory. Disconnected segments start
+# a new subpath ("M"); a subpath that returns to its first point ends with Z.
+class SvgPathWriter:
+    def __init__(self, path: str, width: int, height: int, line_width: float = 2.0,
+                 batch: int = 65536):
+        self.path = path
+        self.batch = batch
+        self._first: Optional[complex] = None
+        self._last: Optional[complex] = None
+        self._f = open(path, "w", encoding="utf-8")
+        self._f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                      f'viewBox="0 0 {width} {height}" style="background:#fff">\n')
+        self._f.write(f'<path fill="none" stroke="{INK}" stroke-width="{line_width}" '
+                      f'stroke-linejoin="round" d="')
+
+    # Append segments a[i] → b[i]
+    def add_segments(self, a: np.ndarray, b: np.ndarray) -> None:
+        if len(a) == 0:
+            return
+        breaks = np.flatnonzero(a[1:] != b[:-1]) + 1
+        for i, j in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(a)]))):
+            if self._last is None or a[i] != self._last:
+                self._end_subpath()
+                self._f.write("M")
+                self._write(a[i:i + 1])
+                self._first = a[i]
+            self._write(b[i:j])
+            self._last = b[j - 1]
+
+    # Append a polyline given as consecutive points
+    def add_polyline(self, pixels: np.ndarray) -> None:
+        self.add_segments(pixels[:-1], pixels[1:])
+
+    def _write(self, points: np.ndarray) -> None:
+        for i in range(0, len(points), self.batch):
+            chunk = points[i:i + self.batch]
+            coords = np.column_stack((chunk.real, chunk.imag)).ravel()
+            self._f.write(("%.2f,%.2f " * len(chunk)) % tuple(coords.tolist()))
+
+    def _end_subpath(self) -> None:
+        if self._last is not None and self._last == self._first:
+            self._f.write("Z")
+
+    # Finish the path and the document
+    def close(self) -> None:
+        if not self._f.closed:
+            self._end_subpath()
+            self._f.write('"/>\n</svg>\n')
+            self._f.close()
+
+    def __enter__(self) -> "SvgPathWriter":
+        return self
+
+    # On error, drop the half-written file instead of closing it as a valid document
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif not self._f.closed:
+            self._f.close()
+            os.remove(self.path)
+
+
+# Write polylines (pixel coordinates) as one SVG <path> element
+def write_svg(path: str, polylines: List[np.ndarray], width: int, height: int,
+              line_width: float = 2.0) -> None:
+    with SvgPathWriter(path, width, height, line_width) as svg:
+        for pixels in polylines:
+            svg.add_polyline(pixels)
+
+
+# ------------------------- Export: Raster / PNG -----------------------
+# Binary ink canvas with a square pen. Segments are clipped to the canvas,
+# sampled every `step` pixels (vectorised over all segments at once) and each
+# sample stamps the pen footprint, so no per-pixel Python loop is involved.
+class RasterCanvas:
+    def __init__(self, width: int, height: int, line_width: int = 2):
+        self.width, self.height = width, height
+        self.ink = np.zeros((height, width), dtype=bool)
+        span = range(-((line_width - 1) // 2), line_width // 2 + 1)
+        self._pen = [(dx, dy) for dy in span for dx in span]
+
+    # Draw segments a[i] → b[i] given in pixel coordinates (complex arrays).
+    # Each segment is sampled at k/n of its length (n = ceil(length/step)) plus
+    # its end point, but only the samples whose index falls inside the clipped
+    # parameter range are generated, so cost follows the visible length
+    # rather than the zoom and the inked pixels match unclipped sampling.
+    def draw_segments(self, a: np.ndarray, b: np.ndarray, step: float = 0.5) -> None:
+        if len(a) == 0:
+            return
+        delta = b - a
+        counts = np.maximum(np.ceil(np.abs(delta) / step), 1).astype(np.int64)
+        clip = self._clip(a, b)
+        if clip is None:
+            # Whole batch on the canvas: every sample of every segment
+            seg = np.repeat(np.arange(len(a)), counts)
+            first = np.repeat(np.cumsum(counts) - counts, counts)
+            frac = (np.arange(len(seg)) - first) / counts[seg]
+            samples = np.concatenate((a[seg] + delta[seg] * frac, b))
+        else:
+            lo, hi = clip
+            keep = lo <= hi
+            a, b, delta, counts = a[keep], b[keep], delta[keep], counts[keep]
+            k0 = np.floor(lo[keep] * counts).astype(np.int64)
+            k1 = np.minimum(np.ceil(hi[keep] * counts).astype(np.int64), counts)
+            taken = k1 - k0 + 1
+            seg = np.repeat(np.arange(len(a)), taken)
+            k = np.arange(len(seg)) - np.repeat(np.cumsum(taken) - taken, taken) + k0[seg]
+            samples = np.where(k == counts[seg], b[seg], a[seg] + delta[seg] * (k / counts[seg]))
+        cols = np.rint(samples.real).astype(np.int64)
+        rows = np.rint(samples.imag).astype(np.int64)
+        for dx, dy in self._pen:
+            c, r = cols + dx, rows + dy
+            inside = (c >= 0) & (c < self.width) & (r >= 0) & (r < self.height)
+            self.ink[r[inside], c[inside]] = True
+
+    # Parameter range [lo, hi] ⊆ [0, 1] of each segment a + t·(b - a) inside the
+    # canvas grown by the pen reach (Liang–Barsky); lo > hi means it misses.
+    # None when the whole batch already lies within that rectangle.
+    def _clip(self, a: np.ndarray, b: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        pad = len(self._pen) ** 0.5 + 1.0
+        x_hi, y_hi = self.width - 1 + pad, self.height - 1 + pad
+        if (min(a.real.min(), b.real.min()) >= -pad and min(a.imag.min(), b.imag.min()) >= -pad
+                and max(a.real.max(), b.real.max()) <= x_hi
+                and max(a.imag.max(), b.imag.max()) <= y_hi):
+            return None
+        delta = b - a
+        lo = np.zeros(len(a))
+        hi = np.ones(len(a))
+        for start, d, limit in ((a.real, delta.real, x_hi), (a.imag, delta.imag, y_hi)):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t0 = (-pad - start) / d
+                t1 = (limit - start) / d
+            flat = d == 0
+            outside = flat & ((start < -pad) | (start > limit))
+            lo = np.maximum(lo, np.where(flat, 0.0, np.minimum(t0, t1)))
+            hi = np.minimum(hi, np.where(flat, np.where(outside, -1.0, 1.0), np.maximum(t0, t1)))
+        return lo, hi
+
+    # Draw a polyline given as consecutive pixel points
+    def draw_polyline(self, pixels: np.ndarray) -> None:
+        self.draw_segments(pixels[:-1], pixels[1:])
+
+    # 8-bit grayscale image: ink on white paper
+    def to_image(self) -> np.ndarray:
+        return np.where(self.ink, np.uint8(INK_GRAY), np.uint8(PAPER_GRAY))
+
+
+# Write an 8-bit grayscale (H, W) or RGB (H, W, 3) array as a PNG using only
+# zlib + struct: one IHDR, one IDAT (filter type 0 on every row) and IEND
+def write_png(path: str, image: np.ndarray, level: int = 6) -> None:
+    height, width = image.shape[:2]
+    color_type = 0 if image.ndim == 2 else 2
+    raw = np.zeros((height, 1 + image[0].size), dtype=np.uint8)  # column 0 = filter byte
+    raw[:, 1:] = image.reshape(height, -1)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", header))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), level)))
+        f.write(chunk(b"IEND", b""))
+
+
+# ------------------------- Orchestration: Export ----------------------
+# Headless export: map the geometry into the pixel frame and feed it to the
+# requested SVG and/or PNG sinks (no turtle / Tk involved).
+# `lod` (pixels) cuts recursion once segments get that small; `zoom`/`center`
+# pick the viewport, and geometry outside it is culled before expansion.
+# With `stream` the segments come from stream_segments in batches, so memory
+# stays bounded by the image and the batch size even at depth 12+.
+def export_fractal(sides: int, side_length: float, depth: int, svg_path: Optional[str] = None,
+                   png_path: Optional[str] = None, size: int = 2048, line_width: int = 2,
+                   margin: int = 16, zoom: float = 1.0, center: Optional[Tuple[float, float]] = None,
+                   lod: float = DEFAULT_LOD, stream: bool = False, batch: int = 65536) -> PixelFrame:
+    started = time.perf_counter()
+    bbox = polygon_bbox(sides, side_length)
+    frame = fit_frame(bbox, size, margin, zoom, center)
+    level = lod_depth(side_length, depth, frame.scale, lod)
+    view = frame_world_bbox(frame)
+    pad = line_width / frame.scale
+    whole = view[0] <= bbox[0] and view[1] <= bbox[1] and view[2] >= bbox[2] and view[3] >= bbox[3]
+    if stream:
+        segments: Iterable[Tuple[np.ndarray, np.ndarray]] = stream_segments(
+            sides, side_length, level, batch=batch, rect=None if whole else view, pad=pad)
+    elif whole:
+        # Whole outline is on screen: nothing to cull, use the cached template
+        points = fractal_points(sides, side_length, level)
+        segments = [(points[:-1], points[1:])]
+    else:
+        segments = [visible_segments(sides, side_length, level, view, pad)]
+
+    canvas = RasterCanvas(frame.width, frame.height, line_width) if png_path else None
+    count = 0
+    with ExitStack() as stack:
+        svg = (stack.enter_context(SvgPathWriter(svg_path, frame.width, frame.height, line_width))
+               if svg_path else None)
+        for a, b in segments:
+            a, b = frame.to_pixels(a), frame.to_pixels(b)
+            count += len(a)
+            if svg is not None:
+                svg.add_segments(a, b)
+            if canvas is not None:
+                canvas.draw_segments(a, b)
+    print(f"Rendered {count:,} segments at depth {level} in {time.perf_counter() - started:.2f}s")
+
+    if svg_path:
+        print(f"SVG written to {svg_path}")
+    if canvas is not None:
+        started = time.perf_counter()
+        write_png(png_path, canvas.to_image())
+        print(f"PNG ({frame.width}x{frame.height}) written to {png_path} "
+              f"in {time.perf_counter() - started:.2f}s")
+    return frame
 
 
 # ------------------------- I/O: Safe Prompts --------------------------
@@ -148,15 +692,37 @@ def ask_float(prompt: str, min_value: float = 0.1) -> float:
 
 
 # ------------------------- Orchestration: Main ------------------------
-# Main execution function
-def main() -> None:
-    print("=== Recursive Polygon with Triangle Indentation ===")
-    sides = ask_int("Enter number of sides", 3)
-    length = ask_float("Enter side length (pixels)", 1.0)
-    depth = ask_int("Enter recursion depth", 0)
+# Command-line options; with none given the script stays fully interactive
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Recursive polygon fractal with triangle indentation.")
+    parser.add_argument("--sides", type=int, help="number of polygon sides (≥ 3)")
+    parser.add_argument("--length", type=float, help="side length in world units / turtle pixels")
+    parser.add_argument("--depth", type=int, help="recursion depth (≥ 0)")
+    parser.add_argument("--svg", metavar="PATH", help="write the outline as SVG (headless)")
+    parser.add_argument("--png", metavar="PATH", help="rasterise the outline to PNG (headless)")
+    parser.add_argument("--size", type=int, default=2048,
+                        help="export resolution: pixels on the longer image side (default 2048)")
+    parser.add_argument("--line-width", type=int, default=2, help="stroke width in pixels (default 2)")
+    parser.add_argument("--margin", type=int, default=16, help="border in pixels (default 16)")
+    parser.add_argument("--zoom", type=float, default=1.0,
+                        help="export magnification; off-screen geometry is culled (default 1)")
+    parser.add_argument("--center", type=float, nargs=2, metavar=("X", "Y"),
+                        help="world point at the image centre when zoomed (default: fractal centre)")
+    parser.add_argument("--lod", type=float, default=DEFAULT_LOD, metavar="PX",
+                        help="stop subdividing once segments are shorter than PX pixels "
+                             f"(default {DEFAULT_LOD}; 0 = always use the full depth)")
+    parser.add_argument("--stream", action="store_true",
+                        help="generate segments lazily in batches (constant memory, for depth 12+)")
+    parser.add_argument("--batch", type=int, default=65536,
+                        help="maximum segments per streamed batch (default 65536)")
+    return parser
 
-    if depth > 6:
-        print("Note: Depth > 6 may render slowly.")  # Warn about performance
+
+# Turtle window: center the precomputed outline and draw it (one world unit
+# is one screen pixel, so `lod` applies directly)
+def draw_on_screen(sides: int, length: float, depth: int, lod: float = DEFAULT_LOD) -> None:
+    from turtle import Screen, Turtle
 
     screen = Screen()
     screen.title("Recursive Triangle Indentation")
@@ -168,21 +734,48 @@ def main() -> None:
     t.hideturtle()
     t.speed(0)
     t.pensize(2)
-    t.color("#333333")
-
-    # Center the drawing based on simulated bounding box
-    min_x, min_y, max_x, max_y = simulate_path_bbox(sides, length, depth)
-    cx = (min_x + max_x) / 2.0
-    cy = (min_y + max_y) / 2.0
-    t.penup()
-    t.goto(-cx, -cy)
-    t.setheading(0.0)
-    t.pendown()
-
-    draw_polygon_fractal(t, sides, length, depth)  # Draw the fractal polygon
+    t.color(INK)
+
+    # Center the drawing on the closed-form bounding box by starting the
+    # streamed outline at the shifted origin (no second pass over the path)
+    min_x, min_y, max_x, max_y = polygon_bbox(sides, length)
+    offset = complex((min_x + max_x) / 2.0, (min_y + max_y) / 2.0)
+    level = lod_depth(length, depth, 1.0, lod)
+    trace_segments(t, stream_segments(sides, length, level, start=-offset))  # Draw the fractal polygon
     screen.update()
     print("Drawing complete. Close the window to exit.")
     screen.mainloop()
 
+
+# Main execution function: headless export when --svg/--png is given,
+# otherwise the turtle window (prompting for any parameter not on the CLI)
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    for name, value, minimum in (("--sides", args.sides, 3), ("--length", args.length, 1.0),
+                                 ("--depth", args.depth, 0)):
+        if value is not None and value < minimum:
+            parser.error(f"{name} must be ≥ {minimum}")
+
+    if args.svg or args.png:
+        missing = [n for n, v in (("--sides", args.sides), ("--length", args.length),
+                                  ("--depth", args.depth)) if v is None]
+        if missing:
+            parser.error(f"headless export needs {', '.join(missing)}")
+        export_fractal(args.sides, args.length, args.depth, args.svg, args.png, args.size,
+                       args.line_width, args.margin, args.zoom, args.center, args.lod,
+                       args.stream, args.batch)
+        return
+
+    print("=== Recursive Polygon with Triangle Indentation ===")
+    sides = args.sides if args.sides is not None else ask_int("Enter number of sides", 3)
+    length = args.length if args.length is not None else ask_float("Enter side length (pixels)", 1.0)
+    depth = args.depth if args.depth is not None else ask_int("Enter recursion depth", 0)
+
+    if depth > 6:
+        print("Note: Depth > 6 may render slowly.")  # Warn about performance
+
+    draw_on_screen(sides, length, depth, args.lod)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,172 @@
+"""
+Equivalence tests for the question_1 cipher engines.
+
+Every fast path (str.translate tables, the UTF-8 byte path, the streaming
+byte/decoder switch in `_encrypt_stream_ascii` and the parallel byte-range
+paths for encryption and decryption) must reproduce the per-character
+reference `_encrypt_with_meta_loop` exactly, including newline translation
+and multi-byte characters that straddle chunk boundaries.
+"""
+
+import io
+import random
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+import question_1 as q1
+
+SHIFT_PAIRS = [(3, 5), (0, 0), (0, 7), (-4, 7), (13, -26), (-1, -1), (27, 53), (-100, 3)]
+
+TEXTS = [
+    "",
+    "Hello, World!",
+    "abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789",
+    "Ünïcödé: Ärger, Straße, façade, €100, 😀 mixed with ASCII zZ aA mM nN",
+    "日本語のテキストと English words",
+    "line one\nline two\n\nline four",
+]
+
+# CR, CRLF and 1–4 byte characters packed closely so that small chunk sizes
+# cut through every kind of boundary.
+STRADDLE_TEXT = "ab\r\ncd\rE€f😀g\r\r\nhé\n\rZ\r\n😀\r€é\rmN\r\n"
+
+
+def reference(text: str, shift1: int, shift2: int) -> Tuple[str, str]:
+    """Per-character reference result."""
+    return q1._encrypt_with_meta_loop(text, shift1, shift2)
+
+
+def text_mode(raw: str) -> str:
+    """What a text-mode (universal newlines) read of 'raw' returns."""
+    return raw.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def random_text(seed: int, length: int) -> str:
+    rng = random.Random(seed)
+    alphabet = "aAmMnNzZ az\n\r\t.,!é€😀ßÇ日"
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+# ----------------------------- In-memory engines -----------------------------
+
+@pytest.mark.parametrize("shift1,shift2", SHIFT_PAIRS)
+@pytest.mark.parametrize("text", TEXTS + [STRADDLE_TEXT, random_text(1, 500)])
+def test_encrypt_with_meta_matches_reference(text, shift1, shift2):
+    assert q1.encrypt_with_meta(text, shift1, shift2) == reference(text, shift1, shift2)
+
+
+@pytest.mark.parametrize("shift1,shift2", SHIFT_PAIRS)
+@pytest.mark.parametrize("text", TEXTS + [STRADDLE_TEXT, random_text(2, 500)])
+def test_encrypt_bytes_with_meta_matches_reference(text, shift1, shift2):
+    cipher, meta = reference(text, shift1, shift2)
+    result = q1.encrypt_bytes_with_meta(text.encode("utf-8"), shift1, shift2)
+    assert result == (cipher.encode("utf-8"), meta.encode("ascii"))
+
+
+@pytest.mark.parametrize("shift1,shift2", SHIFT_PAIRS)
+def test_decrypt_round_trip(shift1, shift2):
+    text = STRADDLE_TEXT + random_text(3, 300)
+    cipher, meta = q1.encrypt_with_meta(text, shift1, shift2)
+    assert q1.decrypt_with_meta(cipher, meta, shift1, shift2) == text
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_decrypt_with_meta_matches_reference_on_any_meta(seed):
+    # Shuffled metadata and astral/surrogate characters leave the bulk path.
+    rng = random.Random(seed)
+    cipher = random_text(seed, 200) + "\ud83d\ude00\ud800𐀀"
+    meta = "".join(rng.choice("0123344x") for _ in cipher)
+    for shift1, shift2 in SHIFT_PAIRS:
+        expected = q1._decrypt_with_meta_loop(cipher, meta, shift1, shift2)
+        assert q1.decrypt_with_meta(cipher, meta, shift1, shift2) == expected
+        consistent = q1.encrypt_with_meta(cipher, shift1, shift2)[1]
+        expected = q1._decrypt_with_meta_loop(cipher, consistent, shift1, shift2)
+        assert q1.decrypt_with_meta(cipher, consistent, shift1, shift2) == expected
+
+
+def test_encrypt_bytes_with_meta_rejects_invalid_utf8():
+    with pytest.raises(UnicodeDecodeError):
+        q1.encrypt_bytes_with_meta(b"abc\xff", 3, 5)
+
+
+# ----------------------------- Streaming engines -----------------------------
+
+@pytest.mark.parametrize("shift1,shift2", [(3, 5), (0, 0), (-4, 7)])
+@pytest.mark.parametrize("chunk_bytes", range(1, 8))
+@pytest.mark.parametrize("prefix", ["", "x", "xy", "xyz"])
+def test_encrypt_stream_ascii_matches_reference(prefix, chunk_bytes, shift1, shift2):
+    raw = prefix + STRADDLE_TEXT + "plain ascii tail " * 3
+    fenc, fmeta = io.BytesIO(), io.BytesIO()
+    count = q1._encrypt_stream_ascii(io.BytesIO(raw.encode("utf-8")), fenc, fmeta,
+                                     shift1, shift2, chunk_bytes)
+    cipher, meta = reference(text_mode(raw), shift1, shift2)
+    assert count == len(cipher)
+    assert fenc.getvalue() == cipher.encode("utf-8")
+    assert fmeta.getvalue() == meta.encode("ascii")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_chars", range(1, 8))
+@pytest.mark.parametrize("shift1,shift2", [(3, 5), (0, 0), (-4, 7), (13, -26)])
+def test_encrypt_file_matches_reference(tmp_path: Path, shift1, shift2, chunk_chars, workers):
+    raw = "é" + STRADDLE_TEXT * 3 + random_text(4, 200)
+    src = tmp_path / "plain.txt"
+    src.write_bytes(raw.encode("utf-8"))
+    enc, meta_path = tmp_path / "out.enc", tmp_path / "out.meta"
+
+    count = q1.encrypt_file(src, enc, meta_path, shift1, shift2,
+                            chunk_chars=chunk_chars, workers=workers)
+    cipher, meta = reference(text_mode(raw), shift1, shift2)
+    assert count == len(cipher)
+    assert enc.read_bytes() == cipher.encode("utf-8")
+    assert meta_path.read_bytes() == meta.encode("ascii")
+
+
+@pytest.mark.parametrize("meta_format", ["packed", "rle"])
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_chars", [1, 3, 7])
+def test_encrypt_file_binary_meta_matches_reference(tmp_path: Path, meta_format, workers, chunk_chars):
+    raw = STRADDLE_TEXT * 4
+    src = tmp_path / "plain.txt"
+    src.write_bytes(raw.encode("utf-8"))
+    enc, meta_path = tmp_path / "out.enc", tmp_path / "out.meta"
+
+    q1.encrypt_file(src, enc, meta_path, -4, 7, chunk_chars=chunk_chars,
+                    meta_format=meta_format, workers=workers)
+    cipher, meta = reference(text_mode(raw), -4, 7)
+    assert enc.read_bytes() == cipher.encode("utf-8")
+    assert q1.unpack_meta(meta_path.read_bytes()) == meta
+
+
+@pytest.mark.parametrize("meta_format", ["text", "packed", "rle"])
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_chars", [1, 2, 5, 7])
+def test_encrypt_decrypt_file_round_trip(tmp_path: Path, chunk_chars, workers, meta_format):
+    raw = STRADDLE_TEXT + random_text(5, 300)
+    src = tmp_path / "plain.txt"
+    src.write_bytes(raw.encode("utf-8"))
+    enc, meta_path, dec = tmp_path / "out.enc", tmp_path / "out.meta", tmp_path / "out.dec"
+
+    q1.encrypt_file(src, enc, meta_path, 13, -26, chunk_chars=chunk_chars, meta_format=meta_format)
+    count = q1.decrypt_file(enc, meta_path, dec, 13, -26, chunk_chars=chunk_chars, workers=workers)
+    assert dec.read_bytes() == text_mode(raw).encode("utf-8")
+    assert count == len(text_mode(raw))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decrypt_file_rejects_short_meta(tmp_path: Path, workers):
+    enc, meta_path, dec = tmp_path / "out.enc", tmp_path / "out.meta", tmp_path / "out.dec"
+    enc.write_text("abcdef", encoding="utf-8")
+    meta_path.write_text("11111", encoding="utf-8")
+    with pytest.raises(ValueError):
+        q1.decrypt_file(enc, meta_path, dec, 3, 5, chunk_chars=2, workers=workers)
+
+
+@pytest.mark.parametrize("workers,count", [(1, 2), (2, 1), (2, 0)])
+def test_run_batch_rejects_unknown_executor(tmp_path: Path, workers, count):
+    jobs = [q1.BatchJob(tmp_path / f"{i}.txt", tmp_path / f"{i}.enc", tmp_path / f"{i}.meta", 1, 2)
+            for i in range(count)]
+    with pytest.raises(ValueError, match="bogus"):
+        q1.run_batch(jobs, workers=workers, executor="bogus")
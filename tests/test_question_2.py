@@ -0,0 +1,269 @@
+"""
+Equivalence tests for the question_2 aggregation engines.
+
+`compute_station_stats` on the melted long frame is the reference: the wide
+model, the chunked (out-of-core) reader and the incremental state must write
+the same three output files, and the parsed-table cache, the station x year
+cube and the spatial grid must agree with plain pandas / brute force.
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import question_2 as q2
+
+DATA = Path(__file__).resolve().parents[1] / q2.DATA_FOLDER
+OUTPUTS = ["average_temp.txt", "largest_temp_range_station.txt", "temperature_stability_stations.txt"]
+
+
+def write_corpus(folder: Path, seed: int, years=range(2001, 2007), duplicates: bool = True) -> Path:
+    """Random station CSVs: missing months, stations absent from some years, repeated rows."""
+    rng = np.random.default_rng(seed)
+    folder.mkdir(parents=True, exist_ok=True)
+    names = [f"STATION-{i:02d}" for i in range(12)]
+    coords = {name: (rng.uniform(-45, -10), rng.uniform(110, 155)) for name in names}
+    for year in years:
+        rows = [name for name in names if rng.random() < 0.8]
+        if duplicates and rows:
+            rows.append(rows[int(rng.integers(len(rows)))])
+        table = pd.DataFrame({
+            "STATION_NAME": rows,
+            "STN_ID": range(len(rows)),
+            "LAT": [coords[name][0] for name in rows],
+            "LON": [coords[name][1] for name in rows],
+        })
+        for month in q2.MONTH_COLUMNS:
+            values = np.round(rng.normal(20.0, 6.0, len(rows)), 1)
+            values[rng.random(len(rows)) < 0.15] = np.nan
+            table[month] = values
+        table.to_csv(folder / f"stations_group_{year}.csv", index=False)
+    return folder
+
+
+def reference_stats(folder: Path) -> q2.StationStats:
+    return q2.compute_station_stats(q2.load_data(str(folder)))
+
+
+def write_outputs(stats: q2.StationStats, directory: Path) -> Dict[str, str]:
+    """The three result files `main()` writes, as text."""
+    cwd = os.getcwd()
+    directory.mkdir(parents=True, exist_ok=True)
+    os.chdir(directory)
+    try:
+        q2.save_seasonal_avg(q2.calculate_seasonal_avg(None, stats))
+        q2.save_largest_temp_range(q2.find_largest_temp_range(None, stats))
+        q2.save_temperature_stability(*q2.find_temperature_stability(None, stats))
+        return {name: Path(name).read_text(encoding="utf-8") for name in OUTPUTS}
+    finally:
+        os.chdir(cwd)
+
+
+def assert_stats_close(actual: q2.StationStats, expected: q2.StationStats) -> None:
+    assert list(actual.stations) == list(expected.stations)
+    np.testing.assert_array_equal(actual.count, expected.count)
+    np.testing.assert_array_equal(actual.season_count, expected.season_count)
+    np.testing.assert_array_equal(actual.t_min, expected.t_min)
+    np.testing.assert_array_equal(actual.t_max, expected.t_max)
+    np.testing.assert_array_equal(actual.season_min, expected.season_min)
+    np.testing.assert_array_equal(actual.season_max, expected.season_max)
+    for name in ("total", "m2", "season_total"):
+        np.testing.assert_allclose(getattr(actual, name), getattr(expected, name), rtol=1e-12, atol=1e-9)
+
+
+# ----------------------------- Output files ----------------------------------
+
+MODES = [
+    ["--wide"],
+    ["--chunked", "--chunk-rows", "7"],
+    ["--chunked", "--chunk-rows", "1000"],
+    ["--incremental"],
+    ["--workers", "2", "--executor", "thread"],
+]
+
+
+@pytest.mark.parametrize("mode", MODES, ids=" ".join)
+def test_main_outputs_match_long_reference(tmp_path: Path, monkeypatch, mode: List[str]):
+    expected = write_outputs(reference_stats(DATA), tmp_path / "reference")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(q2.PROFILE_ENV, raising=False)
+    q2.main(["--data", str(DATA), "--cache", str(tmp_path / "cache"),
+             "--state", str(tmp_path / "state.npz"), *mode])
+    for name in OUTPUTS:
+        assert (tmp_path / name).read_text(encoding="utf-8") == expected[name], name
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_engines_match_long_reference_on_synthetic_data(tmp_path: Path, seed: int):
+    folder = write_corpus(tmp_path / "data", seed)
+    expected = reference_stats(folder)
+
+    assert_stats_close(q2.station_stats_from_wide(q2.load_wide_data(str(folder))), expected)
+    for chunk_rows in (1, 3, 1000):
+        assert_stats_close(q2.stream_station_stats(str(folder), chunk_rows), expected)
+    assert_stats_close(q2.update_aggregate_state(str(folder), str(tmp_path / "state.npz")), expected)
+
+
+def test_incremental_state_folds_new_and_rebuilds_changed_files(tmp_path: Path):
+    folder = write_corpus(tmp_path / "data", 7, years=range(2001, 2004))
+    state = str(tmp_path / "state.npz")
+    q2.update_aggregate_state(str(folder), state)
+
+    write_corpus(tmp_path / "more", 8, years=range(2004, 2006))
+    for path in (tmp_path / "more").iterdir():
+        path.rename(folder / path.name)
+    assert_stats_close(q2.update_aggregate_state(str(folder), state), reference_stats(folder))
+
+    first = folder / "stations_group_2001.csv"
+    first.write_text(first.read_text(encoding="utf-8").replace(",1", ",2"), encoding="utf-8")
+    assert_stats_close(q2.update_aggregate_state(str(folder), state), reference_stats(folder))
+
+
+# ----------------------------- Parsed-table cache ----------------------------
+
+@pytest.fixture
+def parsed_paths(monkeypatch) -> List[str]:
+    """Record every CSV the loader actually parses."""
+    seen: List[str] = []
+    original = q2.read_station_files
+
+    def recording(paths, workers=1, executor="process"):
+        seen.extend(os.path.basename(p) for p in paths)
+        return original(paths, workers, executor)
+
+    monkeypatch.setattr(q2, "read_station_files", recording)
+    return seen
+
+
+def test_cache_hits_and_misses(tmp_path: Path, parsed_paths: List[str]):
+    folder = write_corpus(tmp_path / "data", 3, years=range(2001, 2004))
+    cache = str(tmp_path / "cache")
+    names = sorted(p.name for p in folder.iterdir())
+
+    cold = q2.load_station_tables(str(folder), cache)
+    assert parsed_paths == names
+    parsed_paths.clear()
+
+    warm = q2.load_station_tables(str(folder), cache)
+    assert parsed_paths == []
+    for a, b in zip(warm, cold):
+        pd.testing.assert_frame_equal(a, b)
+
+    touched = folder / names[0]
+    st = touched.stat()
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    q2.load_station_tables(str(folder), cache)
+    assert parsed_paths == [names[0]]
+    parsed_paths.clear()
+
+    grown = folder / names[1]
+    with open(grown, "a", encoding="utf-8") as f:
+        f.write("EXTRA-STATION,99,-30.0,150.0" + ",1.5" * 12 + "\n")
+    tables = q2.load_station_tables(str(folder), cache)
+    assert parsed_paths == [names[1]]
+    assert "EXTRA-STATION" in set(tables[1]["STATION_NAME"])
+
+
+# ----------------------------- Station x year cube ---------------------------
+
+@pytest.fixture(scope="module")
+def cube_corpus(tmp_path_factory):
+    root = tmp_path_factory.mktemp("cube")
+    folder = write_corpus(root / "data", 11, years=range(1995, 2007), duplicates=False)
+    long = pd.concat([
+        pd.read_csv(path).assign(YEAR=q2.file_year(str(path)))
+        for path in sorted(folder.iterdir())
+    ]).melt(id_vars=["STATION_NAME", "YEAR"], value_vars=q2.MONTH_COLUMNS,
+            var_name="Month", value_name="Temperature").dropna()
+    return q2.build_temperature_cube(str(folder), str(root / "cube")), long
+
+
+@pytest.mark.parametrize("season", [None] + q2.SEASON_NAMES)
+@pytest.mark.parametrize("first_year,last_year", [(1995, 2006), (1995, 1995), (1998, 2003), (2001, 2006)])
+def test_cube_query_matches_groupby(cube_corpus, first_year, last_year, season):
+    cube, long = cube_corpus
+    rows = long[long["YEAR"].between(first_year, last_year)]
+    if season is not None:
+        rows = rows[rows["Month"].isin(q2.SEASON_MONTHS[season])]
+    expected = rows.groupby("STATION_NAME")["Temperature"].agg(["count", "mean", "min", "max", "std"])
+
+    for station in cube.stations:
+        summary = cube.query(station, first_year, last_year, season)
+        if station not in expected.index:
+            assert summary.count == 0
+            continue
+        row = expected.loc[station]
+        assert summary.count == row["count"]
+        assert summary.mean == pytest.approx(row["mean"], abs=1e-9)
+        assert summary.t_min == row["min"]
+        assert summary.t_max == row["max"]
+        if row["count"] > 1:
+            assert summary.std == pytest.approx(row["std"], abs=1e-6)
+        else:
+            assert math.isnan(summary.std)
+
+
+def test_cube_rejects_duplicate_years(tmp_path: Path):
+    folder = write_corpus(tmp_path / "data", 12, years=range(2001, 2003), duplicates=False)
+    (folder / "extra_2002.csv").write_bytes((folder / "stations_group_2002.csv").read_bytes())
+    with pytest.raises(ValueError, match="2002"):
+        q2.build_temperature_cube(str(folder), str(tmp_path / "cube"))
+
+
+# ----------------------------- Spatial grid ----------------------------------
+
+@pytest.fixture(scope="module")
+def grid_points():
+    rng = np.random.default_rng(5)
+    n = 400
+    coords = pd.DataFrame(
+        {"LAT": rng.uniform(-89.0, 89.0, n), "LON": rng.uniform(-180.0, 180.0, n)},
+        index=pd.Index([f"S{i:03d}" for i in range(n)], name="STATION_NAME"),
+    )
+    return q2.StationGrid(coords, cell_degrees=5.0), coords
+
+
+QUERY_POINTS = [(-33.9, 151.2), (0.0, 179.5), (85.0, -20.0), (-60.0, -179.0), (10.0, 0.0)]
+
+
+@pytest.mark.parametrize("radius_km", [50.0, 900.0, 4000.0, 25000.0])
+@pytest.mark.parametrize("lat,lon", QUERY_POINTS)
+def test_grid_radius_matches_brute_force(grid_points, lat, lon, radius_km):
+    grid, coords = grid_points
+    dist = q2.haversine_km(lat, lon, coords["LAT"].to_numpy(), coords["LON"].to_numpy())
+    order = np.argsort(dist, kind="stable")
+    expected = [coords.index[i] for i in order if dist[i] <= radius_km]
+    assert grid.within_radius(lat, lon, radius_km) == expected
+
+
+@pytest.mark.parametrize("k", [1, 5, 60, 400, 1000])
+@pytest.mark.parametrize("lat,lon", QUERY_POINTS)
+def test_grid_nearest_matches_brute_force(grid_points, lat, lon, k):
+    grid, coords = grid_points
+    dist = q2.haversine_km(lat, lon, coords["LAT"].to_numpy(), coords["LON"].to_numpy())
+    expected = [coords.index[i] for i in np.argsort(dist, kind="stable")[:k]]
+    assert grid.nearest(lat, lon, k) == expected
+
+
+@pytest.mark.parametrize("box", [
+    (-40.0, -10.0, 110.0, 155.0),
+    (-90.0, 90.0, -180.0, 180.0),
+    (-20.0, 30.0, 170.0, -170.0),   # crosses the antimeridian
+    (60.0, 89.0, -10.0, 40.0),
+    (5.0, 5.5, 5.0, 5.5),
+])
+def test_grid_bbox_matches_brute_force(grid_points, box):
+    grid, coords = grid_points
+    min_lat, max_lat, min_lon, max_lon = box
+    lat, lon = coords["LAT"], coords["LON"]
+    inside = lat.between(min_lat, max_lat)
+    if min_lon <= max_lon:
+        inside &= lon.between(min_lon, max_lon)
+    else:
+        inside &= (lon >= min_lon) | (lon <= max_lon)
+    assert grid.in_bbox(*box) == sorted(coords.index[inside])
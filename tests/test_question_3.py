@@ -0,0 +1,117 @@
+"""
+Equivalence tests for the question_3 geometry engine.
+
+`draw_edge` is the reference: the vectorised outline (`fractal_points`) and
+the streamed segments (`stream_segments`) must trace the same path it walks,
+and the default level of detail must render like the full depth.
+"""
+
+from math import cos, radians, sin
+
+import numpy as np
+import pytest
+
+import question_3 as q3
+
+
+class RecordingTurtle:
+    """Minimal stand-in for turtle.Turtle that records every vertex it visits."""
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, heading: float = 0.0):
+        self.pos = complex(x, y)
+        self.angle = heading
+        self.points = [self.pos]
+
+    def forward(self, length: float) -> None:
+        self.pos += length * complex(cos(radians(self.angle)), sin(radians(self.angle)))
+        self.points.append(self.pos)
+
+    def left(self, angle: float) -> None:
+        self.angle += angle
+
+    def right(self, angle: float) -> None:
+        self.angle -= angle
+
+
+def reference_points(sides: int, side_length: float, depth: int,
+                     start: complex = 0j, heading: float = 0.0) -> np.ndarray:
+    """The polygon walked with `draw_edge`, as complex vertices."""
+    t = RecordingTurtle(start.real, start.imag, heading)
+    for _ in range(sides):
+        q3.draw_edge(t, side_length, depth)
+        t.left(360.0 / sides)
+    return np.array(t.points)
+
+
+CASES = [(3, 200.0, d) for d in range(6)] + [(4, 90.0, 3), (5, 120.0, 2), (7, 50.0, 4), (12, 10.0, 1)]
+
+
+@pytest.mark.parametrize("sides,side_length,depth", CASES)
+def test_fractal_points_match_draw_edge(sides, side_length, depth):
+    expected = reference_points(sides, side_length, depth, 3 - 4j, 17.0)
+    points = q3.fractal_points(sides, side_length, depth, 3 - 4j, 17.0)
+    assert points.shape == expected.shape
+    assert np.abs(points - expected).max() < 1e-9 * side_length * sides
+
+
+@pytest.mark.parametrize("batch", [1, 4, 16, 65536])
+@pytest.mark.parametrize("sides,side_length,depth", CASES[:5] + CASES[-3:])
+def test_stream_segments_match_draw_edge(sides, side_length, depth, batch):
+    expected = reference_points(sides, side_length, depth)
+    parts = list(q3.stream_segments(sides, side_length, depth, batch=batch))
+    a = np.concatenate([p[0] for p in parts])
+    b = np.concatenate([p[1] for p in parts])
+    assert np.array_equal(a[1:], b[:-1])
+    assert np.abs(a - expected[:-1]).max() < 1e-9 * side_length * sides
+    assert np.abs(b - expected[1:]).max() < 1e-9 * side_length * sides
+
+
+@pytest.mark.parametrize("sides", range(3, 10))
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_polygon_bbox_bounds_reference_walk(sides, depth):
+    expected = reference_points(sides, 100.0, depth)
+    bbox = q3.polygon_bbox(sides, 100.0)
+    assert np.allclose(bbox, (expected.real.min(), expected.imag.min(),
+                              expected.real.max(), expected.imag.max()), atol=1e-9)
+
+
+def test_export_removes_partial_svg_on_error(tmp_path, monkeypatch):
+    def failing(self, a, b):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(q3.SvgPathWriter, "add_segments", failing)
+    path = tmp_path / "out.svg"
+    with pytest.raises(RuntimeError):
+        q3.export_fractal(3, 200.0, 2, svg_path=str(path), size=64)
+    assert not path.exists()
+
+
+def render(sides: int, side_length: float, depth: int, size: int, lod: float):
+    """Ink mask of the whole outline at the depth `lod` allows, and that depth."""
+    frame = q3.fit_frame(q3.polygon_bbox(sides, side_length), size)
+    level = q3.lod_depth(side_length, depth, frame.scale, lod)
+    pixels = frame.to_pixels(q3.fractal_points(sides, side_length, level))
+    canvas = q3.RasterCanvas(frame.width, frame.height)
+    canvas.draw_segments(pixels[:-1], pixels[1:])
+    return canvas.ink, level
+
+
+def grow(ink: np.ndarray) -> np.ndarray:
+    """`ink` dilated by one pixel in every direction."""
+    out = ink.copy()
+    out[1:] |= ink[:-1]
+    out[:-1] |= ink[1:]
+    rows = out.copy()
+    out[:, 1:] |= rows[:, :-1]
+    out[:, :-1] |= rows[:, 1:]
+    return out
+
+
+@pytest.mark.parametrize("sides,depth,size", [(3, 9, 1024), (4, 8, 1024), (5, 8, 1024), (3, 10, 2048)])
+def test_default_lod_matches_full_depth_render(sides, depth, size):
+    full, _ = render(sides, 300.0, depth, size, 0.0)
+    coarse, level = render(sides, 300.0, depth, size, q3.DEFAULT_LOD)
+    assert level < depth
+    assert not (full & ~grow(coarse)).any()
+    assert not (coarse & ~grow(full)).any()
+    assert (full ^ coarse).sum() < 0.02 * full.sum()